@@ -1,5 +1,5 @@
 import streamlit as st
-from llm.graph.workflow import get_initial_state, run_single_turn
+from llm.graph.workflow import get_initial_state, stream_single_turn
 from dotenv import load_dotenv # Import load_dotenv
 
 # Load environment variables from .env file
@@ -54,27 +54,37 @@ page = st.sidebar.radio("Go to", ["Chatting", "History"])
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+def commit_turn(new_state):
+    """Store the final LLM state and record its latest assistant message in chat history"""
+    if new_state is None:
+        # The turn did not finish: keep the previous state so the next input continues from it
+        return
+    st.session_state.llm_state = new_state
+    all_messages = new_state.get("messages", [])
+    last_message = all_messages[-1] if all_messages else None
+    if last_message and last_message.type == "ai":
+        st.session_state.messages.append({"role": "assistant", "content": last_message.content})
+
+
 if page == "Chatting":
     st.subheader("Chat with the LLM")
 
-    # Initialize LLM state and get welcome message on first run
-    if "llm_state" not in st.session_state:
-        initial_state = get_initial_state()
-        first_turn_state = run_single_turn(initial_state)
-        st.session_state.llm_state = first_turn_state
-        
-        # Extract messages and update session state
-        llm_messages = first_turn_state.get("messages", [])
-        st.session_state.messages = []
-        for msg in llm_messages:
-            role = "assistant" if msg.type == "ai" else "user"
-            st.session_state.messages.append({"role": role, "content": msg.content})
-
     # Display chat messages from session state
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
 
+    # Initialize LLM state and stream the welcome message on first run
+    if "llm_state" not in st.session_state:
+        st.session_state.messages = []
+        with st.chat_message("assistant"):
+            turn = stream_single_turn(get_initial_state())
+            try:
+                st.write_stream(turn)
+            except Exception as e:
+                st.error(f"Something went wrong while generating the reply. Please try again. ({e})")
+        commit_turn(turn.state)
+
     # Chat input
     if prompt := st.chat_input("Say something"):
         # Add user message to chat history and display it
@@ -82,25 +92,16 @@ if page == "Chatting":
         with st.chat_message("user"):
             st.markdown(prompt)
 
-        # Get the current LLM state
-        current_state = st.session_state.llm_state
-        
-        # Run a turn with the user's input
-        new_state = run_single_turn(current_state, user_input=prompt)
-        
-        # Store the updated LLM state
-        st.session_state.llm_state = new_state
-        
-        # Extract the new assistant message
-        all_messages = new_state.get("messages", [])
-        last_message = all_messages[-1] if all_messages else None
-        
-        if last_message and last_message.type == "ai":
-            response = last_message.content
-            # Add assistant response to chat history and display it
-            st.session_state.messages.append({"role": "assistant", "content": response})
-            with st.chat_message("assistant"):
-                st.markdown(response)
+        # Run a turn with the user's input, streaming the reply tokens as they arrive
+        with st.chat_message("assistant"):
+            turn = stream_single_turn(st.session_state.llm_state, user_input=prompt)
+            try:
+                st.write_stream(turn)
+            except Exception as e:
+                st.error(f"Something went wrong while generating the reply. Please try again. ({e})")
+
+        # Commit the final state (the streamed text is only for display)
+        commit_turn(turn.state)
 
 elif page == "History":
     st.subheader("Conversation History")
@@ -1,18 +1,60 @@
 # VoiceGuardian 에이전트 모듈
 # 기존 roleplaying/ 서브패키지는 백업용으로 유지
 
-from .master import master_node, route_from_master
-from .roleplay_agent import roleplay_node
-from .evaluator import evaluate_node, route_from_evaluator
-from .guardian import guardian_node
+from .master import (
+    master_node,
+    amaster_node,
+    fused_master_node,
+    afused_master_node,
+    continue_node,
+    acontinue_node,
+    fused_continue_node,
+    afused_continue_node,
+    route_from_master,
+)
+from .roleplay_agent import roleplay_node, aroleplay_node, fused_roleplay_node, afused_roleplay_node
+from .evaluator import (
+    evaluate_node,
+    aevaluate_node,
+    evaluate_message,
+    aevaluate_message,
+    route_from_evaluator,
+    get_evaluator_stats,
+)
+from .guardian import guardian_node, aguardian_node
 from .topic_selection import topic_selection_node
+from .speculative import (
+    make_speculative_roleplay_node,
+    make_aspeculative_roleplay_node,
+    route_after_speculation,
+    get_speculation_stats,
+)
 
 __all__ = [
     "master_node",
+    "amaster_node",
+    "fused_master_node",
+    "afused_master_node",
+    "continue_node",
+    "acontinue_node",
+    "fused_continue_node",
+    "afused_continue_node",
     "route_from_master",
     "roleplay_node",
+    "aroleplay_node",
+    "fused_roleplay_node",
+    "afused_roleplay_node",
     "evaluate_node",
+    "aevaluate_node",
+    "evaluate_message",
+    "aevaluate_message",
     "route_from_evaluator",
+    "get_evaluator_stats",
     "guardian_node",
+    "aguardian_node",
     "topic_selection_node",
+    "make_speculative_roleplay_node",
+    "make_aspeculative_roleplay_node",
+    "route_after_speculation",
+    "get_speculation_stats",
 ]
@@ -2,86 +2,243 @@
 # 개인정보 노출 여부를 판별하고 JSON 형식으로 결과 반환
 #
 # ============================================================================
-# TODO: 다른 담당자가 구현할 부분
+# 2단계 평가
 # ============================================================================
-# 
-# 구현 요구사항:
-# 1. 사용자의 응답에서 개인정보 노출 여부를 평가
-# 2. 1차: 정규표현식으로 숫자 패턴 검사 (주민등록번호, 계좌번호, 전화번호 등)
-# 3. 2차: LLM으로 문맥 검사 (감정적 약점 노출, 암묵적 동의 등)
-# 4. with_structured_output()을 사용하여 JSON 응답 보장
 #
-# 반환해야 할 evaluation_result 형식:
+# 1단계 (tools.pii_detector.detect_pii, LLM 없음, 메시지당 수십 µs):
+#   - 정규식 + 체크섬(주민등록번호 검증 숫자, 카드번호 Luhn)으로 숫자형 개인정보 검사
+#   - danger(확정 노출) / safe(숫자·위험 신호 없음)면 여기서 종료 → 네트워크 지연 0
+#
+# 2단계 (LLM 문맥 검사, 1단계가 ambiguous일 때만):
+#   - 체크섬 실패 숫자열, 문맥 없는 긴 숫자, "알려드릴게요"·"앱 설치했어요" 같은 위험 신호
+#   - with_structured_output(EvaluationOutput)으로 JSON 응답 보장
+#   - 평가 LLM은 temperature 0 + 응답 캐시 (같은 발화 재평가 시 API 호출 생략)
+#
+# 반환 evaluation_result 형식:
 # {
 #     "is_danger": bool,        # 위험 여부
 #     "reason": str,            # 판단 이유
-#     "detected_info": list[str]  # 감지된 민감 정보 목록
+#     "detected_info": list[str]  # 감지된 민감 정보 목록 (값은 가려서 표기)
 # }
-#
-# 참고 코드 (langchain structured output):
-# from pydantic import BaseModel
-# class EvaluationOutput(BaseModel):
-#     is_danger: bool
-#     reason: str
-#     detected_info: list[str]
-#
-# llm_with_structure = llm.with_structured_output(EvaluationOutput)
 # ============================================================================
 
-from typing import Literal
-from langchain_core.messages import HumanMessage
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Literal
+
+from langchain_core.messages import AIMessage, HumanMessage
+from pydantic import BaseModel, Field
 
 from ..graph.state import VoiceGuardianState, EvaluationResult
+from ..tools.pii_detector import PIIDetection, detect_pii
+from ..utils.llm import get_evaluation_llm
 
 
-def evaluate_node(state: VoiceGuardianState) -> dict:
-    """
-    Evaluator Agent 노드 (스켈레톤)
+EVALUATION_PROMPT = """당신은 보이스피싱 예방 훈련의 **평가 에이전트**입니다.
+사기범 역할의 대사에 대한 사용자(어르신)의 응답이 실제 상황이라면 위험했을지 판단하세요.
+
+## 위험으로 판단할 경우
+- 개인정보·금융정보 노출: 주민등록번호, 계좌번호, 카드번호, 비밀번호, 인증번호, 주소, 이름 등
+- 사기범 요구에 대한 협조·동의: 송금/이체 약속, 앱 설치, 링크 클릭, 현금 전달, 정보 제공 약속
+- 사기범이 악용할 수 있는 약점 노출: 혼자 산다, 돈이 급하다 등
+
+## 안전으로 판단할 경우
+- 의심, 질문, 거절, 확인하겠다는 답변, 정보를 주지 않는 단순 대답
+
+## 사기범의 직전 대사
+{scammer_line}
+
+## 사용자 응답
+{user_message}
+
+## 1차 패턴 검사 결과 (참고)
+{hints}
+
+detected_info에는 노출된 정보의 종류만 적고, 실제 값은 적지 마세요."""
+
+
+class EvaluationOutput(BaseModel):
+    """LLM 문맥 검사 구조화 출력"""
+    is_danger: bool = Field(description="실제 상황이라면 위험한 응답인지")
+    reason: str = Field(description="판단 이유 (한두 문장)")
+    detected_info: list[str] = Field(default_factory=list, description="노출된 민감 정보 종류 목록")
+
+
+@dataclass
+class EvaluatorStats:
+    """평가 단계별 카운터 스냅샷"""
+    tier1_danger: int = 0     # 1단계에서 위험 확정
+    tier1_safe: int = 0       # 1단계에서 안전 확정
+    escalated: int = 0        # 2단계(LLM)로 넘긴 메시지
+    llm_errors: int = 0       # 2단계 실패 (1단계 결과로 보수적 판정)
     
-    사용자의 응답을 평가하여 개인정보 노출 여부를 판별합니다.
+    @property
+    def escalation_rate(self) -> float:
+        total = self.tier1_danger + self.tier1_safe + self.escalated
+        return self.escalated / total if total else 0.0
     
-    Args:
-        state: 현재 공유 상태
-        
-    Returns:
-        업데이트할 상태 딕셔너리 (evaluation_result 포함)
-        
-    TODO: 실제 평가 로직 구현 필요
-    - 정규표현식 검사 (주민번호, 계좌번호 패턴)
-    - LLM 문맥 검사 (감정적 약점, 암묵적 동의)
-    - with_structured_output() 활용
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "escalation_rate": self.escalation_rate}
+
+
+_stats = EvaluatorStats()
+_stats_lock = threading.Lock()
+
+
+def get_evaluator_stats() -> EvaluatorStats:
+    """프로세스 공용 평가 카운터"""
+    with _stats_lock:
+        return EvaluatorStats(**asdict(_stats))
+
+
+def _count(field_name: str) -> None:
+    with _stats_lock:
+        setattr(_stats, field_name, getattr(_stats, field_name) + 1)
+
+
+def _last_exchange(state: VoiceGuardianState) -> tuple[str, str]:
     """
-    messages = state.get("messages", [])
+    (사기범 직전 대사, 평가할 사용자 메시지)
     
-    # 마지막 사용자 메시지 찾기
-    user_message = ""
+    이번 턴 입력(user_input)이 아직 messages에 없으면 user_input을 평가 대상으로 사용합니다.
+    """
+    messages = state.get("messages", [])
+    user_message = state.get("user_input", "")
+    scammer_line = ""
     for msg in reversed(messages):
-        if isinstance(msg, HumanMessage):
+        if isinstance(msg, HumanMessage) and not user_message:
             user_message = msg.content
+        elif isinstance(msg, AIMessage):
+            scammer_line = msg.content
             break
-    
-    # ========================================
-    # TODO: 여기에 실제 평가 로직 구현
-    # ========================================
-    # 
-    # 예시 구현 흐름:
-    # 1. regex_check = check_regex_patterns(user_message)
-    # 2. if regex_check.detected:
-    #        return danger_result(regex_check)
-    # 3. llm_check = check_with_llm(user_message, messages)
-    # 4. return llm_check
-    #
-    # ========================================
-    
-    # 임시 구현: 항상 안전으로 판정 (실제 구현 시 교체)
-    evaluation_result: EvaluationResult = {
+    return scammer_line, user_message
+
+
+def _tier1_result(detection: PIIDetection) -> EvaluationResult:
+    """1단계 확정 판정 → evaluation_result"""
+    if detection.verdict == "danger":
+        kinds = ", ".join(dict.fromkeys(f.kind for f in detection.findings if f.confirmed))
+        return {
+            "is_danger": True,
+            "reason": f"{kinds}가(이) 노출되었습니다.",
+            "detected_info": detection.labels,
+        }
+    return {
         "is_danger": False,
-        "reason": "[스켈레톤] 실제 평가 로직 미구현 - 항상 안전 판정",
+        "reason": "민감 정보나 위험 신호가 없는 응답입니다.",
         "detected_info": [],
     }
+
+
+def _tier2_prompt(scammer_line: str, user_message: str, detection: PIIDetection) -> str:
+    hints = []
+    if detection.findings:
+        hints.append("확정되지 않은 숫자 정보: " + ", ".join(detection.labels))
+    if detection.cues:
+        hints.append("위험 신호 문구: " + ", ".join(detection.cues))
+    return EVALUATION_PROMPT.format(
+        scammer_line=scammer_line or "(없음)",
+        user_message=user_message,
+        hints="\n".join(hints) or "(없음)",
+    )
+
+
+def _tier2_result(output: EvaluationOutput | None, detection: PIIDetection) -> EvaluationResult:
+    """LLM 출력 → evaluation_result (실패 시 숫자 정보가 있으면 위험 쪽으로 판정)"""
+    if output is None:
+        _count("llm_errors")
+        return {
+            "is_danger": bool(detection.findings),
+            "reason": "문맥 검사 실패 - 1차 패턴 검사 결과로 판정했습니다.",
+            "detected_info": detection.labels,
+        }
+    return {
+        "is_danger": output.is_danger,
+        "reason": output.reason,
+        # 값이 가려진 1차 탐지 항목을 우선 표기
+        "detected_info": detection.labels or list(output.detected_info),
+    }
+
+
+def _settle_tier1(detection: PIIDetection) -> EvaluationResult | None:
+    """1단계에서 확정되면 결과, LLM 검사가 필요하면 None"""
+    if detection.verdict == "ambiguous":
+        _count("escalated")
+        return None
+    _count("tier1_danger" if detection.verdict == "danger" else "tier1_safe")
+    return _tier1_result(detection)
+
+
+def evaluate_message(
+    user_message: str,
+    scammer_line: str = "",
+    detection: PIIDetection | None = None,
+) -> EvaluationResult:
+    """
+    메시지 1건 평가 (라이브 노드·오프라인 일괄 채점 공용)
+    
+    Args:
+        user_message: 평가할 사용자 메시지
+        scammer_line: 직전 사기범 대사 (LLM 문맥 검사에 사용)
+        detection: 미리 계산한 1단계 결과 (일괄 채점에서 프로세스 풀로 계산한 값)
+    
+    Returns:
+        EvaluationResult
+    """
+    detection = detection or detect_pii(user_message)
+    result = _settle_tier1(detection)
+    if result is not None:
+        return result
+    try:
+        llm = get_evaluation_llm().with_structured_output(EvaluationOutput)
+        output = llm.invoke(_tier2_prompt(scammer_line, user_message, detection))
+    except Exception:
+        output = None
+    return _tier2_result(output, detection)
+
+
+async def aevaluate_message(
+    user_message: str,
+    scammer_line: str = "",
+    detection: PIIDetection | None = None,
+) -> EvaluationResult:
+    """evaluate_message의 비동기 버전 (2단계 LLM 호출에 ainvoke 사용)"""
+    detection = detection or detect_pii(user_message)
+    result = _settle_tier1(detection)
+    if result is not None:
+        return result
+    try:
+        llm = get_evaluation_llm().with_structured_output(EvaluationOutput)
+        output = await llm.ainvoke(_tier2_prompt(scammer_line, user_message, detection))
+    except Exception:
+        output = None
+    return _tier2_result(output, detection)
+
+
+def evaluate_node(state: VoiceGuardianState) -> dict:
+    """
+    Evaluator Agent 노드
+    
+    사용자의 응답을 평가하여 개인정보 노출 여부를 판별합니다.
+    1단계 패턴 검사로 확정되지 않는 메시지만 LLM 문맥 검사를 거칩니다.
+    
+    Args:
+        state: 현재 공유 상태
     
+    Returns:
+        업데이트할 상태 딕셔너리 (evaluation_result 포함)
+    """
+    scammer_line, user_message = _last_exchange(state)
     return {
-        "evaluation_result": evaluation_result,
+        "evaluation_result": evaluate_message(user_message, scammer_line),
+    }
+
+
+async def aevaluate_node(state: VoiceGuardianState) -> dict:
+    """evaluate_node의 비동기 버전 (2단계 LLM 호출에 ainvoke 사용)"""
+    scammer_line, user_message = _last_exchange(state)
+    return {
+        "evaluation_result": await aevaluate_message(user_message, scammer_line),
     }
 
 
@@ -94,7 +251,7 @@ def route_from_evaluator(state: VoiceGuardianState) -> Literal["roleplay", "guar
     
     Args:
         state: 현재 공유 상태
-        
+    
     Returns:
         다음 노드 이름
     """
@@ -2,91 +2,98 @@
 # 개인정보 노출 시 대화를 중단하고 교육 메시지 제공
 #
 # ============================================================================
-# TODO: 다른 담당자가 구현할 부분
-# ============================================================================
-# 
 # 구현 요구사항:
 # 1. 롤플레잉 대화를 중단하고 위험 상황 설명
 # 2. RAG로 매일경제 뉴스 데이터를 검색하여 사실 기반 경고 생성
 # 3. 왜 위험한지 이유를 설명하고 대처 방법 제시
 # 4. "다른 상황도 연습해볼까요?" 등의 문구로 지속 학습 유도
 #
-# 참고할 함수:
-# - search_voice_phishing_cases(query, top_k): RAG 검색
-# - format_rag_result_for_llm(results): 검색 결과 포맷팅
+# 교육 설명 캐시 (utils.guardian_cache):
+# - RAG + Guardian LLM으로 만드는 "왜 위험한지·실제 사례·지금 할 일" 설명은
+#   (시나리오 주제, 노출 정보 분류)마다 미리 생성해 둔 것을 사용 → 개입 순간 LLM 대기 없음
+# - 감지 이유·노출 정보(가린 값)는 evaluation_result에서 로컬로 채움
+# - 처음 보는 조합만 실행 중 생성해 캐시에 저장, 생성 실패 시 기본 안내 사용
+# - 사전 생성 / 재수집 후 갱신: python -m llm.utils.guardian_cache
 #
 # 출력 예시:
-# "잠깐요! 방금 주민등록번호를 말씀하셨는데, 이건 매우 위험합니다.
-#  실제로 매일경제 기사에 따르면, 카드사 사칭 사기범들이 이런 방식으로
-#  개인정보를 수집한 뒤 금융 피해를 일으킨 사례가 있습니다.
-#  
-#  앞으로는 전화로 절대 개인정보를 알려주지 마세요.
+# "⚠️ 잠깐요! 위험한 상황이 감지되었습니다.
+#  [감지된 위험]: 주민등록번호가(이) 노출되었습니다.
+#  [노출된 정보]: 주민등록번호(8001011******)
+#
+#  💡 카드사 사칭 사기범은 주민등록번호로 ...
+#  💡 실제로 매일경제 기사에 따르면 ...
+#  💡 지금 바로 ...
+#
 #  다른 상황도 연습해볼까요?"
 # ============================================================================
 
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, HumanMessage
 
 from ..graph.state import VoiceGuardianState
-from ..tools.voice_phishing_rag import search_voice_phishing_cases, format_rag_result_for_llm
+from ..utils.guardian_cache import aget_explanation, education_key, get_explanation
 
 
-def guardian_node(state: VoiceGuardianState) -> dict:
-    """
-    Guardian Agent 노드 (스켈레톤)
-    
-    위험 상황 발생 시 개입하여 교육 메시지를 제공합니다.
-    
-    Args:
-        state: 현재 공유 상태
-        
-    Returns:
-        업데이트할 상태 딕셔너리 (messages에 교육 메시지 추가)
-        
-    TODO: 실제 교육 메시지 생성 로직 구현 필요
-    - RAG로 관련 뉴스 검색
-    - LLM으로 상황별 맞춤 경고 메시지 생성
-    - 대처 방법 및 재학습 유도 문구 포함
-    """
-    evaluation_result = state.get("evaluation_result", {})
-    scenario_topic = state.get("scenario_topic", "")
-    
-    # 감지된 위험 정보
+# 캐시된 설명도 없고 생성도 못 했을 때의 기본 안내
+DEFAULT_EXPLANATION = """💡 기억하세요:
+- 전화로 개인정보(주민번호, 계좌번호, 비밀번호)를 절대 알려주지 마세요.
+- 공공기관이나 금융기관은 전화로 개인정보를 요구하지 않습니다.
+- 의심되면 전화를 끊고 해당 기관에 직접 확인하세요."""
+
+
+def _education_message(evaluation_result: dict, explanation: str | None) -> str:
+    """감지 이유·노출 정보 + (주제, 분류) 설명 → 교육 메시지"""
     reason = evaluation_result.get("reason", "개인정보 노출 위험")
     detected_info = evaluation_result.get("detected_info", [])
-    
-    # ========================================
-    # TODO: 여기에 실제 교육 메시지 생성 로직 구현
-    # ========================================
-    #
-    # 예시 구현 흐름:
-    # 1. news_results = search_voice_phishing_cases(scenario_topic)
-    # 2. news_context = format_rag_result_for_llm(news_results)
-    # 3. education_message = generate_education_message(
-    #        reason=reason,
-    #        detected_info=detected_info,
-    #        news_context=news_context
-    #    )
-    #
-    # ========================================
-    
-    # 임시 구현: 기본 경고 메시지 (실제 구현 시 교체)
     detected_str = ", ".join(detected_info) if detected_info else "민감한 정보"
     
-    education_message = f"""⚠️ 잠깐요! 위험한 상황이 감지되었습니다.
+    return f"""⚠️ 잠깐요! 위험한 상황이 감지되었습니다.
 
 [감지된 위험]: {reason}
 [노출된 정보]: {detected_str}
 
-💡 기억하세요:
-- 전화로 개인정보(주민번호, 계좌번호, 비밀번호)를 절대 알려주지 마세요.
-- 공공기관이나 금융기관은 전화로 개인정보를 요구하지 않습니다.
-- 의심되면 전화를 끊고 해당 기관에 직접 확인하세요.
-
-[스켈레톤 메시지] 실제 구현 시 RAG 기반 뉴스 데이터로 구체적인 사례를 제공합니다.
+{explanation or DEFAULT_EXPLANATION}
 
 다른 상황도 연습해볼까요?"""
+
+
+def _guardian_result(state: VoiceGuardianState, evaluation_result: dict, explanation: str | None) -> dict:
+    """교육 메시지로 상태 업데이트 구성 (평가한 사용자 입력도 대화 기록에 남기고 소비)"""
+    user_input = state.get("user_input", "")
+    
+    new_messages = []
+    if user_input:
+        new_messages.append(HumanMessage(content=user_input))
+    new_messages.append(AIMessage(content=_education_message(evaluation_result, explanation)))
     
     return {
-        "messages": [AIMessage(content=education_message)],
+        "messages": new_messages,
         "current_phase": "guardian",  # Master가 다음 단계 결정
+        "user_input": "",  # 입력 소비 완료
     }
+
+
+def guardian_node(state: VoiceGuardianState) -> dict:
+    """
+    Guardian Agent 노드
+    
+    위험 상황 발생 시 개입하여 교육 메시지를 제공합니다.
+    (주제, 노출 정보 분류)별 설명은 캐시에서 가져오고, 처음 보는 조합만 RAG + LLM으로 생성합니다.
+    
+    Args:
+        state: 현재 공유 상태
+        
+    Returns:
+        업데이트할 상태 딕셔너리 (messages에 사용자 입력 + 교육 메시지 추가)
+    """
+    evaluation_result = state.get("evaluation_result") or {}
+    topic, category = education_key(state.get("scenario_topic", ""), evaluation_result)
+    explanation = get_explanation(topic, category)
+    return _guardian_result(state, evaluation_result, explanation)
+
+
+async def aguardian_node(state: VoiceGuardianState) -> dict:
+    """guardian_node의 비동기 버전 (캐시 미스 시 asearch + ainvoke로 생성)"""
+    evaluation_result = state.get("evaluation_result") or {}
+    topic, category = education_key(state.get("scenario_topic", ""), evaluation_result)
+    explanation = await aget_explanation(topic, category)
+    return _guardian_result(state, evaluation_result, explanation)
@@ -18,13 +18,19 @@
 # 실행 순서: 노드 실행 → 엣지로 다음 노드 결정 → 다음 노드 실행 → ...
 # ============================================================================
 
-from typing import Literal
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from typing import Callable, Literal
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 
 from ..graph.state import VoiceGuardianState
-from ..utils.llm import get_master_llm
+from ..utils.llm import get_master_llm, get_topic_llm
 from ..utils.memory import build_context_for_llm, get_short_term_messages
+from ..utils.semantic_cache import get_semantic_cache
+from ..utils.scenario_topics import TOPIC_CONFIDENCE, canonical_topic, resolve_scenario_topic
 
 
 # Master Agent 시스템 프롬프트
@@ -73,25 +79,111 @@ Roleplay Agent에게 새로운 시나리오나 다른 상황으로 훈련을 계
 }
 
 
-def master_node(state: VoiceGuardianState) -> dict:
+# 평가 → 롤플레이 복귀 시 LLM 대신 템플릿 지시 사용 (VOICE_GUARDIAN_MASTER_FAST_PATH=0이면 항상 LLM)
+MASTER_FAST_PATH = os.environ.get("VOICE_GUARDIAN_MASTER_FAST_PATH", "1") != "0"
+
+# 마지막 사용자 발화의 반응 유형 판별 패턴 (공백 제거 후 검사)
+USER_SIGNAL_PATTERNS = {
+    "suspicion": re.compile(
+        r"사기|피싱|의심|수상|이상한데|이상하네|누구(세요|시죠|신데|라고)|진짜(예요|에요|인가요|맞나요|요)"
+        r"|어디(서|세요|라고)|확인(해볼|하고|할게)|신고|경찰서에|못믿|믿을수|거짓말|끊을게|끊겠"
+    ),
+    "refusal": re.compile(
+        r"싫(어|습니다|은데)|안(돼|됩니다|할래|할게|알려|줄|드려)|못(해|하겠|알려|드려)|거절|필요없|됐(어|습니다)"
+        r"|그만|말못|알려줄수없|관심없"
+    ),
+    "compliance": re.compile(
+        r"^(네|예|응|넵|알겠|그래요|좋아요)|알겠(어|습니다|어요)|맞(아요|습니다)|여기(요|있)"
+        r"|(불러|알려|보내|해)드릴|어떻게하면|뭘하면|하면되|드릴게"
+    ),
+}
+
+# 반응 유형별 롤플레이 지시 템플릿
+ROUTINE_INSTRUCTIONS = {
+    "suspicion": "사용자가 의심하고 있어. '{scenario_topic}' 역할을 유지하면서 부서명·사건번호·고객센터 안내 같은 "
+                 "그럴듯한 근거로 안심시키고, 공식 절차인 것처럼 차분하게 신뢰를 다시 얻어.",
+    "refusal": "사용자가 거절했어. 같은 요구를 반복하지 말고 다른 방식으로 접근해. "
+               "불이익(계좌 정지, 추가 피해 등)을 암시하거나 더 작은 정보부터 요청해.",
+    "compliance": "사용자가 협조적이야. 자연스럽게 다음 단계로 넘어가 '{scenario_topic}' 시나리오에 맞는 "
+                  "개인정보나 행동(인증번호, 앱 설치, 이체 등)을 구체적으로 요청해.",
+}
+
+
+def classify_user_signal(text: str) -> str | None:
     """
-    Master Agent 노드 (Node)
+    사용자 발화의 반응 유형 (suspicion / refusal / compliance)
     
-    현재 상태를 분석하여:
-    1. 다음 단계를 결정
-    2. 하위 에이전트에게 전달할 지시를 LLM으로 생성
+    정확히 한 유형만 매칭될 때만 반환하고, 매칭이 없거나 여러 유형이 섞이면(애매한 경우) None.
+    """
+    compact = re.sub(r"\s+", "", text or "")
+    matched = [signal for signal, pattern in USER_SIGNAL_PATTERNS.items() if pattern.search(compact)]
+    return matched[0] if len(matched) == 1 else None
+
+
+@dataclass
+class _LLMCall:
+    """
+    LLM 응답이 있어야 완성되는 Master 처리 단계 (sync/async 노드 공용)
+    
+    prompt를 LLM에 보내고, 응답 텍스트(실패 시 None)를 finish에 넘기면 상태 업데이트가 나옵니다.
+    cache_role이 있으면 의미 캐시(scope 완전 일치 + cache_text 유사도)를 먼저 조회합니다.
+    """
+    prompt: str
+    finish: Callable[[str | None], dict]
+    get_llm: Callable = get_master_llm
+    cache_role: str | None = None
+    cache_scope: str = ""
+    cache_text: str = ""
+    
+    def cached(self) -> str | None:
+        if self.cache_role is None:
+            return None
+        return get_semantic_cache(self.cache_role).lookup(self.cache_scope, self.cache_text)
+    
+    def remember(self, text: str | None) -> None:
+        # LLM 실패(None)나 빈 응답은 저장하지 않음
+        if self.cache_role is not None and text:
+            get_semantic_cache(self.cache_role).store(self.cache_scope, self.cache_text, text)
+
+
+def _last_user_text(messages: list) -> str:
+    """가장 최근 사용자 발화 (없으면 빈 문자열)"""
+    for msg in reversed(messages):
+        if isinstance(msg, HumanMessage):
+            return msg.content
+    return ""
+
+
+# 의미 캐시 scope의 턴 구간 크기 (프롬프트의 turn_count가 이 구간 안에서만 재사용됨)
+CACHE_TURN_BUCKET = 4
+
+
+def _instruction_cache_scope(task_key: str, scenario_topic: str, turn_count: int, messages: list) -> str:
+    """
+    Master 지시 의미 캐시 scope
+    
+    프롬프트에 들어가는 대화 맥락이 다르면 같은 사용자 발화라도 지시가 달라야 하므로,
+    작업·주제에 턴 구간과 직전 AI 대사 해시를 붙여 다른 대화(다른 세션 포함)와 항목을 나누지 않음.
+    """
+    last_ai = next((msg.content for msg in reversed(messages) if isinstance(msg, AIMessage)), "")
+    digest = hashlib.sha1(last_ai.encode("utf-8")).hexdigest()[:12]
+    return f"{task_key}|{scenario_topic}|t{turn_count // CACHE_TURN_BUCKET}|{digest}"
+
+
+def _plan_master(state: VoiceGuardianState, fused: bool = False) -> dict | _LLMCall:
+    """
+    현재 상태를 분석하여 다음 단계를 결정
     
     Args:
-        state: 현재 공유 상태
-        
+        fused: True면 롤플레이로 넘어가는 지시는 LLM 없이 작업 설명(지시 초안)만 넘김
+            (fused_roleplay_node가 한 번의 호출로 지시와 대사를 함께 생성)
+    
     Returns:
-        업데이트할 상태 딕셔너리
+        LLM 없이 결정되면 상태 업데이트 dict, LLM 지시 생성이 필요하면 _LLMCall
     """
     current_phase = state.get("current_phase", "init")
     scenario_topic = state.get("scenario_topic", "")
-    turn_count = state.get("turn_count", 0)
     user_input = state.get("user_input", "")
-    needs_topic_selection = state.get("needs_topic_selection", False)
     messages = state.get("messages", [])
     long_term_summary = state.get("long_term_summary", "")
     
@@ -111,6 +203,7 @@ def master_node(state: VoiceGuardianState) -> dict:
                 state, "start_roleplay",
                 next_phase="roleplay",
                 conversation_context=conversation_context,
+                fused=fused,
             )
         else:
             # 주제 없음 → 사용자에게 질문
@@ -118,18 +211,12 @@ def master_node(state: VoiceGuardianState) -> dict:
                 state, "topic_selection",
                 next_phase="topic_selection",
                 conversation_context=conversation_context,
+                fused=fused,
             )
     
-    # 2. 주제 선택 단계: 사용자 응답 파싱
+    # 2. 주제 선택 단계: 사용자 응답에서 주제 추출
     if current_phase == "topic_selection" and user_input:
-        # 사용자 응답에서 주제 추출
-        parsed_topic = _parse_topic_from_input(user_input, conversation_context)
-        return {
-            "scenario_topic": parsed_topic,
-            "current_phase": "roleplay",
-            "master_instruction": f"뉴스 데이터를 참고하여 '{parsed_topic}' 시나리오로 보이스피싱 롤플레이를 시작해. 사기범 역할로 첫 대사를 생성해.",
-            "user_input": "",  # 입력 소비
-        }
+        return _parse_topic_from_input(user_input, conversation_context)
     
     # 3. Guardian 후 복귀
     if current_phase == "guardian":
@@ -137,34 +224,162 @@ def master_node(state: VoiceGuardianState) -> dict:
             state, "after_guardian",
             next_phase="roleplay",
             conversation_context=conversation_context,
+            fused=fused,
         )
     
-    # 4. 롤플레이 진행 중: 사용자 응답이 있으면 평가로
-    if current_phase == "roleplay" and user_input:
-        return {
-            "current_phase": "evaluate",
-            "master_instruction": "사용자의 응답을 평가해. 개인정보 노출 여부를 확인해.",
-        }
+    # 4. 사용자 응답이 있으면 지시 없이 평가로 (roleplay 대사 직후는 current_phase가 evaluate)
+    #    계속 지시는 안전 판정 뒤 continue 노드에서 생성 (danger 턴에 지시 LLM 호출을 낭비하지 않음)
+    if current_phase in ("roleplay", "evaluate") and user_input:
+        return {"current_phase": "evaluate"}
     
-    # 5. 평가 후 롤플레이 계속
+    # 5. 평가할 입력 없이 평가 단계로 들어온 경우: 롤플레이 계속
     if current_phase == "evaluate":
-        return _generate_instruction(
-            state, "continue_roleplay",
-            next_phase="roleplay",
-            conversation_context=conversation_context,
-        )
+        return _continue_instruction(state, conversation_context, next_phase="roleplay", fused=fused)
     
     # 기본: 현재 상태 유지
     return {}
 
 
+def _continue_instruction(
+    state: VoiceGuardianState,
+    conversation_context: str,
+    next_phase: str,
+    fused: bool = False,
+) -> dict | _LLMCall:
+    """롤플레이 계속 지시 (흔한 반응(의심/거절/협조)은 템플릿 지시, 애매한 경우만 LLM)"""
+    scenario_topic = state.get("scenario_topic", "")
+    user_text = state.get("user_input", "") or _last_user_text(state.get("messages", []))
+    signal = classify_user_signal(user_text) if MASTER_FAST_PATH else None
+    if signal is not None:
+        return {
+            "current_phase": next_phase,
+            "master_instruction": ROUTINE_INSTRUCTIONS[signal].format(
+                scenario_topic=scenario_topic or "보이스피싱",
+            ),
+        }
+    return _generate_instruction(
+        state, "continue_roleplay",
+        next_phase=next_phase,
+        conversation_context=conversation_context,
+        fused=fused,
+    )
+
+
+def master_node(state: VoiceGuardianState) -> dict:
+    """
+    Master Agent 노드 (Node)
+    
+    현재 상태를 분석하여:
+    1. 다음 단계를 결정
+    2. 하위 에이전트에게 전달할 지시를 LLM으로 생성
+    
+    Args:
+        state: 현재 공유 상태
+        
+    Returns:
+        업데이트할 상태 딕셔너리
+    """
+    return _run_plan(_plan_master(state))
+
+
+async def amaster_node(state: VoiceGuardianState) -> dict:
+    """master_node의 비동기 버전 (LLM 호출에 ainvoke 사용)"""
+    return await _arun_plan(_plan_master(state))
+
+
+def fused_master_node(state: VoiceGuardianState) -> dict:
+    """
+    통합 턴 모드의 Master 노드 (create_workflow(fused_roleplay=True))
+    
+    롤플레이로 넘어가는 단계에서는 지시 LLM을 호출하지 않고 지시 초안만 남깁니다.
+    주제 질문·주제 파싱 등 나머지는 master_node와 같습니다.
+    """
+    return _run_plan(_plan_master(state, fused=True))
+
+
+async def afused_master_node(state: VoiceGuardianState) -> dict:
+    """fused_master_node의 비동기 버전"""
+    return await _arun_plan(_plan_master(state, fused=True))
+
+
+def _plan_continue(state: VoiceGuardianState, fused: bool = False) -> dict | _LLMCall:
+    """안전 판정 뒤 롤플레이 계속 지시 준비 (evaluate → roleplay 사이)"""
+    short_term = get_short_term_messages(state.get("messages", []))
+    conversation_context = build_context_for_llm(short_term, state.get("long_term_summary", ""))
+    return _continue_instruction(state, conversation_context, next_phase="roleplay", fused=fused)
+
+
+def continue_node(state: VoiceGuardianState) -> dict:
+    """
+    계속 지시 노드 (evaluate가 안전 판정일 때 roleplay 직전에 실행)
+    
+    흔한 반응은 템플릿 지시, 애매한 반응만 Master LLM으로 지시를 생성합니다.
+    """
+    return _run_plan(_plan_continue(state))
+
+
+async def acontinue_node(state: VoiceGuardianState) -> dict:
+    """continue_node의 비동기 버전"""
+    return await _arun_plan(_plan_continue(state))
+
+
+def fused_continue_node(state: VoiceGuardianState) -> dict:
+    """통합 턴 모드의 계속 지시 노드 (애매한 반응도 LLM 없이 지시 초안만 넘김)"""
+    return _run_plan(_plan_continue(state, fused=True))
+
+
+async def afused_continue_node(state: VoiceGuardianState) -> dict:
+    """fused_continue_node의 비동기 버전"""
+    return await _arun_plan(_plan_continue(state, fused=True))
+
+
+def _run_plan(plan: dict | _LLMCall) -> dict:
+    """계획 실행 (의미 캐시 → LLM → finish)"""
+    if isinstance(plan, dict):
+        return plan
+    
+    text = plan.cached()
+    if text is not None:
+        return plan.finish(text)
+    
+    try:
+        llm = plan.get_llm()
+        response = llm.invoke(plan.prompt)
+        text = response.content.strip()
+    except Exception:
+        # LLM 실패 시 finish가 기본값 사용
+        text = None
+    plan.remember(text)
+    return plan.finish(text)
+
+
+async def _arun_plan(plan: dict | _LLMCall) -> dict:
+    """_run_plan의 비동기 버전"""
+    if isinstance(plan, dict):
+        return plan
+    
+    text = plan.cached()
+    if text is not None:
+        return plan.finish(text)
+    
+    try:
+        llm = plan.get_llm()
+        response = await llm.ainvoke(plan.prompt)
+        text = response.content.strip()
+    except Exception:
+        text = None
+    plan.remember(text)
+    return plan.finish(text)
+
+
 def _generate_instruction(
     state: VoiceGuardianState,
     task_key: str,
     next_phase: str,
     conversation_context: str,
-) -> dict:
-    """LLM을 사용하여 하위 에이전트 지시 생성"""
+    fused: bool = False,
+) -> dict | _LLMCall:
+    """하위 에이전트 지시 생성용 LLM 호출 준비 (fused면 롤플레이 지시는 초안만 반환)"""
     scenario_topic = state.get("scenario_topic", "")
     turn_count = state.get("turn_count", 0)
     current_phase = state.get("current_phase", "init")
@@ -173,6 +388,13 @@ def _generate_instruction(
     if "{scenario_topic}" in task_description:
         task_description = task_description.format(scenario_topic=scenario_topic or "보이스피싱")
     
+    # evaluate도 안전 판정이면 roleplay로 이어지므로 같은 초안 처리
+    if fused and next_phase in ("roleplay", "evaluate"):
+        return {
+            "current_phase": next_phase,
+            "master_instruction": task_description,
+        }
+    
     prompt = MASTER_SYSTEM_PROMPT.format(
         current_phase=current_phase,
         scenario_topic=scenario_topic or "(미선택)",
@@ -181,22 +403,48 @@ def _generate_instruction(
         task_description=task_description,
     )
     
-    try:
-        llm = get_master_llm()
-        response = llm.invoke(prompt)
-        instruction = response.content.strip()
-    except Exception as e:
+    def finish(text: str | None) -> dict:
         # LLM 실패 시 기본 지시
-        instruction = f"[기본 지시] {task_key} 단계를 진행해주세요."
+        instruction = text if text is not None else f"[기본 지시] {task_key} 단계를 진행해주세요."
+        return {
+            "current_phase": next_phase,
+            "master_instruction": instruction,
+        }
     
+    # 같은 대화 맥락에서 비슷한 사용자 발화면 지시를 재사용 (이번 턴 입력이 아직 messages에 없으면 입력 기준)
+    # 사용자 발화가 없는 단계(롤플레이 시작, Guardian 이후)는 scope만으로 맞아버리므로 캐시하지 않음
+    messages = state.get("messages", [])
+    cache_text = state.get("user_input", "") or _last_user_text(messages)
+    return _LLMCall(
+        prompt=prompt,
+        finish=finish,
+        cache_role="master" if cache_text else None,
+        cache_scope=_instruction_cache_scope(task_key, scenario_topic, turn_count, messages),
+        cache_text=cache_text,
+    )
+
+
+def _topic_selected(topic: str) -> dict:
+    """주제 확정 후 롤플레이 시작 상태"""
     return {
-        "current_phase": next_phase,
-        "master_instruction": instruction,
+        "scenario_topic": topic,
+        "current_phase": "roleplay",
+        "master_instruction": f"뉴스 데이터를 참고하여 '{topic}' 시나리오로 보이스피싱 롤플레이를 시작해. 사기범 역할로 첫 대사를 생성해.",
+        "user_input": "",  # 입력 소비
     }
 
 
-def _parse_topic_from_input(user_input: str, conversation_context: str) -> str:
-    """사용자 입력에서 시나리오 주제 추출"""
+def _parse_topic_from_input(user_input: str, conversation_context: str) -> dict | _LLMCall:
+    """
+    사용자 입력에서 시나리오 주제 추출
+    
+    로컬 주제 해석기(별칭 + 자모 편집 거리)의 확신도가 충분하면 바로 확정하고,
+    애매한 입력만 LLM 호출을 준비합니다.
+    """
+    match = resolve_scenario_topic(user_input)
+    if match is not None and match.score >= TOPIC_CONFIDENCE:
+        return _topic_selected(match.label)
+    
     prompt = f"""사용자가 보이스피싱 훈련에서 원하는 시나리오 유형을 말했습니다.
 
 사용자 입력: "{user_input}"
@@ -207,12 +455,19 @@ def _parse_topic_from_input(user_input: str, conversation_context: str) -> str:
 
 주제만 간결하게 출력하세요:"""
     
-    try:
-        llm = get_master_llm()
-        response = llm.invoke(prompt)
-        return response.content.strip()
-    except Exception:
-        return "일반 보이스피싱"
+    def finish(text: str | None) -> dict:
+        # LLM 출력도 정식 라벨로 맞춰 RAG 주제 필터와 일치시킴
+        return _topic_selected(canonical_topic(text) if text else "일반 보이스피싱")
+    
+    # 결정적 topic LLM (temperature 0 + 응답 캐시)
+    return _LLMCall(
+        prompt=prompt,
+        finish=finish,
+        get_llm=get_topic_llm,
+        cache_role="topic",
+        cache_scope="parse_topic",
+        cache_text=user_input,
+    )
 
 
 def route_from_master(state: VoiceGuardianState) -> Literal["roleplay", "evaluate", "guardian", "topic_selection", "__end__"]:
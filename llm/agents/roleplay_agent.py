@@ -1,13 +1,30 @@
 # Roleplaying Agent: 보이스피싱범 역할 연기
 # Master Agent의 지시를 받아 매일경제 뉴스 기반 사기범 대사 생성
 
+import asyncio
+import datetime as dt
+
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from pydantic import BaseModel, Field
 
 from ..graph.state import VoiceGuardianState
 from ..utils.llm import get_roleplay_llm
-from ..utils.memory import get_short_term_messages, update_memory, build_context_for_llm
+from ..utils.memory import get_short_term_messages, update_memory, aupdate_memory, build_context_for_llm
 from ..tools.voice_phishing_rag import search_voice_phishing_cases, format_rag_result_for_llm
+from ..tools.news_index import HashingEmbedder
+from ..tools.snippet_compressor import compress_results
+
+
+# 뉴스 컨텍스트 재검색 기준 (주제가 같으면 세션 내내 고정 컨텍스트 재사용)
+NEWS_DRIFT_THRESHOLD = 0.1   # 최근 대화와 고정 쿼리의 유사도가 이보다 낮으면 대화가 벗어난 것으로 판단
+NEWS_REFRESH_MIN_TURNS = 5   # drift로 인한 재검색 최소 간격 (턴)
+NEWS_DRIFT_WINDOW = 4        # drift 판단에 사용할 최근 메시지 수
+NEWS_RECENCY_DAYS = 365      # 이 기간 내 보도된 같은 주제 사례를 우선 (없으면 기간·주제 제한 없이 재검색)
+NEWS_TOKEN_BUDGET = 300      # 프롬프트에 넣는 뉴스 컨텍스트 토큰 예산 (주제·최신 발화와 겹치는 문장만 추출)
+
+# drift 판단용 경량 임베더 (인덱스 없이도 동작, 턴당 수십 µs)
+_drift_embedder = HashingEmbedder()
 
 
 # 시스템 프롬프트
@@ -42,47 +59,98 @@ ROLEPLAYING_SYSTEM_PROMPT = """당신은 **보이스피싱 예방 훈련용 롤
 """
 
 
-def _get_news_context(scenario_topic: str) -> str:
-    """RAG로 관련 뉴스 사례 검색"""
-    if not scenario_topic:
-        scenario_topic = "보이스피싱 최신 수법"
+# 통합 턴 모드 (Master 지시 + 대사를 한 번의 호출로 생성): 시스템 프롬프트 뒤에 덧붙이는 안내
+FUSED_TURN_PROMPT = """
+## 통합 턴 모드
+위 "Master Agent 지시"는 초안입니다. 대화 컨텍스트와 사용자의 마지막 반응을 보고
+먼저 이번 턴의 구체적인 지시(instruction)를 한두 문장으로 정한 뒤, 그 지시에 따른 사기범 대사(line)를 생성하세요.
+line에는 위 출력 형식 규칙이 그대로 적용됩니다.
+"""
+
+
+class FusedTurnOutput(BaseModel):
+    """통합 턴 모드 구조화 출력"""
+    instruction: str = Field(description="이번 턴 롤플레이 지시 (내부용, 사용자에게 보이지 않음)")
+    line: str = Field(description="사용자에게 보여줄 사기범 대사")
+
+
+def _get_news_results(query: str, topic: str = "") -> list[dict]:
+    """RAG로 관련 뉴스 사례 검색 (최근 NEWS_RECENCY_DAYS일, 같은 주제 사례 우선)"""
+    if not query:
+        query = "보이스피싱 최신 수법"
     
-    results = search_voice_phishing_cases(query=scenario_topic, top_k=3)
-    return format_rag_result_for_llm(results)
+    since = dt.date.today() - dt.timedelta(days=NEWS_RECENCY_DAYS)
+    results = search_voice_phishing_cases(query=query, top_k=3, since=since, topic=topic or None)
+    if not results:
+        results = search_voice_phishing_cases(query=query, top_k=3)
+    return results
 
 
-def roleplay_node(state: VoiceGuardianState) -> dict:
+def _conversation_drifted(query: str, messages: list) -> bool:
+    """최근 대화가 고정된 뉴스 쿼리와 충분히 멀어졌는지 (해싱 임베딩 코사인 유사도)"""
+    recent = " ".join(
+        msg.content for msg in messages[-NEWS_DRIFT_WINDOW:]
+        if isinstance(msg, (HumanMessage, AIMessage))
+    )
+    if not recent.strip() or not query:
+        return False
+    query_vec, recent_vec = _drift_embedder.embed([query, recent])
+    return float(query_vec @ recent_vec) < NEWS_DRIFT_THRESHOLD
+
+
+def _refresh_news_context(state: VoiceGuardianState, messages: list, scenario_topic: str, turn_count: int) -> dict:
     """
-    Roleplaying Agent 노드
+    세션에 고정된 뉴스 컨텍스트를 필요할 때만 갱신
     
-    Master Agent의 지시를 받아 보이스피싱범 역할의 대사를 생성합니다.
+    - 주제가 바뀌었거나 아직 컨텍스트가 없으면 주제로 재검색
+    - 대화가 주제에서 벗어났으면 (NEWS_REFRESH_MIN_TURNS 간격) 주제 + 최근 사용자 발화로 재검색
+    - 그 외에는 빈 dict 반환 → state의 기존 news_results 재사용
     
-    Args:
-        state: 현재 공유 상태
-        
     Returns:
-        업데이트할 상태 딕셔너리 (messages, turn_count, long_term_summary 등)
+        갱신할 news_context* 상태 딕셔너리 (갱신 불필요 시 {})
     """
+    pinned_topic = state.get("news_context_topic", "")
+    pinned_query = state.get("news_context_query", "")
+    pinned_turn = state.get("news_context_turn", 0)
+    
+    if not state.get("news_context") or pinned_topic != scenario_topic:
+        query = scenario_topic
+    elif turn_count - pinned_turn >= NEWS_REFRESH_MIN_TURNS and _conversation_drifted(pinned_query, messages):
+        last_user = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), "")
+        query = f"{scenario_topic} {last_user}".strip()
+    else:
+        return {}
+    
+    results = _get_news_results(query, scenario_topic)
+    return {
+        "news_context": format_rag_result_for_llm(results),
+        "news_results": results,
+        "news_context_query": query,
+        "news_context_topic": scenario_topic,
+        "news_context_turn": turn_count,
+    }
+
+
+def _build_llm_messages(
+    state: VoiceGuardianState,
+    short_term_messages: list,
+    new_summary: str,
+    news_update: dict,
+) -> list:
+    """시스템 프롬프트 + 트리거 메시지 구성 (sync/async 노드 공용)"""
     scenario_topic = state.get("scenario_topic", "일반 보이스피싱")
-    messages = state.get("messages", [])
     turn_count = state.get("turn_count", 0)
     user_input = state.get("user_input", "")
     master_instruction = state.get("master_instruction", "롤플레이를 진행해주세요.")
-    long_term_summary = state.get("long_term_summary", "")
-    
-    # 사용자 입력이 있으면 메시지에 추가
-    if user_input:
-        messages = list(messages) + [HumanMessage(content=user_input)]
     
-    # 메모리 업데이트 (5턴마다 요약)
-    short_term_messages, new_summary = update_memory(
-        messages=messages,
-        turn_count=turn_count,
-        existing_summary=long_term_summary,
-    )
-    
-    # 뉴스 컨텍스트 가져오기
-    news_context = _get_news_context(scenario_topic)
+    news_results = news_update.get("news_results", state.get("news_results") or [])
+    if news_results:
+        # 고정된 기사 중 주제·이번 사용자 발화와 관련된 문장만 예산 안에서 추출
+        news_context = format_rag_result_for_llm(
+            compress_results(news_results, scenario_topic, user_input, NEWS_TOKEN_BUDGET)
+        )
+    else:
+        news_context = news_update.get("news_context", state.get("news_context", ""))
     
     # 대화 컨텍스트 구성
     conversation_context = build_context_for_llm(short_term_messages, new_summary)
@@ -96,9 +164,7 @@ def roleplay_node(state: VoiceGuardianState) -> dict:
         conversation_context=conversation_context,
     )
     
-    # LLM 호출 (Anthropic API는 최소 1개의 user message 필요)
-    llm = get_roleplay_llm()
-    
+    # Anthropic API는 최소 1개의 user message 필요
     # 첫 턴이면 시작 트리거 메시지 추가
     if not user_input and turn_count == 0:
         trigger_message = HumanMessage(content="시나리오를 시작해주세요.")
@@ -107,21 +173,172 @@ def roleplay_node(state: VoiceGuardianState) -> dict:
     else:
         trigger_message = HumanMessage(content="대화를 계속해주세요.")
     
-    response = llm.invoke([
-        SystemMessage(content=system_prompt),
-        trigger_message
-    ])
+    return [SystemMessage(content=system_prompt), trigger_message]
+
+
+def _roleplay_result(
+    state: VoiceGuardianState,
+    reply: str,
+    new_summary: str,
+    news_update: dict,
+    pending_summary_id: str = "",
+) -> dict:
+    """LLM 대사로 상태 업데이트 구성"""
+    user_input = state.get("user_input", "")
     
     # 새 메시지 구성
     new_messages = []
     if user_input:
         new_messages.append(HumanMessage(content=user_input))
-    new_messages.append(AIMessage(content=response.content.strip()))
+    new_messages.append(AIMessage(content=reply.strip()))
     
     return {
         "messages": new_messages,
-        "turn_count": turn_count + 1,
+        "turn_count": state.get("turn_count", 0) + 1,
         "current_phase": "evaluate",  # 다음은 평가 단계
         "user_input": "",  # 입력 소비 완료
         "long_term_summary": new_summary,
+        "pending_summary_id": pending_summary_id,
+        **news_update,
     }
+
+
+def _incoming_messages(state: VoiceGuardianState) -> list:
+    """기존 메시지 + 이번 사용자 입력"""
+    messages = state.get("messages", [])
+    user_input = state.get("user_input", "")
+    if user_input:
+        messages = list(messages) + [HumanMessage(content=user_input)]
+    return messages
+
+
+def roleplay_node(state: VoiceGuardianState) -> dict:
+    """
+    Roleplaying Agent 노드
+    
+    Master Agent의 지시를 받아 보이스피싱범 역할의 대사를 생성합니다.
+    
+    Args:
+        state: 현재 공유 상태
+        
+    Returns:
+        업데이트할 상태 딕셔너리 (messages, turn_count, long_term_summary 등)
+    """
+    scenario_topic = state.get("scenario_topic", "일반 보이스피싱")
+    turn_count = state.get("turn_count", 0)
+    messages = _incoming_messages(state)
+    
+    # 메모리 업데이트 (5턴마다 요약, 요약은 백그라운드에서 생성해 이후 턴에 반영)
+    short_term_messages, new_summary, pending_summary_id = update_memory(
+        messages=messages,
+        turn_count=turn_count,
+        existing_summary=state.get("long_term_summary", ""),
+        pending_summary_id=state.get("pending_summary_id", ""),
+    )
+    
+    # 뉴스 컨텍스트: 세션에 고정된 값 재사용, 주제 변경/대화 이탈 시에만 재검색
+    news_update = _refresh_news_context(state, messages, scenario_topic, turn_count)
+    
+    llm = get_roleplay_llm()
+    response = llm.invoke(_build_llm_messages(state, short_term_messages, new_summary, news_update))
+    return _roleplay_result(state, response.content, new_summary, news_update, pending_summary_id)
+
+
+def _fused_messages(llm_messages: list) -> list:
+    """시스템 프롬프트에 통합 턴 안내 추가"""
+    system, *rest = llm_messages
+    return [SystemMessage(content=system.content + FUSED_TURN_PROMPT), *rest]
+
+
+def _fused_result(
+    state: VoiceGuardianState,
+    output: FusedTurnOutput,
+    new_summary: str,
+    news_update: dict,
+    pending_summary_id: str = "",
+) -> dict:
+    return {
+        **_roleplay_result(state, output.line, new_summary, news_update, pending_summary_id),
+        "master_instruction": output.instruction.strip(),
+    }
+
+
+def fused_roleplay_node(state: VoiceGuardianState) -> dict:
+    """
+    통합 턴 모드 Roleplaying 노드 (create_workflow(fused_roleplay=True))
+    
+    Master 지시 생성과 대사 생성을 구조화 출력 한 번으로 처리해
+    턴당 순차 LLM 호출을 2회에서 1회로 줄입니다.
+    구조화 출력이 실패하면 지시 초안으로 일반 대사 생성을 한 번 더 시도합니다.
+    """
+    scenario_topic = state.get("scenario_topic", "일반 보이스피싱")
+    turn_count = state.get("turn_count", 0)
+    messages = _incoming_messages(state)
+    
+    short_term_messages, new_summary, pending_summary_id = update_memory(
+        messages=messages,
+        turn_count=turn_count,
+        existing_summary=state.get("long_term_summary", ""),
+        pending_summary_id=state.get("pending_summary_id", ""),
+    )
+    news_update = _refresh_news_context(state, messages, scenario_topic, turn_count)
+    llm_messages = _build_llm_messages(state, short_term_messages, new_summary, news_update)
+    
+    llm = get_roleplay_llm()
+    try:
+        output = llm.with_structured_output(FusedTurnOutput).invoke(_fused_messages(llm_messages))
+        if output is not None and output.line.strip():
+            return _fused_result(state, output, new_summary, news_update, pending_summary_id)
+    except Exception:
+        pass
+    response = llm.invoke(llm_messages)
+    return _roleplay_result(state, response.content, new_summary, news_update, pending_summary_id)
+
+
+async def afused_roleplay_node(state: VoiceGuardianState) -> dict:
+    """fused_roleplay_node의 비동기 버전"""
+    scenario_topic = state.get("scenario_topic", "일반 보이스피싱")
+    turn_count = state.get("turn_count", 0)
+    messages = _incoming_messages(state)
+    
+    short_term_messages, new_summary, pending_summary_id = await aupdate_memory(
+        messages=messages,
+        turn_count=turn_count,
+        existing_summary=state.get("long_term_summary", ""),
+        pending_summary_id=state.get("pending_summary_id", ""),
+    )
+    news_update = await asyncio.to_thread(_refresh_news_context, state, messages, scenario_topic, turn_count)
+    llm_messages = _build_llm_messages(state, short_term_messages, new_summary, news_update)
+    
+    llm = get_roleplay_llm()
+    try:
+        output = await llm.with_structured_output(FusedTurnOutput).ainvoke(_fused_messages(llm_messages))
+        if output is not None and output.line.strip():
+            return _fused_result(state, output, new_summary, news_update, pending_summary_id)
+    except Exception:
+        pass
+    response = await llm.ainvoke(llm_messages)
+    return _roleplay_result(state, response.content, new_summary, news_update, pending_summary_id)
+
+
+async def aroleplay_node(state: VoiceGuardianState) -> dict:
+    """
+    roleplay_node의 비동기 버전
+    
+    요약·대사 생성은 ainvoke로, 뉴스 검색(디스크 I/O)은 짧게 스레드에서 실행해 이벤트 루프를 막지 않습니다.
+    """
+    scenario_topic = state.get("scenario_topic", "일반 보이스피싱")
+    turn_count = state.get("turn_count", 0)
+    messages = _incoming_messages(state)
+    
+    short_term_messages, new_summary, pending_summary_id = await aupdate_memory(
+        messages=messages,
+        turn_count=turn_count,
+        existing_summary=state.get("long_term_summary", ""),
+        pending_summary_id=state.get("pending_summary_id", ""),
+    )
+    news_update = await asyncio.to_thread(_refresh_news_context, state, messages, scenario_topic, turn_count)
+    
+    llm = get_roleplay_llm()
+    response = await llm.ainvoke(_build_llm_messages(state, short_term_messages, new_summary, news_update))
+    return _roleplay_result(state, response.content, new_summary, news_update, pending_summary_id)
@@ -0,0 +1,214 @@
+# 추측 실행(speculative) 평가 + 롤플레이
+# 대부분의 턴은 안전 판정이므로, Evaluator가 도는 동안 다음 사기범 대사를 미리 생성해 두고
+# - 평가 결과가 roleplay면 미리 만든 대사를 그대로 확정
+# - danger면 대사를 버리고 guardian으로 라우팅
+#
+# 순차 실행(평가 → 대사) 대비 턴 지연이 평가 시간만큼 줄어드는 대신,
+# danger 턴에서는 대사 생성 호출(과 그 앞의 계속 지시 생성)이 낭비됨 → SpeculationStats로 득실을 집계
+#
+# 스트리밍: 미리 만드는 대사의 토큰은 판정 전까지 사용자에게 보이면 안 되므로
+# 노드가 "custom" 스트림으로 SPECULATION_EVENT 상태(pending → committed / discarded)를 알리고,
+# TurnStream은 pending 동안 roleplay 토큰을 보류했다가 committed면 내보내고 discarded면 버림
+#
+# 메모리: 추측 대사 생성 중에는 장기 요약 작업 회수·제출을 미루고(deferred_summary_jobs),
+# 대사를 확정한 뒤에만 반영 → danger로 버린 턴이 요약 작업 ID를 잃어 고아 작업을 남기지 않음
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Literal
+
+from langchain_core.messages import HumanMessage
+from langgraph.config import get_stream_writer
+
+from ..graph.state import VoiceGuardianState
+from ..utils import memory
+from .evaluator import evaluate_node, aevaluate_node, route_from_evaluator
+
+
+# 동기 경로에서 대사 생성을 돌릴 스레드 풀 (LLM 호출 대기 위주라 소수로 충분)
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="speculative-roleplay")
+
+# "custom" 스트림 이벤트 키 (값: pending / committed / discarded)
+SPECULATION_EVENT = "speculation"
+
+
+@dataclass
+class SpeculationStats:
+    """추측 실행 카운터 스냅샷"""
+    speculated: int = 0            # 평가와 대사 생성을 병렬로 시작한 턴 수
+    committed: int = 0             # 안전 판정으로 미리 만든 대사를 확정한 턴 수
+    discarded: int = 0             # danger 판정으로 대사를 버린 턴 수 (= 낭비된 대사 생성 호출)
+    wasted_seconds: float = 0.0    # 버린 대사 생성에 쓴 시간 합 (async 경로는 취소 시점까지)
+    saved_seconds: float = 0.0     # 확정 턴에서 병렬 실행으로 아낀 시간 합 (min(평가, 대사 생성))
+
+    @property
+    def waste_rate(self) -> float:
+        return self.discarded / self.speculated if self.speculated else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "waste_rate": self.waste_rate}
+
+
+_stats = SpeculationStats()
+_stats_lock = threading.Lock()
+
+
+def get_speculation_stats() -> SpeculationStats:
+    """프로세스 공용 추측 실행 카운터"""
+    with _stats_lock:
+        return SpeculationStats(**asdict(_stats))
+
+
+def _record(committed: bool, eval_seconds: float, roleplay_seconds: float) -> None:
+    with _stats_lock:
+        _stats.speculated += 1
+        if committed:
+            _stats.committed += 1
+            _stats.saved_seconds += min(eval_seconds, roleplay_seconds)
+        else:
+            _stats.discarded += 1
+            _stats.wasted_seconds += roleplay_seconds
+
+
+def _notify(status: str) -> None:
+    """추측 대사 상태를 custom 스트림으로 알림 (그래프 밖에서 직접 호출하면 무시)"""
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return
+    writer({SPECULATION_EVENT: status})
+
+
+def _commit_memory(state: VoiceGuardianState, update: dict) -> dict:
+    """
+    확정한 추측 대사에 미뤄 둔 요약 작업 회수·제출 반영
+
+    동기 요약 모드는 대사 생성 중 요약을 이미 마쳤고 남는 작업이 없으므로 그대로 둡니다.
+    """
+    if not memory.BACKGROUND_SUMMARY:
+        return update
+    messages = list(state.get("messages", []))
+    if state.get("user_input"):
+        messages.append(HumanMessage(content=state["user_input"]))
+    _, summary, pending_summary_id = memory.update_memory(
+        messages=messages,
+        turn_count=state.get("turn_count", 0),
+        existing_summary=state.get("long_term_summary", ""),
+        pending_summary_id=state.get("pending_summary_id", ""),
+    )
+    return {**update, "long_term_summary": summary, "pending_summary_id": pending_summary_id}
+
+
+def _should_speculate(state: VoiceGuardianState) -> bool:
+    """
+    이번 턴에 평가할 사용자 입력이 있는지
+
+    (추측 실행 그래프에서는 Master의 evaluate 라우팅이 이 노드로 오므로 평가 노드를 따로 거치지 않음)
+    """
+    return bool(state.get("user_input"))
+
+
+def make_speculative_roleplay_node(
+    roleplay: Callable[[VoiceGuardianState], dict],
+    prepare: Callable[[VoiceGuardianState], dict] | None = None,
+) -> Callable[[VoiceGuardianState], dict]:
+    """
+    roleplay 노드를 평가와 병렬 실행하는 노드로 감싸기 (동기 그래프용)
+
+    대사 생성은 스레드 풀에서, 평가는 현재 스레드에서 실행합니다.
+    danger면 대사 생성 완료를 기다리지 않고 바로 반환합니다 (낭비 시간은 완료 시 집계).
+    판정 전 대사 토큰은 TurnStream이 보류하고, danger면 보류분과 이후 도착하는 토큰을 버립니다.
+    사용자 입력 기록·소비는 danger 경로에서는 guardian 노드가 맡습니다.
+    장기 요약 작업은 대사를 확정할 때만 회수·제출합니다 (_commit_memory).
+
+    Args:
+        roleplay: roleplay_node 또는 fused_roleplay_node
+        prepare: 대사 생성 전에 추측 경로에서 실행할 계속 지시 노드 (continue_node 등)
+    """
+    def speculate(state: VoiceGuardianState) -> dict:
+        with memory.deferred_summary_jobs():
+            if prepare is None:
+                return roleplay(state)
+            instruction = prepare(state)
+            return {**instruction, **roleplay({**state, **instruction})}
+
+    def speculative_roleplay_node(state: VoiceGuardianState) -> dict:
+        if not _should_speculate(state):
+            return roleplay(state)
+
+        start = time.perf_counter()
+        _notify("pending")
+        # 컨텍스트 복사: 그래프 config(콜백, 스트리밍 핸들러)가 스레드에서도 보이도록
+        future = _executor.submit(contextvars.copy_context().run, speculate, state)
+        evaluation = evaluate_node(state)
+        eval_seconds = time.perf_counter() - start
+
+        if route_from_evaluator({**state, **evaluation}) == "guardian":
+            # 아직 시작 전이면 취소, 이미 실행 중인 호출은 끝까지 돌지만 결과·토큰은 버려짐
+            _notify("discarded")
+            future.cancel()
+            future.add_done_callback(lambda _: _record(False, eval_seconds, time.perf_counter() - start))
+            return evaluation
+
+        _notify("committed")
+        update = _commit_memory(state, future.result())
+        _record(True, eval_seconds, time.perf_counter() - start)
+        return {**update, **evaluation}
+
+    return speculative_roleplay_node
+
+
+def make_aspeculative_roleplay_node(
+    aroleplay: Callable[[VoiceGuardianState], Awaitable[dict]],
+    aprepare: Callable[[VoiceGuardianState], Awaitable[dict]] | None = None,
+) -> Callable[[VoiceGuardianState], Awaitable[dict]]:
+    """
+    make_speculative_roleplay_node의 비동기 버전
+
+    대사 생성을 task로 띄우고 평가를 await 합니다. danger면 task를 취소해 남은 생성 호출을 중단합니다.
+    """
+    async def speculate(state: VoiceGuardianState) -> dict:
+        with memory.deferred_summary_jobs():
+            if aprepare is None:
+                return await aroleplay(state)
+            instruction = await aprepare(state)
+            return {**instruction, **await aroleplay({**state, **instruction})}
+
+    async def aspeculative_roleplay_node(state: VoiceGuardianState) -> dict:
+        if not _should_speculate(state):
+            return await aroleplay(state)
+
+        start = time.perf_counter()
+        _notify("pending")
+        task = asyncio.create_task(speculate(state))
+        evaluation = await aevaluate_node(state)
+        eval_seconds = time.perf_counter() - start
+
+        if route_from_evaluator({**state, **evaluation}) == "guardian":
+            _notify("discarded")
+            task.cancel()
+            _record(False, eval_seconds, time.perf_counter() - start)
+            return evaluation
+
+        _notify("committed")
+        update = _commit_memory(state, await task)
+        _record(True, eval_seconds, time.perf_counter() - start)
+        return {**update, **evaluation}
+
+    return aspeculative_roleplay_node
+
+
+def route_after_speculation(state: VoiceGuardianState) -> Literal["guardian", "__end__"]:
+    """
+    추측 실행 노드 다음 라우팅 (Edge)
+
+    대사를 확정했으면 사용자 입력 대기(END), 버렸으면 guardian.
+    (대사를 확정한 턴은 roleplay가 user_input을 소비했으므로, 입력이 남아 있으면 버린 턴)
+    """
+    if state.get("user_input") and route_from_evaluator(state) == "guardian":
+        return "guardian"
+    return "__end__"
@@ -0,0 +1,262 @@
+# Evaluator 정확도·비용 벤치마크
+# 라벨이 붙은 사용자 응답 코퍼스(evaluator_corpus.jsonl)로 evaluate_message를 돌려
+# 위험 판정 precision/recall, detected_info 항목별 precision/recall, 단계별 처리량, LLM 단계로 넘긴 비율을 측정
+# Evaluator 속도 개선(패턴 규칙·정규화·캐시 변경)을 켜기 전 정확도 회귀 확인용
+#
+# 사용법:
+#   python -m llm.evaluator_benchmark                                  # 전체 (2단계는 실제 API 호출)
+#   python -m llm.evaluator_benchmark --no-llm                         # 1단계만 (ambiguous는 보수적 규칙으로 판정)
+#   python -m llm.evaluator_benchmark --no-response-cache --json eval_bench.json
+#   python -m llm.evaluator_benchmark --min-precision 0.9 --min-recall 0.9   # 기준 미달 시 종료 코드 1
+#
+# 코퍼스 한 줄: {"id", "group", "scammer_line", "user_message", "is_danger", "categories": [...]}
+#   group: pii / pii_spoken / pii_obfuscated / pii_text / consent / refusal / neutral / hard_negative
+#   categories: pii_detector.DETECTED_INFO_CATEGORIES의 분류명 (정답 detected_info 분류)
+
+import argparse
+import json
+import sys
+import time
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Any
+
+from dotenv import load_dotenv
+
+from .graph.state import EvaluationResult
+from .agents.evaluator import evaluate_message
+from .tools.pii_detector import PIIDetection, categorize_detected_info, detect_pii
+from .utils import llm as llm_utils
+
+
+CORPUS_PATH = Path(__file__).with_name("evaluator_corpus.jsonl")
+
+@dataclass
+class Score:
+    """이진 분류 집계"""
+    tp: int = 0
+    fp: int = 0
+    fn: int = 0
+    tn: int = 0
+
+    @property
+    def precision(self) -> float:
+        return self.tp / (self.tp + self.fp) if self.tp + self.fp else 0.0
+
+    @property
+    def recall(self) -> float:
+        return self.tp / (self.tp + self.fn) if self.tp + self.fn else 0.0
+
+    @property
+    def f1(self) -> float:
+        p, r = self.precision, self.recall
+        return 2 * p * r / (p + r) if p + r else 0.0
+
+    def add(self, expected: bool, predicted: bool) -> None:
+        if expected and predicted:
+            self.tp += 1
+        elif predicted:
+            self.fp += 1
+        elif expected:
+            self.fn += 1
+        else:
+            self.tn += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "precision": self.precision, "recall": self.recall, "f1": self.f1}
+
+
+@dataclass
+class EvaluatorBenchmarkResult:
+    """벤치마크 결과"""
+    messages: int
+    danger: Score
+    categories: dict[str, Score]
+    group_accuracy: dict[str, float]
+    tier1_settled: int
+    escalated: int
+    tier1_messages_per_second: float     # 1단계(정규화 + 패턴) 단독 처리량
+    tier2_mean_ms: float                 # LLM 문맥 검사 1건 평균 (응답 캐시 적중 포함)
+    tier2_messages_per_second: float     # LLM 단계 순차 처리량
+    end_to_end_messages_per_second: float
+    used_llm: bool
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalated / self.messages if self.messages else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["danger"] = self.danger.as_dict()
+        data["categories"] = {k: v.as_dict() for k, v in self.categories.items()}
+        data["escalation_rate"] = self.escalation_rate
+        return data
+
+
+def load_corpus(path: str | Path = CORPUS_PATH) -> list[dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _offline_result(detection: PIIDetection) -> EvaluationResult:
+    """--no-llm에서 ambiguous 판정 (evaluator의 LLM 실패 시 규칙과 동일: 숫자 정보가 있으면 위험)"""
+    return {
+        "is_danger": bool(detection.findings),
+        "reason": "LLM 단계 생략 - 1차 패턴 검사 결과로 판정",
+        "detected_info": detection.labels,
+    }
+
+
+def measure_tier1(texts: list[str], repeat: int) -> float:
+    """1단계 처리량 (msg/s, repeat회 반복 측정)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            detect_pii(text)
+    elapsed = time.perf_counter() - start
+    return len(texts) * repeat / elapsed if elapsed else 0.0
+
+
+def run_benchmark(
+    corpus: list[dict[str, Any]],
+    use_llm: bool = True,
+    repeat: int = 200,
+) -> EvaluatorBenchmarkResult:
+    """
+    코퍼스 전체 평가 + 지표 집계
+
+    Args:
+        corpus: load_corpus 결과
+        use_llm: False면 ambiguous 메시지를 LLM 없이 _offline_result로 판정
+        repeat: 1단계 처리량 측정 반복 횟수
+    """
+    danger = Score()
+    categories: dict[str, Score] = defaultdict(Score)
+    group_hits: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    errors = []
+    tier1_settled = escalated = 0
+    tier2_seconds = 0.0
+
+    start = time.perf_counter()
+    for item in corpus:
+        detection = detect_pii(item["user_message"])
+        if detection.verdict != "ambiguous":
+            tier1_settled += 1
+            result = evaluate_message(item["user_message"], item["scammer_line"], detection)
+        else:
+            escalated += 1
+            if use_llm:
+                call_start = time.perf_counter()
+                result = evaluate_message(item["user_message"], item["scammer_line"], detection)
+                tier2_seconds += time.perf_counter() - call_start
+            else:
+                result = _offline_result(detection)
+
+        danger.add(item["is_danger"], result["is_danger"])
+        predicted = {categorize_detected_info(label) for label in result["detected_info"]} if result["is_danger"] else set()
+        expected = set(item["categories"])
+        for category in expected | predicted:
+            categories[category].add(category in expected, category in predicted)
+
+        hits = group_hits[item["group"]]
+        hits[0] += result["is_danger"] == item["is_danger"]
+        hits[1] += 1
+        if result["is_danger"] != item["is_danger"] or expected - predicted:
+            errors.append({
+                "id": item["id"],
+                "user_message": item["user_message"],
+                "expected": {"is_danger": item["is_danger"], "categories": sorted(expected)},
+                "predicted": {"is_danger": result["is_danger"], "categories": sorted(predicted)},
+                "tier": "pattern" if detection.verdict != "ambiguous" else "llm" if use_llm else "offline",
+                "reason": result["reason"],
+            })
+    elapsed = time.perf_counter() - start
+
+    return EvaluatorBenchmarkResult(
+        messages=len(corpus),
+        danger=danger,
+        categories=dict(sorted(categories.items())),
+        group_accuracy={g: hit / total for g, (hit, total) in sorted(group_hits.items())},
+        tier1_settled=tier1_settled,
+        escalated=escalated,
+        tier1_messages_per_second=measure_tier1([item["user_message"] for item in corpus], repeat),
+        tier2_mean_ms=tier2_seconds / escalated * 1000 if use_llm and escalated else 0.0,
+        tier2_messages_per_second=escalated / tier2_seconds if tier2_seconds else 0.0,
+        end_to_end_messages_per_second=len(corpus) / elapsed if elapsed else 0.0,
+        used_llm=use_llm,
+        errors=errors,
+    )
+
+
+def _ljust(text: str, width: int) -> str:
+    """한글(전각) 폭을 2로 세어 왼쪽 정렬"""
+    shown = sum(2 if unicodedata.east_asian_width(ch) in "WF" else 1 for ch in text)
+    return text + " " * max(0, width - shown)
+
+
+def print_report(result: EvaluatorBenchmarkResult, show_errors: bool = False) -> None:
+    d = result.danger
+    print(f"\n위험 판정 (메시지 {result.messages}건{'' if result.used_llm else ', LLM 단계 생략'})")
+    print(f"  precision {d.precision:.3f}  recall {d.recall:.3f}  f1 {d.f1:.3f}  (tp {d.tp} fp {d.fp} fn {d.fn} tn {d.tn})")
+
+    print(f"\n{'category':<18} {'precision':>9} {'recall':>7} {'tp':>4} {'fp':>4} {'fn':>4}")
+    for category, s in result.categories.items():
+        print(f"{_ljust(category, 18)} {s.precision:>9.3f} {s.recall:>7.3f} {s.tp:>4} {s.fp:>4} {s.fn:>4}")
+
+    print("\ngroup 정확도: " + ", ".join(f"{g} {acc:.2f}" for g, acc in result.group_accuracy.items()))
+
+    print(f"\n1단계 확정 {result.tier1_settled} · LLM 단계 {result.escalated} (escalation {result.escalation_rate:.1%})")
+    print(f"  1단계     {result.tier1_messages_per_second:>12,.0f} msg/s")
+    if result.used_llm and result.escalated:
+        print(f"  LLM 단계  {result.tier2_messages_per_second:>12,.2f} msg/s (평균 {result.tier2_mean_ms:.0f} ms)")
+    print(f"  전체      {result.end_to_end_messages_per_second:>12,.2f} msg/s")
+
+    if show_errors and result.errors:
+        print("\n오판정:")
+        for e in result.errors:
+            print(f"  [{e['id']}] {e['user_message']!r} ({e['tier']})")
+            print(f"      정답 {e['expected']} / 판정 {e['predicted']} - {e['reason']}")
+
+
+def main():
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="Evaluator 라벨 코퍼스 벤치마크 (정확도 + 단계별 처리량)")
+    parser.add_argument("--corpus", default=str(CORPUS_PATH), help="라벨 코퍼스 JSONL 경로")
+    parser.add_argument("--no-llm", action="store_true", help="LLM 단계 생략 (ambiguous는 숫자 정보가 있으면 위험)")
+    parser.add_argument("--no-response-cache", action="store_true", help="평가 LLM 응답 캐시를 끄고 실제 지연 측정")
+    parser.add_argument("--repeat", type=int, default=200, help="1단계 처리량 측정 반복 횟수")
+    parser.add_argument("--show-errors", action="store_true", help="오판정 메시지 출력")
+    parser.add_argument("--min-precision", type=float, default=None, help="위험 판정 precision 하한 (미달 시 종료 코드 1)")
+    parser.add_argument("--min-recall", type=float, default=None, help="위험 판정 recall 하한 (미달 시 종료 코드 1)")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    load_dotenv()
+    if args.no_response_cache:
+        llm_utils.LLM_CACHE_ROLES.discard("evaluation")
+
+    result = run_benchmark(load_corpus(args.corpus), use_llm=not args.no_llm, repeat=args.repeat)
+    print_report(result, show_errors=args.show_errors)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result.as_dict(), f, ensure_ascii=False, indent=2)
+        print(f"\n💾 {args.json}")
+
+    failed = [
+        f"{name} {value:.3f} < {bound}"
+        for name, value, bound in (
+            ("precision", result.danger.precision, args.min_precision),
+            ("recall", result.danger.recall, args.min_recall),
+        )
+        if bound is not None and value < bound
+    ]
+    if failed:
+        print("\n❌ 기준 미달: " + ", ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 # VoiceGuardian LangGraph 워크플로우 모듈
 from .state import VoiceGuardianState
-from .workflow import create_workflow, app
+from .workflow import create_workflow, app, async_app, arun_single_turn
 
-__all__ = ["VoiceGuardianState", "create_workflow", "app"]
+__all__ = ["VoiceGuardianState", "create_workflow", "app", "async_app", "arun_single_turn"]
@@ -26,7 +26,13 @@ class VoiceGuardianState(TypedDict):
         user_input: 사용자의 최신 입력
         master_instruction: Master Agent가 하위 에이전트에게 내리는 지시
         long_term_summary: 장기 메모리 (10턴 이상 대화 요약)
+        pending_summary_id: 백그라운드에서 생성 중인 장기 요약 작업 ID (끝나면 이후 턴에 long_term_summary로 반영)
         needs_topic_selection: 시나리오 주제 선택이 필요한지 여부
+        news_context: 현재 시나리오에 고정된 RAG 뉴스 컨텍스트 (포맷 완료 텍스트, 압축 전)
+        news_results: news_context의 원본 검색 결과 (턴마다 관련 문장만 추출해 프롬프트에 사용)
+        news_context_query: news_context를 검색할 때 사용한 쿼리
+        news_context_topic: news_context를 검색할 당시의 scenario_topic
+        news_context_turn: news_context를 검색한 턴
     """
     messages: Annotated[list[BaseMessage], add_messages]
     current_phase: Literal["init", "topic_selection", "roleplay", "evaluate", "guardian", "end"]
@@ -36,4 +42,10 @@ class VoiceGuardianState(TypedDict):
     user_input: str
     master_instruction: str
     long_term_summary: str
+    pending_summary_id: str
     needs_topic_selection: bool
+    news_context: str
+    news_results: list[dict]
+    news_context_query: str
+    news_context_topic: str
+    news_context_turn: int
@@ -0,0 +1,151 @@
+# 턴 지연 벤치마크: 기존 2단계(Master 지시 → Roleplay 대사) vs 통합 턴 모드(fused_roleplay)
+# 같은 시나리오·같은 사용자 발화 스크립트를 두 그래프에 흘려 턴별 지연과 LLM 호출 수를 비교
+# (실제 Anthropic API를 호출하므로 ANTHROPIC_API_KEY 필요)
+#
+# 사용법:
+#   python -m llm.graph.turn_benchmark                       # 기본 스크립트 1회
+#   python -m llm.graph.turn_benchmark --runs 3 --topic "카드사 사칭"
+#   python -m llm.graph.turn_benchmark --fast-path --json turn_bench.json
+#
+# 기본값은 Master 템플릿 fast path를 끈 상태로 측정합니다 (매 턴 지시 LLM을 호출하던 원래 경로와 비교).
+
+import argparse
+import json
+import statistics
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from ..agents import master
+from ..utils.semantic_cache import get_semantic_cache
+from .workflow import compile_workflow, get_initial_state
+
+
+# 기본 사용자 발화 스크립트 (첫 턴은 시나리오 시작이라 발화 없음)
+DEFAULT_SCRIPT = (
+    "여보세요? 누구시라고요?",
+    "제 계좌에 무슨 문제가 있다는 거죠?",
+    "지금 밖이라서 나중에 다시 전화 주시면 안 될까요?",
+    "그럼 제가 뭘 확인하면 되는데요?",
+)
+
+MODES = ("two_hop", "fused")
+
+
+class _LLMCallCounter(BaseCallbackHandler):
+    """그래프 실행 중 채팅 모델 호출 수 집계"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def on_chat_model_start(self, serialized: dict[str, Any], messages: list, **kwargs: Any) -> None:
+        self.calls += 1
+
+
+@dataclass
+class TurnBenchmarkResult:
+    """모드별 측정 결과"""
+    mode: str
+    turns: int
+    mean_ms: float
+    p50_ms: float
+    max_ms: float
+    llm_calls_per_turn: float
+    turn_ms: list[float] = field(default_factory=list)
+
+
+def run_session(app, topic: str, script: tuple[str, ...]) -> tuple[list[float], int]:
+    """시나리오 시작 + 스크립트 발화로 한 세션 실행 → (턴별 지연 ms, LLM 호출 수)"""
+    # 같은 스크립트를 반복하므로 의미 캐시가 남아 있으면 두 번째 세션부터 지시 호출이 생략됨
+    for role in ("master", "topic"):
+        get_semantic_cache(role).clear()
+    counter = _LLMCallCounter()
+    config = {"callbacks": [counter]}
+    state = get_initial_state(scenario_topic=topic)
+    latencies = []
+    for user_input in ("", *script):
+        if user_input:
+            state = {**state, "user_input": user_input}
+        start = time.perf_counter()
+        state = app.invoke(state, config=config)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, counter.calls
+
+
+def run_benchmark(
+    topic: str = "검찰 사칭",
+    script: tuple[str, ...] = DEFAULT_SCRIPT,
+    runs: int = 1,
+    fast_path: bool = False,
+) -> list[TurnBenchmarkResult]:
+    """
+    두 모드를 번갈아 runs회 실행해 턴 지연 비교
+
+    Args:
+        topic: 시나리오 주제
+        script: 사용자 발화 목록
+        runs: 모드별 세션 반복 횟수 (API 지연 변동을 줄이려면 3 이상 권장)
+        fast_path: Master 템플릿 fast path 사용 여부
+    """
+    apps = {mode: compile_workflow(fused_roleplay=(mode == "fused")) for mode in MODES}
+    latencies: dict[str, list[float]] = {mode: [] for mode in MODES}
+    calls: dict[str, int] = {mode: 0 for mode in MODES}
+
+    saved_fast_path = master.MASTER_FAST_PATH
+    master.MASTER_FAST_PATH = fast_path
+    try:
+        for run in range(runs):
+            # 실행 순서에 따른 편향(캐시·연결 재사용)을 줄이려고 매 회 순서를 바꿈
+            order = MODES if run % 2 == 0 else MODES[::-1]
+            for mode in order:
+                turn_ms, n_calls = run_session(apps[mode], topic, script)
+                latencies[mode].extend(turn_ms)
+                calls[mode] += n_calls
+                print(f"  {mode:<8} run {run + 1}: " + " ".join(f"{ms:.0f}" for ms in turn_ms) + " ms")
+    finally:
+        master.MASTER_FAST_PATH = saved_fast_path
+
+    results = []
+    for mode in MODES:
+        values = latencies[mode]
+        results.append(TurnBenchmarkResult(
+            mode=mode,
+            turns=len(values),
+            mean_ms=statistics.fmean(values),
+            p50_ms=statistics.median(values),
+            max_ms=max(values),
+            llm_calls_per_turn=calls[mode] / len(values),
+            turn_ms=values,
+        ))
+    return results
+
+
+def print_report(results: list[TurnBenchmarkResult]) -> None:
+    print(f"\n{'mode':<8} {'turns':>6} {'mean ms':>9} {'p50 ms':>9} {'max ms':>9} {'LLM/turn':>9}")
+    for r in results:
+        print(f"{r.mode:<8} {r.turns:>6} {r.mean_ms:>9.0f} {r.p50_ms:>9.0f} {r.max_ms:>9.0f} {r.llm_calls_per_turn:>9.2f}")
+    if len(results) == 2 and results[0].mean_ms:
+        print(f"\nfused / two_hop 평균 지연: {results[1].mean_ms / results[0].mean_ms:.2f}")
+
+
+def main():
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="2단계 vs 통합 턴 모드 턴 지연 비교 (실제 API 호출)")
+    parser.add_argument("--topic", default="검찰 사칭", help="시나리오 주제")
+    parser.add_argument("--runs", type=int, default=1, help="모드별 세션 반복 횟수")
+    parser.add_argument("--fast-path", action="store_true", help="Master 템플릿 fast path를 켠 상태로 측정")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    results = run_benchmark(topic=args.topic, runs=args.runs, fast_path=args.fast_path)
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, ensure_ascii=False, indent=2)
+        print(f"\n💾 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
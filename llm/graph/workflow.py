@@ -1,17 +1,48 @@
 # VoiceGuardian LangGraph 워크플로우
 # 멀티 에이전트 시스템의 StateGraph 정의
 
+import os
+from typing import Iterator
+
+from langchain_core.messages import AIMessageChunk
 from langgraph.graph import StateGraph, END
 
 from .state import VoiceGuardianState
-from ..agents.master import master_node, route_from_master
-from ..agents.roleplay_agent import roleplay_node
-from ..agents.evaluator import evaluate_node, route_from_evaluator
-from ..agents.guardian import guardian_node
+from ..agents.master import (
+    master_node,
+    amaster_node,
+    fused_master_node,
+    afused_master_node,
+    continue_node,
+    acontinue_node,
+    fused_continue_node,
+    afused_continue_node,
+    route_from_master,
+)
+from ..agents.roleplay_agent import roleplay_node, aroleplay_node, fused_roleplay_node, afused_roleplay_node
+from ..agents.evaluator import evaluate_node, aevaluate_node, route_from_evaluator
+from ..agents.guardian import guardian_node, aguardian_node
 from ..agents.topic_selection import topic_selection_node
+from ..agents.speculative import (
+    SPECULATION_EVENT,
+    make_speculative_roleplay_node,
+    make_aspeculative_roleplay_node,
+    route_after_speculation,
+)
+
+
+# 기본 앱을 통합 턴 모드로 구성할지 (VOICE_GUARDIAN_FUSED_ROLEPLAY=1)
+FUSED_ROLEPLAY = os.environ.get("VOICE_GUARDIAN_FUSED_ROLEPLAY", "0") == "1"
+
+# 기본 앱을 추측 실행 모드로 구성할지 (VOICE_GUARDIAN_SPECULATIVE=1)
+SPECULATIVE = os.environ.get("VOICE_GUARDIAN_SPECULATIVE", "0") == "1"
 
 
-def create_workflow() -> StateGraph:
+def create_workflow(
+    async_nodes: bool = False,
+    fused_roleplay: bool = False,
+    speculative: bool = False,
+) -> StateGraph:
     """
     VoiceGuardian 워크플로우를 생성합니다.
     
@@ -25,17 +56,34 @@ def create_workflow() -> StateGraph:
                    │                                    
                    │ (topic 있음)                       
                    v                                    
-              [roleplay] ──> [evaluate] ──┬──> [roleplay] (safe)
-                   ^                      │
-                   │                      v
-                   └──── [guardian] <─────┘ (danger)
+              [roleplay] ──> (user) ──> [master] ──> [evaluate] ──┬──> [continue] ──> [roleplay] (safe)
+                   ^                                              │
+                   │                                              v
+                   └──── (user) <── [guardian] <──────────────────┘ (danger)
     ```
     
+    사용자 입력이 있는 턴은 master → evaluate → (continue → roleplay | guardian) 순서로 실행됩니다.
+    (roleplay 대사 직후 current_phase가 evaluate이므로 다음 입력은 반드시 평가를 거침)
+    
     1. master: 현재 상태 분석 및 하위 에이전트 지시 생성
     2. topic_selection: 시나리오 주제 선택 (선택적)
     3. roleplay: 보이스피싱범 역할 대사 생성
     4. evaluate: 사용자 응답 평가 (개인정보 노출 여부)
-    5. guardian: 위험 상황 시 교육 메시지 제공
+    5. continue: 안전 판정 뒤 롤플레이 계속 지시 생성 (danger 턴에는 실행되지 않음)
+    6. guardian: 위험 상황 시 교육 메시지 제공
+    
+    통합 턴 모드(fused_roleplay=True)에서는 그래프 모양은 같고 노드 구현만 바뀝니다.
+    master는 롤플레이 지시를 LLM 없이 초안으로만 넘기고, roleplay가 구조화 출력 한 번으로
+    지시(master_instruction)와 대사(AIMessage)를 함께 생성합니다. (턴당 순차 LLM 호출 2회 → 1회)
+    
+    추측 실행 모드(speculative=True)에서는 master의 evaluate 라우팅이 roleplay 노드로 가고,
+    roleplay 노드가 평가와 (계속 지시 + 대사 생성)을 병렬로 실행합니다. 안전 판정이면 대사를 확정하고(END),
+    danger면 대사를 버리고 guardian으로 갑니다. (낭비/절약 시간은 get_speculation_stats)
+    
+    Args:
+        async_nodes: True면 ainvoke를 쓰는 비동기 노드 사용 (app.ainvoke 전용)
+        fused_roleplay: True면 Master 지시 + 롤플레이 대사 통합 호출 모드
+        speculative: True면 평가 + 롤플레이 추측 병렬 실행 모드
     
     Returns:
         컴파일되지 않은 StateGraph 인스턴스
@@ -43,24 +91,36 @@ def create_workflow() -> StateGraph:
     # StateGraph 생성
     workflow = StateGraph(VoiceGuardianState)
     
-    # 노드 추가
-    workflow.add_node("master", master_node)
+    # 노드 추가 (topic_selection은 LLM 호출이 없어 공용)
+    if fused_roleplay:
+        master = afused_master_node if async_nodes else fused_master_node
+        continue_ = afused_continue_node if async_nodes else fused_continue_node
+        roleplay = afused_roleplay_node if async_nodes else fused_roleplay_node
+    else:
+        master = amaster_node if async_nodes else master_node
+        continue_ = acontinue_node if async_nodes else continue_node
+        roleplay = aroleplay_node if async_nodes else roleplay_node
+    if speculative:
+        wrap = make_aspeculative_roleplay_node if async_nodes else make_speculative_roleplay_node
+        roleplay = wrap(roleplay, continue_)
+    workflow.add_node("master", master)
     workflow.add_node("topic_selection", topic_selection_node)
-    workflow.add_node("roleplay", roleplay_node)
-    workflow.add_node("evaluate", evaluate_node)
-    workflow.add_node("guardian", guardian_node)
+    workflow.add_node("roleplay", roleplay)
+    workflow.add_node("evaluate", aevaluate_node if async_nodes else evaluate_node)
+    workflow.add_node("continue", continue_)
+    workflow.add_node("guardian", aguardian_node if async_nodes else guardian_node)
     
     # 진입점 설정
     workflow.set_entry_point("master")
     
-    # Master에서 조건부 라우팅
+    # Master에서 조건부 라우팅 (추측 실행 모드에서는 평가를 roleplay 노드가 병렬로 수행)
     workflow.add_conditional_edges(
         "master",
         route_from_master,
         {
             "topic_selection": "topic_selection",
             "roleplay": "roleplay",
-            "evaluate": "evaluate",
+            "evaluate": "roleplay" if speculative else "evaluate",
             "guardian": "guardian",
             "__end__": END,
         }
@@ -69,18 +129,29 @@ def create_workflow() -> StateGraph:
     # Topic Selection → END (사용자 입력 대기)
     workflow.add_edge("topic_selection", END)
     
-    # Roleplay → END (사용자 입력 대기)
-    workflow.add_edge("roleplay", END)
+    # Roleplay → END (사용자 입력 대기), 추측 실행 모드에서 danger면 → guardian
+    if speculative:
+        workflow.add_conditional_edges(
+            "roleplay",
+            route_after_speculation,
+            {
+                "guardian": "guardian",
+                "__end__": END,
+            }
+        )
+    else:
+        workflow.add_edge("roleplay", END)
     
-    # Evaluate에서 조건부 라우팅 (safe/danger)
+    # Evaluate에서 조건부 라우팅 (safe → 계속 지시 후 roleplay / danger → guardian)
     workflow.add_conditional_edges(
         "evaluate",
         route_from_evaluator,
         {
-            "roleplay": "roleplay",
+            "roleplay": "continue",
             "guardian": "guardian",
         }
     )
+    workflow.add_edge("continue", "roleplay")
     
     # Guardian → END (사용자 입력 대기)
     workflow.add_edge("guardian", END)
@@ -88,19 +159,27 @@ def create_workflow() -> StateGraph:
     return workflow
 
 
-def compile_workflow():
+def compile_workflow(async_nodes: bool = False, fused_roleplay: bool = False, speculative: bool = False):
     """
     워크플로우를 컴파일하여 실행 가능한 앱을 반환합니다.
     
+    Args:
+        async_nodes: True면 비동기 노드로 구성 (ainvoke 전용)
+        fused_roleplay: True면 Master 지시 + 롤플레이 대사 통합 호출 모드
+        speculative: True면 평가 + 롤플레이 추측 병렬 실행 모드
+    
     Returns:
         컴파일된 LangGraph 앱
     """
-    workflow = create_workflow()
+    workflow = create_workflow(async_nodes=async_nodes, fused_roleplay=fused_roleplay, speculative=speculative)
     return workflow.compile()
 
 
 # 기본 컴파일된 앱 (import 시 바로 사용 가능)
-app = compile_workflow()
+app = compile_workflow(fused_roleplay=FUSED_ROLEPLAY, speculative=SPECULATIVE)
+
+# 비동기 앱: 하나의 이벤트 루프에서 여러 세션의 턴을 동시에 처리 (arun_single_turn)
+async_app = compile_workflow(async_nodes=True, fused_roleplay=FUSED_ROLEPLAY, speculative=SPECULATIVE)
 
 
 def get_initial_state(
@@ -126,7 +205,13 @@ def get_initial_state(
         "user_input": user_input,
         "master_instruction": "",
         "long_term_summary": "",
+        "pending_summary_id": "",
         "needs_topic_selection": not bool(scenario_topic),
+        "news_context": "",
+        "news_results": [],
+        "news_context_query": "",
+        "news_context_topic": "",
+        "news_context_turn": 0,
     }
 
 
@@ -151,3 +236,126 @@ def run_single_turn(
     
     result = app.invoke(state)
     return result
+
+
+# 사용자에게 보이는 메시지를 만드는 노드 (stream_single_turn에서 토큰/메시지를 내보낼 대상)
+# master는 내부 지시만 생성하므로 제외
+STREAM_NODES = ("roleplay", "guardian", "topic_selection")
+
+
+class TurnStream:
+    """
+    단일 턴 스트리밍 실행 결과
+    
+    반복하면 사용자에게 보일 대사 텍스트 조각을 생성 순서대로 내보내고,
+    반복이 끝나면 state에 최종 상태가 담깁니다. (st.write_stream에 그대로 전달 가능)
+    
+    - LLM이 토큰 스트리밍하면 AIMessageChunk 단위로 전달
+    - LLM 없이 만든 메시지(스켈레톤, 템플릿)나 캐시된 응답은 노드 출력 메시지를 한 번에 전달
+    - 추측 실행 모드의 roleplay 토큰은 평가 판정 전까지 보류하고, danger로 버려지면 내보내지 않음
+    - 한 턴에 여러 노드가 대사를 내면(예: topic_selection → roleplay) 노드가 바뀔 때 빈 줄로 구분
+    - 그래프가 도중에 예외로 끝나면 예외를 그대로 올리고 state는 None으로 남김
+      (중간 노드까지의 부분 상태를 확정하지 않도록, 호출 측은 이전 상태를 유지)
+    """
+    
+    def __init__(self, state: VoiceGuardianState):
+        self._input = state
+        self.state: VoiceGuardianState | None = None
+    
+    def __iter__(self) -> Iterator[str]:
+        emitted: set[str] = set()  # 이미 텍스트를 내보낸 노드 (청크 이후 오는 완성 메시지 중복 방지)
+        speculation = ""           # 추측 대사 상태 (pending / committed / discarded)
+        held: list[str] = []       # 판정 전 보류 중인 roleplay 토큰
+        last_node = None           # 마지막으로 텍스트를 내보낸 노드
+        latest = None              # 지금까지 받은 최신 상태 (그래프가 끝까지 실행된 뒤에만 state로 확정)
+        
+        def separated(node: str, texts: list[str]) -> Iterator[str]:
+            nonlocal last_node
+            if last_node is not None and last_node != node:
+                yield "\n\n"
+            last_node = node
+            yield from texts
+        
+        for mode, payload in app.stream(self._input, stream_mode=["messages", "values", "custom"]):
+            if mode == "values":
+                latest = payload
+                continue
+            if mode == "custom":
+                if isinstance(payload, dict) and SPECULATION_EVENT in payload:
+                    speculation = payload[SPECULATION_EVENT]
+                    if speculation == "committed" and held:
+                        yield from separated("roleplay", held)
+                    held = []
+                continue
+            message, metadata = payload
+            node = metadata.get("langgraph_node")
+            if node not in STREAM_NODES:
+                continue
+            if isinstance(message, AIMessageChunk):
+                # 구조화 출력(tool call) 청크는 텍스트가 없으므로 노드 출력 메시지를 기다림
+                text = message.text
+            elif message.type == "ai" and node not in emitted:
+                text = message.text
+            else:
+                text = ""
+            if not text:
+                continue
+            if node == "roleplay" and speculation in ("pending", "discarded"):
+                # 버린 대사는 노드가 끝난 뒤 도착하는 토큰까지 무시
+                if speculation == "pending":
+                    held.append(text)
+                    emitted.add(node)
+                continue
+            emitted.add(node)
+            yield from separated(node, [text])
+        self.state = latest
+
+
+def stream_single_turn(
+    state: VoiceGuardianState,
+    user_input: str = ""
+) -> TurnStream:
+    """
+    단일 턴을 실행하며 roleplay/guardian 대사를 토큰 단위로 스트리밍합니다.
+    
+    LangGraph의 "messages" 스트림 모드로 노드 내부 LLM 호출의 토큰을 받고,
+    "values" 모드로 최종 상태를 받습니다.
+    
+    사용 예 (Streamlit):
+        turn = stream_single_turn(state, user_input=prompt)
+        st.write_stream(turn)
+        st.session_state.llm_state = turn.state
+    
+    Args:
+        state: 현재 상태
+        user_input: 사용자 입력
+        
+    Returns:
+        TurnStream (반복 후 .state에 최종 상태)
+    """
+    if user_input:
+        state = {**state, "user_input": user_input}
+    return TurnStream(state)
+
+
+async def arun_single_turn(
+    state: VoiceGuardianState,
+    user_input: str = ""
+) -> VoiceGuardianState:
+    """
+    run_single_turn의 비동기 버전
+    
+    모든 LLM 호출이 ainvoke로 실행되므로 턴 진행 중 스레드를 점유하지 않습니다.
+    여러 세션을 asyncio.gather 등으로 한 이벤트 루프에서 동시에 처리할 수 있습니다.
+    
+    Args:
+        state: 현재 상태
+        user_input: 사용자 입력
+        
+    Returns:
+        업데이트된 상태
+    """
+    if user_input:
+        state = {**state, "user_input": user_input}
+    
+    return await async_app.ainvoke(state)
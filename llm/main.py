@@ -15,6 +15,7 @@ load_dotenv()
 
 from .graph.workflow import app, get_initial_state, run_single_turn
 from .graph.state import VoiceGuardianState
+from .utils.scenario_topics import canonical_topic
 
 
 def print_message(msg, prefix: str = ""):
@@ -201,8 +202,8 @@ def main():
         run_demo()
         return
     
-    # 시나리오 주제 정규화
-    topic = args.topic.strip()
+    # 시나리오 주제 정규화 ("검찰사칭", "정부지원금" 등 별칭 → 정식 라벨)
+    topic = canonical_topic(args.topic) if args.topic.strip() else ""
     
     # 대화형 세션 실행
     run_interactive_session(scenario_topic=topic)
@@ -0,0 +1,285 @@
+# 저장된 훈련 대화 기록 일괄 재채점 (Evaluator 규칙 변경 후 회귀 확인용)
+#
+# 사용법:
+#   python -m llm.score_transcripts transcripts.jsonl --out scores.jsonl
+#   python -m llm.score_transcripts archive/ --out scores.jsonl --workers 8 --llm-workers 16
+#   python -m llm.score_transcripts archive/ --out scores.jsonl --no-llm   # 패턴 단계만 (API 키 불필요)
+#
+# 입력 형식 (JSONL 한 줄 = 대화 1건, 또는 대화 목록 JSON 파일, 디렉터리면 *.jsonl / *.json):
+#   {"id": "session-001", "messages": [{"role": "assistant", "content": "..."}, {"role": "user", "content": "..."}]}
+#   role은 user/human, assistant/ai 모두 허용
+#
+# 처리 흐름:
+#   1. 대화 기록을 한 줄씩 읽으며 사용자 메시지마다 (직전 사기범 대사, 사용자 메시지) 항목 생성
+#   2. 항목을 chunk 단위로 프로세스 풀에 보내 1단계 패턴 검사 (detect_pii_batch)
+#   3. ambiguous 항목만 제한된 스레드 풀에서 LLM 문맥 검사 (동시 호출 수 = --llm-workers)
+#   4. 메시지별 EvaluationResult를 완료 순서대로 JSONL로 출력, 마지막에 처리량 요약
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from dotenv import load_dotenv
+
+from .graph.state import EvaluationResult
+from .agents.evaluator import evaluate_message
+from .tools.pii_detector import PIIDetection, detect_pii_batch
+
+
+_USER_ROLES = {"user", "human"}
+_AI_ROLES = {"assistant", "ai"}
+
+
+@dataclass
+class ScoringItem:
+    """채점 대상 사용자 메시지 1건"""
+    transcript_id: str
+    index: int              # 대화 내 메시지 위치
+    user_message: str
+    scammer_line: str
+
+
+@dataclass
+class BatchStats:
+    """일괄 채점 처리량 요약"""
+    transcripts: int = 0
+    messages: int = 0
+    pattern_settled: int = 0     # 1단계에서 확정
+    escalated: int = 0           # LLM 문맥 검사 대상
+    skipped: int = 0             # --no-llm으로 판정 보류
+    danger: int = 0
+    pattern_seconds: float = 0.0 # 마지막 1단계 chunk 완료 시점
+    elapsed_seconds: float = 0.0
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def pattern_messages_per_second(self) -> float:
+        return self.messages / self.pattern_seconds if self.pattern_seconds else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "messages_per_second": self.messages_per_second,
+            "pattern_messages_per_second": self.pattern_messages_per_second,
+        }
+
+
+# ----------------------------------------------------------------------------
+# 입력
+# ----------------------------------------------------------------------------
+
+def _expand_paths(paths: Iterable[str | os.PathLike]) -> Iterator[Path]:
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*") if p.suffix in (".jsonl", ".json"))
+        else:
+            yield path
+
+
+def iter_transcripts(paths: Iterable[str | os.PathLike]) -> Iterator[dict[str, Any]]:
+    """대화 기록을 하나씩 읽기 (JSONL은 줄 단위 스트리밍)"""
+    for path in _expand_paths(paths):
+        with open(path, encoding="utf-8") as f:
+            if path.suffix == ".jsonl":
+                for line_no, line in enumerate(f, 1):
+                    if line.strip():
+                        record = json.loads(line)
+                        record.setdefault("id", f"{path.name}:{line_no}")
+                        yield record
+            else:
+                data = json.load(f)
+                for i, record in enumerate(data if isinstance(data, list) else [data]):
+                    record.setdefault("id", f"{path.name}:{i}")
+                    yield record
+
+
+def iter_items(transcripts: Iterable[dict[str, Any]], stats: BatchStats) -> Iterator[ScoringItem]:
+    """대화 기록 → 사용자 메시지별 채점 항목"""
+    for record in transcripts:
+        stats.transcripts += 1
+        scammer_line = ""
+        for index, message in enumerate(record.get("messages", [])):
+            role = str(message.get("role") or message.get("type") or "").lower()
+            content = message.get("content") or ""
+            if role in _AI_ROLES:
+                scammer_line = content
+            elif role in _USER_ROLES:
+                yield ScoringItem(str(record["id"]), index, content, scammer_line)
+
+
+def _chunks(items: Iterator[ScoringItem], size: int) -> Iterator[list[ScoringItem]]:
+    chunk: list[ScoringItem] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ----------------------------------------------------------------------------
+# 채점
+# ----------------------------------------------------------------------------
+
+class BatchScorer:
+    """
+    대화 기록 일괄 채점기
+
+    run()을 반복하면 메시지별 결과 dict를 완료 순서대로 내보내고, 끝나면 stats에 처리량이 담깁니다.
+
+    Args:
+        workers: 1단계 패턴 검사 프로세스 수 (기본 CPU 수)
+        llm_workers: 2단계 LLM 동시 호출 수
+        use_llm: False면 ambiguous 항목은 판정 보류(evaluation_result=None)
+        chunk_size: 프로세스 풀 작업 단위 메시지 수
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        llm_workers: int = 4,
+        use_llm: bool = True,
+        chunk_size: int = 512,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.llm_workers = llm_workers
+        self.use_llm = use_llm
+        self.chunk_size = chunk_size
+        self.stats = BatchStats()
+        self._danger_lock = threading.Lock()
+
+    def _record(self, item: ScoringItem, tier: str, detection: PIIDetection, result: EvaluationResult | None) -> dict:
+        if result is not None and result.get("is_danger"):
+            with self._danger_lock:
+                self.stats.danger += 1
+        return {
+            "transcript_id": item.transcript_id,
+            "index": item.index,
+            "tier": tier,
+            "pattern_verdict": detection.verdict,
+            "evaluation_result": result,
+        }
+
+    def run(self, paths: Iterable[str | os.PathLike]) -> Iterator[dict[str, Any]]:
+        self.stats = stats = BatchStats()
+        start = time.perf_counter()
+        items = _chunks(iter_items(iter_transcripts(paths), stats), self.chunk_size)
+        done: deque[dict[str, Any]] = deque()
+        done_lock = threading.Lock()
+        llm_slots = threading.BoundedSemaphore(self.llm_workers * 2)   # 대기 포함 LLM 작업 상한
+
+        def on_llm_done(item: ScoringItem, detection: PIIDetection, future: Future) -> None:
+            llm_slots.release()
+            try:
+                result = future.result()
+            except Exception:
+                result = None
+            with done_lock:
+                done.append(self._record(item, "llm", detection, result))
+
+        # 스레드를 만들기 전에 프로세스 풀을 먼저 띄움 (fork 시 잠금 상태 복제 방지)
+        with ProcessPoolExecutor(max_workers=self.workers) as processes, \
+                ThreadPoolExecutor(max_workers=self.llm_workers, thread_name_prefix="score-llm") as threads:
+            pending: deque[tuple[list[ScoringItem], Future]] = deque()
+
+            def drain(block: bool) -> Iterator[dict[str, Any]]:
+                while pending and (block or pending[0][1].done()):
+                    chunk, future = pending.popleft()
+                    for item, detection in zip(chunk, future.result()):
+                        stats.messages += 1
+                        if detection.verdict != "ambiguous":
+                            stats.pattern_settled += 1
+                            # 라이브 Evaluator와 같은 판정 함수 (1단계 확정 항목은 LLM 호출 없이 반환)
+                            result = evaluate_message(item.user_message, item.scammer_line, detection)
+                            yield self._record(item, "pattern", detection, result)
+                        elif not self.use_llm:
+                            stats.skipped += 1
+                            yield self._record(item, "skipped", detection, None)
+                        else:
+                            stats.escalated += 1
+                            llm_slots.acquire()
+                            fut = threads.submit(evaluate_message, item.user_message, item.scammer_line, detection)
+                            fut.add_done_callback(lambda f, i=item, d=detection: on_llm_done(i, d, f))
+                    stats.pattern_seconds = time.perf_counter() - start
+                    yield from self._pop_done(done, done_lock)
+
+            for chunk in items:
+                pending.append((chunk, processes.submit(detect_pii_batch, [i.user_message for i in chunk])))
+                # 프로세스 풀 입력도 상한을 둬서 대용량 기록을 메모리에 다 올리지 않음
+                yield from drain(block=len(pending) >= self.workers * 2)
+            yield from drain(block=True)
+
+        yield from self._pop_done(done, done_lock)
+        stats.elapsed_seconds = time.perf_counter() - start
+
+    @staticmethod
+    def _pop_done(done: deque, lock: threading.Lock) -> Iterator[dict[str, Any]]:
+        with lock:
+            ready = list(done)
+            done.clear()
+        yield from ready
+
+
+def score_transcripts(paths: Iterable[str | os.PathLike], **kwargs: Any) -> tuple[list[dict[str, Any]], BatchStats]:
+    """일괄 채점 후 (메시지별 결과 목록, 처리량 요약) 반환 (소규모 사용·노트북용)"""
+    scorer = BatchScorer(**kwargs)
+    results = list(scorer.run(paths))
+    return results, scorer.stats
+
+
+def print_summary(stats: BatchStats) -> None:
+    print(f"\n📊 대화 {stats.transcripts}건 / 메시지 {stats.messages}건", file=sys.stderr)
+    print(
+        f"   패턴 확정 {stats.pattern_settled} · LLM 검사 {stats.escalated} · 보류 {stats.skipped} · 위험 {stats.danger}",
+        file=sys.stderr,
+    )
+    print(
+        f"   전체 {stats.elapsed_seconds:.2f}s ({stats.messages_per_second:,.0f} msg/s), "
+        f"패턴 단계 {stats.pattern_seconds:.2f}s ({stats.pattern_messages_per_second:,.0f} msg/s)",
+        file=sys.stderr,
+    )
+
+
+def main():
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="저장된 훈련 대화 기록을 Evaluator로 일괄 재채점")
+    parser.add_argument("paths", nargs="+", help="대화 기록 JSONL/JSON 파일 또는 디렉터리")
+    parser.add_argument("--out", required=True, help="결과 JSONL 경로 (요약은 표준 에러로 출력)")
+    parser.add_argument("--workers", type=int, default=None, help="패턴 단계 프로세스 수 (기본 CPU 수)")
+    parser.add_argument("--llm-workers", type=int, default=4, help="LLM 문맥 검사 동시 호출 수")
+    parser.add_argument("--chunk-size", type=int, default=512, help="프로세스 풀 작업 단위 메시지 수")
+    parser.add_argument("--no-llm", action="store_true", help="LLM 단계 생략 (ambiguous는 판정 보류)")
+    parser.add_argument("--stats-json", help="처리량 요약을 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    load_dotenv()
+    scorer = BatchScorer(
+        workers=args.workers,
+        llm_workers=args.llm_workers,
+        use_llm=not args.no_llm,
+        chunk_size=args.chunk_size,
+    )
+    with open(args.out, "w", encoding="utf-8") as out:
+        for record in scorer.run(args.paths):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    print_summary(scorer.stats)
+    if args.stats_json:
+        with open(args.stats_json, "w", encoding="utf-8") as f:
+            json.dump(scorer.stats.as_dict(), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
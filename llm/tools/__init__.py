@@ -1,14 +1,30 @@
 # 공용 도구: 여러 에이전트(Roleplaying, Guardian 등)가 사용하는 도구들을 py로 관리
 # 새 도구 추가 시 이 폴더에 모듈 추가 후 __all__에 노출
 
+from .numeral_normalizer import NormalizedText, normalize_numerals
+from .pii_detector import PIIDetection, detect_pii, detect_pii_batch
+from .snippet_compressor import compress_results, estimate_tokens
 from .voice_phishing_rag import (
     RAG_TOOL_DEFINITION,
+    asearch,
     format_rag_result_for_llm,
+    get_rag_cache_stats,
+    search_many,
     search_voice_phishing_cases,
 )
 
 __all__ = [
     "search_voice_phishing_cases",
+    "search_many",
+    "asearch",
     "format_rag_result_for_llm",
+    "get_rag_cache_stats",
     "RAG_TOOL_DEFINITION",
+    "compress_results",
+    "estimate_tokens",
+    "PIIDetection",
+    "detect_pii",
+    "detect_pii_batch",
+    "NormalizedText",
+    "normalize_numerals",
 ]
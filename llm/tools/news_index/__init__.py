@@ -0,0 +1,21 @@
+# 매일경제 뉴스 검색 엔진 (voice_phishing_rag의 백엔드)
+# 외부 벡터 DB 없이 로컬 디스크 + NumPy만 사용
+
+from .cache import CacheStats, ResultCache, make_query_key
+from .embedding import HashingEmbedder, normalize_text, tokenize
+from .facets import FacetIndex, classify_topics
+from .ngram import NgramIndex
+from .store import NewsIndex
+
+__all__ = [
+    "CacheStats",
+    "FacetIndex",
+    "HashingEmbedder",
+    "NewsIndex",
+    "NgramIndex",
+    "ResultCache",
+    "classify_topics",
+    "make_query_key",
+    "normalize_text",
+    "tokenize",
+]
@@ -0,0 +1,105 @@
+# 프로세스 공용 RAG 검색 결과 캐시 (LRU + TTL)
+# 여러 Streamlit 세션이 같은 시나리오("카드사 사칭", "검찰 사칭" 등)를 고르므로 같은 쿼리가 반복됨
+#
+# - 키: (정규화된 쿼리, top_k, 기타 검색 옵션)
+# - 크기 초과 시 가장 오래 사용되지 않은 항목부터, TTL이 지난 항목은 조회 시점에 제거
+# - 인덱스 generation이 바뀌면(재수집) 전체 무효화
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Hashable
+
+from .embedding import normalize_text
+
+
+@dataclass
+class CacheStats:
+    """캐시 카운터 스냅샷"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0       # 크기 초과로 제거
+    expirations: int = 0     # TTL 만료로 제거
+    invalidations: int = 0   # 인덱스 재수집으로 전체 무효화된 횟수
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+def make_query_key(query: str, top_k: int, *extra: Hashable) -> tuple:
+    """대소문자·공백·전각 문자 차이를 없앤 캐시 키"""
+    return (normalize_text(query), int(top_k), *extra)
+
+
+class ResultCache:
+    """
+    스레드 안전 LRU/TTL 캐시
+
+    Args:
+        max_entries: 최대 항목 수
+        ttl_seconds: 항목 유효 시간 (0 이하이면 만료 없음)
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation: int | None = None
+        self._stats = CacheStats()
+
+    def _check_generation(self, generation: int) -> None:
+        """인덱스 generation 변경 시 전체 무효화 (lock 보유 상태에서 호출)"""
+        if self._generation != generation:
+            if self._generation is not None and self._data:
+                self._stats.invalidations += 1
+            self._data.clear()
+            self._generation = generation
+
+    def get(self, key: Hashable, generation: int = 0) -> Any | None:
+        """캐시 조회 (없거나 만료면 None)"""
+        with self._lock:
+            self._check_generation(generation)
+            item = self._data.get(key)
+            if item is None:
+                self._stats.misses += 1
+                return None
+            stored_at, value = item
+            if self.ttl_seconds > 0 and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._data[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, generation: int = 0) -> None:
+        """캐시 저장 (크기 초과 시 LRU 제거)"""
+        with self._lock:
+            self._check_generation(generation)
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._stats.evictions += 1
+
+    def invalidate(self) -> None:
+        """전체 무효화"""
+        with self._lock:
+            if self._data:
+                self._stats.invalidations += 1
+            self._data.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            snapshot = CacheStats(**{k: v for k, v in asdict(self._stats).items() if k != "size"})
+            snapshot.size = len(self._data)
+            return snapshot
@@ -0,0 +1,55 @@
+# 뉴스 인덱스 설정값
+# 환경변수로 덮어쓸 수 있으며, 없으면 아래 기본값 사용
+
+import os
+from pathlib import Path
+
+
+# 프로젝트 루트 (llm/tools/news_index/config.py 기준 3단계 위)
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+# 인덱스 디렉터리 (manifest.json, vectors.f32, meta.jsonl, meta.idx)
+INDEX_DIR = Path(os.environ.get("VOICE_GUARDIAN_INDEX_DIR", _PROJECT_ROOT / "data" / "news_index"))
+
+# 임베딩 차원 (해싱 임베더 기본값)
+EMBEDDING_DIM = int(os.environ.get("VOICE_GUARDIAN_EMBEDDING_DIM", "256"))
+
+# 전수 스캔 시 한 번에 내적할 행 수 (임시 배열 크기 제한)
+SCAN_CHUNK_ROWS = 65536
+
+# 검색 모드: "hybrid" (BM25 후보 + 벡터 재점수) / "vector" (전수 벡터 스캔)
+SEARCH_MODE = os.environ.get("VOICE_GUARDIAN_SEARCH_MODE", "hybrid")
+
+# 하이브리드 점수 = HYBRID_ALPHA * 벡터 점수 + (1 - HYBRID_ALPHA) * 정규화 BM25 점수
+HYBRID_ALPHA = float(os.environ.get("VOICE_GUARDIAN_HYBRID_ALPHA", "0.5"))
+
+# 하이브리드 모드에서 벡터로 재점수할 BM25 후보 수
+BM25_CANDIDATES = 200
+
+# 검색 결과 캐시 크기 / 유효 시간 (초)
+RAG_CACHE_SIZE = int(os.environ.get("VOICE_GUARDIAN_RAG_CACHE_SIZE", "1024"))
+RAG_CACHE_TTL = float(os.environ.get("VOICE_GUARDIAN_RAG_CACHE_TTL", "600"))
+
+# 다른 프로세스의 재수집 여부(manifest generation)를 확인하는 최소 간격 (초)
+INDEX_RELOAD_INTERVAL = 5.0
+
+# asearch() 마이크로 배치 대기 시간 (초): 이 시간 안에 들어온 쿼리를 모아 한 번에 스캔
+ASYNC_BATCH_WINDOW = 0.002
+
+# 전수 스캔 저장 형식: "int8" (행별 스케일 int8, 메모리 1/4) / "none" (float32)
+# int8 파일(vectors.i8)이 구축되어 있을 때만 적용됨 (python -m llm.tools.news_index.quantize)
+QUANTIZATION = os.environ.get("VOICE_GUARDIAN_QUANTIZATION", "int8")
+
+# int8 스캔 후 float32 원본으로 정확히 재점수할 후보 수 (0이면 재점수 없음)
+RERANK_CANDIDATES = int(os.environ.get("VOICE_GUARDIAN_RERANK_CANDIDATES", "50"))
+
+# int8 스캔 시 한 번에 float32로 변환할 행 수
+QUANT_SCAN_CHUNK_ROWS = 16384
+
+# 벡터 검색 백엔드: "flat" (전수 스캔) / "hnsw" (근사 그래프, hnsw/ 구축 필요)
+VECTOR_BACKEND = os.environ.get("VOICE_GUARDIAN_VECTOR_BACKEND", "flat")
+
+# HNSW 파라미터: 노드당 이웃 수 / 구축 시 탐색 폭 / 검색 시 탐색 폭
+HNSW_M = int(os.environ.get("VOICE_GUARDIAN_HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.environ.get("VOICE_GUARDIAN_HNSW_EF_CONSTRUCTION", "100"))
+HNSW_EF_SEARCH = int(os.environ.get("VOICE_GUARDIAN_HNSW_EF_SEARCH", "64"))
@@ -0,0 +1,143 @@
+# MinHash + LSH 근접 중복 제거
+# 통신사 기사 재전송, 제목만 바꾼 재송고 등 같은 기사의 복제본을 인덱스에 넣지 않기 위함
+#
+# 상태(이미 색인된 기사의 LSH 버킷, 시그니처)는 SQLite에 저장하므로
+# 일일 증분 수집 시 기존 코퍼스를 다시 읽지 않고 버킷 조회만으로 중복 판정 (델타 크기에 비례)
+
+import sqlite3
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+
+# MinHash 파라미터: 64개 해시 = 16 밴드 x 4 행 (Jaccard 약 0.5 이상부터 후보로 잡힘)
+NUM_PERM = 64
+NUM_BANDS = 16
+SHINGLE_SIZE = 5
+
+# 후보 중 추정 Jaccard가 이 값 이상이면 중복으로 판정
+DUPLICATE_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """공백 제거 텍스트의 문자 shingle을 crc32 해시 배열로 변환"""
+    compact = "".join(text.split())
+    if len(compact) <= size:
+        grams = {compact} if compact else set()
+    else:
+        grams = {compact[i:i + size] for i in range(len(compact) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+class MinHasher:
+    """고정 시드의 (a*x + b) mod p 순열로 MinHash 시그니처 계산 (NumPy 벡터화)"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """텍스트의 MinHash 시그니처 (num_perm,) uint32"""
+        hashes = _shingles(text)
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        # (num_perm, n_shingles) - 32bit 값끼리의 곱이므로 uint64 안에서 overflow 없음
+        perm = (np.outer(self.a, hashes) + self.b[:, None]) % _MERSENNE_PRIME
+        return (perm & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+
+class NearDuplicateFilter:
+    """
+    SQLite 기반 LSH 중복 필터
+
+    - is_duplicate(): 같은 밴드 버킷에 있는 기존 기사와 시그니처를 비교
+    - add(): 통과한 기사를 버킷/시그니처 테이블에 등록
+    - 정확히 같은 기사 키(URL 등)는 seen 테이블로 먼저 걸러냄
+    """
+
+    def __init__(self, path: str | Path, threshold: float = DUPLICATE_THRESHOLD):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.hasher = MinHasher()
+        self.rows_per_band = NUM_PERM // NUM_BANDS
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS signatures (doc INTEGER PRIMARY KEY, sig BLOB NOT NULL);
+            CREATE TABLE IF NOT EXISTS buckets (band INTEGER, bucket INTEGER, doc INTEGER);
+            CREATE INDEX IF NOT EXISTS buckets_idx ON buckets (band, bucket);
+            """
+        )
+        self._next_doc = self.conn.execute("SELECT COALESCE(MAX(doc) + 1, 0) FROM signatures").fetchone()[0]
+
+    def _band_keys(self, sig: np.ndarray) -> list[int]:
+        r = self.rows_per_band
+        return [
+            zlib.crc32(sig[i * r:(i + 1) * r].tobytes()) for i in range(NUM_BANDS)
+        ]
+
+    def seen(self, key: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone() is not None
+
+    def check(self, key: str, text: str) -> tuple[bool, np.ndarray]:
+        """
+        중복 여부 판정
+
+        Args:
+            key: 기사 고유 키 (URL, 없으면 제목+날짜 해시)
+            text: 기사 본문
+
+        Returns:
+            (중복 여부, 시그니처) - 시그니처는 add()에 그대로 전달
+        """
+        sig = self.hasher.signature(text)
+        if self.seen(key):
+            return True, sig
+        candidates = set()
+        for band, bucket in enumerate(self._band_keys(sig)):
+            rows = self.conn.execute(
+                "SELECT doc FROM buckets WHERE band = ? AND bucket = ?", (band, bucket)
+            ).fetchall()
+            candidates.update(doc for (doc,) in rows)
+        for doc in candidates:
+            (blob,) = self.conn.execute("SELECT sig FROM signatures WHERE doc = ?", (doc,)).fetchone()
+            other = np.frombuffer(blob, dtype=np.uint32)
+            if float(np.mean(other == sig)) >= self.threshold:
+                return True, sig
+        return False, sig
+
+    def add(self, key: str, sig: np.ndarray) -> None:
+        """
+        중복이 아닌 기사 등록
+
+        commit()까지는 트랜잭션에 남아 같은 연결의 check()에만 보이고,
+        rollback()이나 commit 없는 close()면 버려집니다.
+        """
+        doc = self._next_doc
+        self._next_doc += 1
+        self.conn.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,))
+        self.conn.execute("INSERT INTO signatures (doc, sig) VALUES (?, ?)", (doc, sig.tobytes()))
+        self.conn.executemany(
+            "INSERT INTO buckets (band, bucket, doc) VALUES (?, ?, ?)",
+            [(band, bucket, doc) for band, bucket in enumerate(self._band_keys(sig))],
+        )
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def rollback(self) -> None:
+        """commit하지 않은 등록 취소 (인덱스에 반영되지 못한 기사를 다음 수집에서 다시 받도록)"""
+        self.conn.rollback()
+        self._next_doc = self.conn.execute("SELECT COALESCE(MAX(doc) + 1, 0) FROM signatures").fetchone()[0]
+
+    def close(self) -> None:
+        """연결 종료 (commit하지 않은 등록은 버림)"""
+        self.conn.rollback()
+        self.conn.close()
@@ -0,0 +1,108 @@
+# 로컬 임베더: 외부 모델/서비스 없이 한국어 문자 n-gram을 해싱하여 고정 차원 벡터 생성
+# 인덱스 구축(ingest)과 검색(query)이 반드시 같은 설정의 임베더를 써야 하므로
+# 설정값은 manifest.json에 함께 저장됨
+
+import re
+import unicodedata
+import zlib
+from typing import Any, Iterable
+
+import numpy as np
+
+
+_TOKEN_RE = re.compile(r"[0-9A-Za-z가-힣]+")
+
+
+def normalize_text(text: str) -> str:
+    """NFKC 정규화 + 소문자화 + 공백 정리 (전각 문자, 호환 한자 등 통일)"""
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.lower().split())
+
+
+def tokenize(text: str) -> list[str]:
+    """정규화된 텍스트에서 한글/영문/숫자 토큰만 추출"""
+    return _TOKEN_RE.findall(normalize_text(text))
+
+
+def char_ngrams(token: str, sizes: Iterable[int] = (2, 3)) -> list[str]:
+    """
+    토큰 내부 문자 n-gram 생성
+
+    한국어는 조사·어미가 붙어 형태가 바뀌므로 ("검찰을", "검찰청") 어절 단위보다
+    음절 bigram/trigram이 기관명 매칭에 더 안정적입니다.
+    """
+    grams = []
+    for n in sizes:
+        if len(token) < n:
+            continue
+        grams.extend(token[i:i + n] for i in range(len(token) - n + 1))
+    return grams
+
+
+class HashingEmbedder:
+    """
+    Feature hashing 기반 임베더
+
+    - 특징: 어절 unigram + 음절 bigram/trigram
+    - 각 특징을 crc32로 차원 인덱스와 부호에 매핑 (signed hashing)
+    - 빈도는 sqrt로 완화 후 L2 정규화 → 내적 = 코사인 유사도
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 256, ngram_sizes: tuple[int, ...] = (2, 3)):
+        self.dim = dim
+        self.ngram_sizes = tuple(ngram_sizes)
+
+    def config(self) -> dict[str, Any]:
+        """manifest.json에 저장할 설정"""
+        return {"name": self.name, "dim": self.dim, "ngram_sizes": list(self.ngram_sizes)}
+
+    def _features(self, text: str) -> list[str]:
+        features = []
+        for token in tokenize(text):
+            features.append("w:" + token)
+            features.extend(char_ngrams(token, self.ngram_sizes))
+        return features
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """
+        텍스트 목록을 (len(texts), dim) float32 행렬로 변환
+
+        Args:
+            texts: 임베딩할 텍스트 목록
+
+        Returns:
+            L2 정규화된 임베딩 행렬 (빈 텍스트는 0 벡터)
+        """
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts: dict[int, float] = {}
+            for feature in self._features(text):
+                h = zlib.crc32(feature.encode("utf-8"))
+                idx = h % self.dim
+                sign = 1.0 if (h >> 31) & 1 else -1.0
+                counts[idx] = counts.get(idx, 0.0) + sign
+            if not counts:
+                continue
+            idxs = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+            vals = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            out[row, idxs] = np.sign(vals) * np.sqrt(np.abs(vals))
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """단일 쿼리 임베딩 (dim,)"""
+        return self.embed([text])[0]
+
+
+def embedder_from_config(config: dict[str, Any]) -> HashingEmbedder:
+    """manifest.json의 임베더 설정으로 임베더 복원"""
+    name = config.get("name", HashingEmbedder.name)
+    if name != HashingEmbedder.name:
+        raise ValueError(f"지원하지 않는 임베더입니다: {name}")
+    return HashingEmbedder(
+        dim=int(config.get("dim", 256)),
+        ngram_sizes=tuple(config.get("ngram_sizes", (2, 3))),
+    )
@@ -0,0 +1,282 @@
+# 날짜·주제 facet 역색인
+# "최근 1년 카드사 사칭 사례"처럼 필터가 붙은 검색에서 점수 계산 전에 후보 행을 좁히기 위한 색인
+#
+# 저장 구조:
+#   facets/facets.json         # {"count": 색인된 행 수, "rules": 주제 분류 규칙 버전}
+#   facets/days.i32            # 행별 기사 날짜 (1970-01-01 기준 일수, 날짜 없음 = -1)
+#   facets/month/<YYYY-MM>.i32 # 해당 월 기사의 행 번호 (오름차순)
+#   facets/topic/<label>.i32   # 해당 주제로 분류된 행 번호 (오름차순)
+#
+# 행은 항상 끝에 추가되므로 postings 파일은 append만으로 정렬 상태가 유지됨.
+# since= 는 경계 월 이후 월 버킷들의 합집합 + 경계 월만 days로 일 단위 필터,
+# topic= 은 주제 postings를 그대로 사용하므로 필터 비용은 전체 행 수가 아니라 후보 수에 비례.
+
+import datetime as dt
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+from .embedding import normalize_text
+
+
+FACETS_FILE = "facets.json"
+DAYS_FILE = "days.i32"
+MONTH_DIR = "month"
+TOPIC_DIR = "topic"
+
+# 주제 라벨 → 판별 구절 (기사 headline + snippet에 하나라도 있으면 해당 주제, 복수 라벨 가능)
+# 그 수법에서만 쓰이는 구절만 둠. "경찰", "링크", "주식"처럼 일반 기사에도 흔한 단어는 TOPIC_HINTS로
+TOPIC_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "검찰 사칭": (
+        "검찰 사칭", "검찰사칭", "검찰을 사칭", "검사 사칭", "검사를 사칭", "수사관", "지검",
+        "금감원 사칭", "금융감독원 사칭", "사건에 연루", "범죄에 연루", "안전계좌",
+    ),
+    "카드사 사칭": ("카드사 사칭", "카드사를 사칭", "카드 발급", "카드가 발급", "카드 배송", "해외 결제", "해외결제"),
+    "대출 사기": ("대출 사기", "대출사기", "저금리 대출", "대환대출", "대환 대출", "대출 빙자", "대출을 빙자"),
+    "가족 사칭": ("가족 사칭", "자녀 사칭", "자녀를 사칭", "메신저 피싱", "메신저피싱", "액정이 깨", "휴대폰 액정"),
+    "택배·문자 사기": ("스미싱", "택배 사칭", "택배 문자", "부고 문자", "청첩장 문자", "모바일 청첩장"),
+    "투자 사기": ("투자 사기", "투자사기", "리딩방", "고수익 보장", "원금 보장", "코인 사기", "가상자산 사기"),
+    "정부 지원금 사칭": ("지원금 사칭", "정부 지원금", "재난지원금", "환급금 조회", "국세청 사칭", "건강보험 환급"),
+}
+
+# 주제 라벨 → 보조 단어 (서로 다른 단어가 TOPIC_MIN_HINTS개 이상 함께 나올 때만 해당 주제)
+TOPIC_HINTS: dict[str, tuple[str, ...]] = {
+    "검찰 사칭": ("검찰", "검사", "경찰", "금융감독원", "금감원", "수사", "구속영장", "명의 도용"),
+    "카드사 사칭": ("카드사", "카드", "결제", "승인 문자", "개인정보 유출"),
+    "대출 사기": ("대출", "저금리", "신용등급", "신용점수", "캐피탈", "상환"),
+    "가족 사칭": ("엄마", "아빠", "자녀", "가족", "아들", "액정"),
+    "택배·문자 사기": ("택배", "문자", "링크", "부고", "청첩장", "url"),
+    "투자 사기": ("투자", "코인", "가상자산", "주식", "수익률", "종목"),
+    "정부 지원금 사칭": ("지원금", "환급금", "국세청", "건강보험", "보조금", "정부"),
+}
+assert set(TOPIC_HINTS) == set(TOPIC_KEYWORDS)
+
+TOPIC_MIN_HINTS = 2
+
+# 분류 규칙이 바뀌면 올림 → build_facets()가 기존 행의 facet을 한 번 다시 색인
+TOPIC_RULES_VERSION = 2
+
+_EPOCH = dt.date(1970, 1, 1)
+
+
+def to_day(value: str | dt.date | None) -> int:
+    """"YYYY-MM-DD" 또는 date → 1970-01-01 기준 일수 (없거나 형식 오류면 -1)"""
+    if value is None:
+        return -1
+    if isinstance(value, dt.datetime):
+        value = value.date()
+    if not isinstance(value, dt.date):
+        try:
+            value = dt.date.fromisoformat(str(value)[:10])
+        except ValueError:
+            return -1
+    return (value - _EPOCH).days
+
+
+def _month_of(day: int) -> str:
+    d = _EPOCH + dt.timedelta(days=day)
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def classify_topics(text: str, min_hints: int = TOPIC_MIN_HINTS) -> list[str]:
+    """
+    텍스트의 주제 라벨 목록 (TOPIC_KEYWORDS 순서)
+
+    판별 구절이 하나라도 있거나, 보조 단어가 서로 다른 것으로 min_hints개 이상 있으면 해당 주제입니다.
+    """
+    text = normalize_text(text)
+    return [
+        label for label, keywords in TOPIC_KEYWORDS.items()
+        if any(k in text for k in keywords)
+        or sum(h in text for h in TOPIC_HINTS[label]) >= min_hints
+    ]
+
+
+def resolve_topic(topic: str) -> list[str]:
+    """
+    topic= 인자를 라벨 목록으로 변환
+
+    정확한 라벨이면 그 라벨만, 아니면 자유 문장("검찰 전화 사례" 등)을 분류합니다.
+    질의는 기사보다 짧으므로 보조 단어 하나만 있어도 해당 주제로 봅니다.
+    """
+    if topic in TOPIC_KEYWORDS:
+        return [topic]
+    return classify_topics(topic, min_hints=1)
+
+
+def _read_rows(path: Path, limit: int) -> np.ndarray:
+    """postings 파일을 memmap으로 열고 limit 미만 행만 반환 (중단된 쓰기의 꼬리 무시)"""
+    size = path.stat().st_size // 4 if path.exists() else 0
+    if size == 0:
+        return np.empty(0, dtype=np.int32)
+    rows = np.memmap(path, dtype=np.int32, mode="r", shape=(size,))
+    return rows[:int(np.searchsorted(rows, limit))]
+
+
+def _append_rows(path: Path, start: int, rows: np.ndarray) -> None:
+    """start 이상 행(이전 중단 쓰기의 잔여분)을 잘라낸 뒤 rows를 이어 씀"""
+    path.touch()
+    keep = len(_read_rows(path, start))
+    with open(path, "r+b") as f:
+        f.truncate(keep * 4)
+        f.seek(0, os.SEEK_END)
+        f.write(np.asarray(rows, dtype=np.int32).tobytes())
+
+
+class FacetIndex:
+    """
+    날짜(월 버킷 + 일 단위 배열)·주제 postings
+
+    - add_records(): 새 행들의 날짜/주제를 postings 파일에 추가
+    - select(): since/topic 조건을 만족하는 행 번호를 정렬된 배열로 반환 (조건이 없으면 None)
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self.count = 0
+        self.rules_version = TOPIC_RULES_VERSION
+        self._load()
+
+    def _load(self) -> None:
+        info_file = self.path / FACETS_FILE
+        if info_file.exists():
+            with open(info_file, encoding="utf-8") as f:
+                info = json.load(f)
+            self.count = int(info["count"])
+            # rules 필드가 없으면 규칙 버전 도입 전 색인
+            self.rules_version = int(info.get("rules", 1))
+        else:
+            self.count = 0
+            self.rules_version = TOPIC_RULES_VERSION
+
+    def _write_info(self) -> None:
+        tmp = self.path / (FACETS_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"count": self.count, "rules": self.rules_version}, f)
+        os.replace(tmp, self.path / FACETS_FILE)
+
+    def reload(self) -> None:
+        self._load()
+
+    @property
+    def rules_stale(self) -> bool:
+        """현재 TOPIC_KEYWORDS/TOPIC_HINTS와 다른 규칙으로 만든 색인인지"""
+        return self.rules_version != TOPIC_RULES_VERSION
+
+    def reset(self) -> None:
+        """모든 facet 삭제 (분류 규칙이 바뀌어 처음부터 다시 색인할 때)"""
+        for name in (MONTH_DIR, TOPIC_DIR):
+            shutil.rmtree(self.path / name, ignore_errors=True)
+        (self.path / DAYS_FILE).unlink(missing_ok=True)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+        self.rules_version = TOPIC_RULES_VERSION
+        self._write_info()
+
+    @property
+    def covered_rows(self) -> int:
+        """facet에 포함된 마지막 행 번호 + 1"""
+        return self.count
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+
+    def add_records(self, start: int, records: list[dict[str, Any]], texts: Iterable[str]) -> None:
+        """
+        전역 행 번호 start부터 시작하는 행들의 facet 추가
+
+        Args:
+            start: 첫 행 번호 (= 현재 covered_rows)
+            records: 행 메타데이터 (date 필드 사용)
+            texts: 주제 분류에 쓸 행 텍스트 (headline + snippet)
+        """
+        if not records:
+            return
+        if start != self.count:
+            raise ValueError(f"facet 색인이 행 {self.count}까지만 있습니다 (요청 시작 행: {start}).")
+        (self.path / MONTH_DIR).mkdir(parents=True, exist_ok=True)
+        (self.path / TOPIC_DIR).mkdir(parents=True, exist_ok=True)
+
+        days = np.fromiter((to_day(r.get("date")) for r in records), dtype=np.int32, count=len(records))
+        months: dict[str, list[int]] = {}
+        topics: dict[str, list[int]] = {}
+        for i, (day, text) in enumerate(zip(days, texts)):
+            row = start + i
+            if day >= 0:
+                months.setdefault(_month_of(int(day)), []).append(row)
+            for label in classify_topics(text):
+                topics.setdefault(label, []).append(row)
+
+        days_path = self.path / DAYS_FILE
+        days_path.touch()
+        with open(days_path, "r+b") as f:
+            f.truncate(start * 4)
+            f.seek(0, os.SEEK_END)
+            f.write(days.tobytes())
+        for month, rows in months.items():
+            _append_rows(self.path / MONTH_DIR / f"{month}.i32", start, np.asarray(rows))
+        for label, rows in topics.items():
+            _append_rows(self.path / TOPIC_DIR / f"{label}.i32", start, np.asarray(rows))
+
+        self.count = start + len(records)
+        self._write_info()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def _since_rows(self, since: str | dt.date) -> np.ndarray:
+        day = to_day(since)
+        if day < 0:
+            raise ValueError(f"since 날짜 형식이 올바르지 않습니다: {since!r} (YYYY-MM-DD)")
+        first_month = _month_of(day)
+        month_dir = self.path / MONTH_DIR
+        names = sorted(p.stem for p in month_dir.glob("*.i32")) if month_dir.exists() else []
+        parts = []
+        for month in names:
+            if month < first_month:
+                continue
+            rows = _read_rows(month_dir / f"{month}.i32", self.count)
+            if month == first_month:
+                days = np.memmap(self.path / DAYS_FILE, dtype=np.int32, mode="r", shape=(self.count,))
+                rows = rows[days[rows] >= day]
+            parts.append(rows)
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts)).astype(np.int64)
+
+    def _topic_rows(self, labels: list[str]) -> np.ndarray:
+        parts = [_read_rows(self.path / TOPIC_DIR / f"{label}.i32", self.count) for label in labels]
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        if len(parts) == 1:
+            return np.asarray(parts[0], dtype=np.int64)
+        return np.unique(np.concatenate(parts)).astype(np.int64)
+
+    def select(self, since: str | dt.date | None = None, topic: str | None = None) -> np.ndarray | None:
+        """
+        조건을 만족하는 행 번호
+
+        Args:
+            since: 이 날짜(포함) 이후 기사만. 날짜 없는 기사는 제외
+            topic: 주제 라벨 또는 자유 문장 (resolve_topic으로 라벨 변환).
+                어떤 라벨에도 해당하지 않으면 주제 조건은 적용하지 않음
+
+        Returns:
+            정렬된 행 번호 배열 (int64), 조건이 하나도 적용되지 않으면 None
+        """
+        selected: np.ndarray | None = None
+        if since is not None:
+            selected = self._since_rows(since)
+        if topic:
+            labels = resolve_topic(topic)
+            if labels:
+                rows = self._topic_rows(labels)
+                selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+        return selected
@@ -0,0 +1,336 @@
+# HNSW 근사 최근접 이웃 그래프 (순수 Python + NumPy)
+# 전수 스캔이 느려지는 수백만 청크 규모에서 search_vector를 대체
+#
+# 저장 구조:
+#   hnsw/meta.json               # {"M", "ef_construction", "count", "entry", "max_level", "seed", "dir"}
+#   hnsw/g000001/layer0.npy      # (count, 2M) int32 level-0 이웃 (-1 패딩), mmap으로 열림
+#   hnsw/g000001/levels.npy      # (count,) int8 노드별 최고 레벨
+#   hnsw/g000001/upper.npz       # 레벨 l >= 1: nodes_<l> (정렬된 노드 번호), nbrs_<l> (len, M) 이웃
+#
+# save()는 매번 새 세대 디렉터리에 쓰고 meta.json을 os.replace로 교체하므로,
+# 이전 세대를 mmap 중인 검색 프로세스는 파일이 바뀌는 도중의 상태를 보지 않음.
+# 직전 세대 하나는 남겨 두고 그보다 오래된 세대만 지움 (ngram 세그먼트와 같은 방식).
+#
+# 벡터 자체는 NewsIndex의 float32 memmap을 그대로 참조 (거리 = 1 - 내적)
+# add()는 그래프에 없는 행만 삽입하므로 증분 수집 후 델타만큼만 구축 시간이 걸림
+#
+# 구축 속도: 순수 Python 구현이라 삽입 1건에 약 5ms (M=16, ef_construction=100, 256차원 기준).
+# 100만 행 초기 구축은 1~2시간이 걸리므로 수집 직후가 아니라 별도 배치(--hnsw)로 돌리고,
+# 그 이후에는 일일 델타만 add()로 보충하는 것을 전제로 함.
+
+import heapq
+import json
+import math
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+META_FILE = "meta.json"
+LAYER0_FILE = "layer0.npy"
+LEVELS_FILE = "levels.npy"
+UPPER_FILE = "upper.npz"
+GENERATION_PREFIX = "g"
+
+
+class HNSWGraph:
+    """
+    Hierarchical Navigable Small World 그래프
+
+    Args:
+        vectors: (n, dim) L2 정규화된 벡터 (memmap 가능)
+        M: 레벨 1 이상에서 노드당 이웃 수 (레벨 0은 2M)
+        ef_construction: 삽입 시 후보 탐색 폭
+        seed: 레벨 추첨 시드
+    """
+
+    def __init__(self, vectors: np.ndarray, M: int = 16, ef_construction: int = 100, seed: int = 0):
+        self.vectors = vectors
+        self.M = M
+        self.M0 = 2 * M
+        self.ef_construction = ef_construction
+        self.seed = seed
+        self._ml = 1.0 / math.log(M)
+        self._rng = np.random.default_rng(seed)
+        self.count = 0
+        self.entry = -1
+        self.max_level = -1
+        self.levels = np.empty(0, dtype=np.int8)
+        self.layer0 = np.empty((0, self.M0), dtype=np.int32)
+        self.upper: dict[int, dict[int, np.ndarray]] = {}
+
+    # ------------------------------------------------------------------
+    # 이웃 접근
+    # ------------------------------------------------------------------
+
+    def _neighbors(self, node: int, level: int) -> np.ndarray:
+        if level == 0:
+            nbrs = self.layer0[node]
+        else:
+            nbrs = self.upper.get(level, {}).get(node)
+            if nbrs is None:
+                return np.empty(0, dtype=np.int32)
+        return nbrs[nbrs >= 0]
+
+    def _set_neighbors(self, node: int, level: int, nbrs: np.ndarray) -> None:
+        width = self.M0 if level == 0 else self.M
+        row = np.full(width, -1, dtype=np.int32)
+        row[:len(nbrs)] = nbrs[:width]
+        if level == 0:
+            self.layer0[node] = row
+        else:
+            self.upper.setdefault(level, {})[node] = row
+
+    def _distances(self, q: np.ndarray, nodes: np.ndarray | list[int]) -> np.ndarray:
+        idx = np.asarray(nodes, dtype=np.int64)
+        return 1.0 - self.vectors[idx] @ q
+
+    # ------------------------------------------------------------------
+    # 탐색
+    # ------------------------------------------------------------------
+
+    def _search_layer(self, q: np.ndarray, entry_points: list[int], ef: int, level: int) -> list[tuple[float, int]]:
+        """한 레벨에서 ef 폭 beam search → (거리, 노드) 오름차순"""
+        visited = set(entry_points)
+        dists = self._distances(q, entry_points)
+        candidates = [(float(d), n) for d, n in zip(dists, entry_points)]
+        heapq.heapify(candidates)
+        results = [(-d, n) for d, n in candidates]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            dist, node = heapq.heappop(candidates)
+            if len(results) >= ef and dist > -results[0][0]:
+                break
+            nbrs = [n for n in self._neighbors(node, level).tolist() if n not in visited]
+            if not nbrs:
+                continue
+            visited.update(nbrs)
+            for n, d in zip(nbrs, self._distances(q, nbrs)):
+                d = float(d)
+                if len(results) < ef or d < -results[0][0]:
+                    heapq.heappush(candidates, (d, n))
+                    heapq.heappush(results, (-d, n))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        return sorted((-d, n) for d, n in results)
+
+    def search(self, q: np.ndarray, top_k: int, ef: int = 64) -> tuple[np.ndarray, np.ndarray]:
+        """
+        근사 top_k 검색
+
+        Args:
+            q: (dim,) 쿼리 벡터
+            top_k: 반환 개수
+            ef: level-0 탐색 폭 (클수록 recall↑, 지연↑)
+
+        Returns:
+            (행 번호 배열, 내적 점수 배열) - 점수 내림차순
+        """
+        if self.count == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        q = np.asarray(q, dtype=np.float32)
+        ep = [self.entry]
+        for level in range(self.max_level, 0, -1):
+            ep = [self._search_layer(q, ep, 1, level)[0][1]]
+        found = self._search_layer(q, ep, max(ef, top_k), 0)[:top_k]
+        rows = np.fromiter((n for _, n in found), dtype=np.int64, count=len(found))
+        scores = np.fromiter((1.0 - d for d, _ in found), dtype=np.float32, count=len(found))
+        return rows, scores
+
+    # ------------------------------------------------------------------
+    # 구축
+    # ------------------------------------------------------------------
+
+    def _select(self, q_node: int, nodes: np.ndarray, dists: np.ndarray, width: int) -> np.ndarray:
+        """
+        이웃 선택 휴리스틱 (HNSW 논문 Algorithm 4)
+
+        후보를 가까운 순으로 보며, 이미 고른 이웃보다 자신에게 더 가까운 후보만 채택해
+        한쪽 군집으로 몰리지 않게 합니다. 모자라면 남은 후보로 채웁니다.
+        후보끼리의 유사도는 Gram 행렬 한 번으로 계산하고, 이웃을 고를 때마다
+        그 이웃에 더 가까운 후보를 마스크로 한꺼번에 제외합니다.
+
+        Args:
+            nodes, dists: 거리 오름차순으로 정렬된 후보 노드와 q_node까지의 거리
+        """
+        keep = nodes != q_node
+        nodes, dists = nodes[keep], dists[keep]
+        if len(nodes) <= width:
+            return nodes.astype(np.int32)
+        vecs = self.vectors[nodes.astype(np.int64)]
+        gram = vecs @ vecs.T
+        dominated = np.zeros(len(nodes), dtype=bool)
+        selected: list[int] = []
+        for i in range(len(nodes)):
+            if dominated[i]:
+                continue
+            selected.append(i)
+            if len(selected) >= width:
+                break
+            dominated[i + 1:] |= (1.0 - gram[i, i + 1:]) < dists[i + 1:]
+        if len(selected) < width:
+            chosen = np.zeros(len(nodes), dtype=bool)
+            chosen[selected] = True
+            selected.extend(np.flatnonzero(~chosen)[:width - len(selected)].tolist())
+        return nodes[selected].astype(np.int32)
+
+    def _grow(self, n: int) -> None:
+        if n <= len(self.layer0):
+            return
+        cap = max(n, 2 * len(self.layer0), 1024)
+        layer0 = np.full((cap, self.M0), -1, dtype=np.int32)
+        layer0[:len(self.layer0)] = self.layer0
+        levels = np.zeros(cap, dtype=np.int8)
+        levels[:len(self.levels)] = self.levels
+        self.layer0, self.levels = layer0, levels
+
+    def _insert(self, node: int) -> None:
+        level = min(int(-math.log(1.0 - self._rng.random()) * self._ml), 126)
+        self.levels[node] = level
+        q = np.asarray(self.vectors[node], dtype=np.float32)
+        if self.entry < 0:
+            self.entry, self.max_level = node, level
+            return
+
+        ep = [self.entry]
+        for lv in range(self.max_level, level, -1):
+            ep = [self._search_layer(q, ep, 1, lv)[0][1]]
+
+        for lv in range(min(level, self.max_level), -1, -1):
+            width = self.M0 if lv == 0 else self.M
+            found = self._search_layer(q, ep, self.ef_construction, lv)
+            found_nodes = np.fromiter((n for _, n in found), dtype=np.int32, count=len(found))
+            found_dists = np.fromiter((d for d, _ in found), dtype=np.float32, count=len(found))
+            nbrs = self._select(node, found_nodes, found_dists, width)
+            self._set_neighbors(node, lv, nbrs)
+            for n in nbrs.tolist():
+                current = self._neighbors(n, lv)
+                pool = np.append(current, node).astype(np.int32)
+                if len(current) < width:
+                    self._set_neighbors(n, lv, pool)
+                else:
+                    dists = 1.0 - self.vectors[pool.astype(np.int64)] @ self.vectors[n]
+                    order = np.argsort(dists)
+                    self._set_neighbors(n, lv, self._select(n, pool[order], dists[order], width))
+            ep = found_nodes.tolist()
+
+        if level > self.max_level:
+            self.entry, self.max_level = node, level
+
+    def add(self, end: int) -> int:
+        """
+        vectors[count:end] 행을 그래프에 삽입
+
+        Returns:
+            삽입한 노드 수
+        """
+        start = self.count
+        self._grow(end)
+        for node in range(start, end):
+            self._insert(node)
+            self.count = node + 1
+        return end - start
+
+    # ------------------------------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------------------------------
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        새 세대 디렉터리에 그래프를 쓰고 meta.json을 원자적으로 교체
+
+        기존 세대의 파일은 건드리지 않으므로 mmap으로 열어 둔 검색 프로세스는
+        reload 전까지 이전 그래프를 그대로 읽습니다.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        previous = _read_meta(path)
+        generation = int(previous.get("generation", 0)) + 1 if previous else 1
+        gen_name = f"{GENERATION_PREFIX}{generation:06d}"
+        gen_dir = path / gen_name
+        if gen_dir.exists():
+            shutil.rmtree(gen_dir)
+        gen_dir.mkdir()
+
+        np.save(gen_dir / LAYER0_FILE, np.ascontiguousarray(self.layer0[:self.count]))
+        np.save(gen_dir / LEVELS_FILE, np.ascontiguousarray(self.levels[:self.count]))
+        arrays: dict[str, np.ndarray] = {}
+        for level, table in self.upper.items():
+            nodes = np.asarray(sorted(table), dtype=np.int32)
+            arrays[f"nodes_{level}"] = nodes
+            arrays[f"nbrs_{level}"] = np.stack([table[int(n)] for n in nodes]) if len(nodes) else np.empty((0, self.M), dtype=np.int32)
+        np.savez(gen_dir / UPPER_FILE, **arrays)
+        meta = {
+            "M": self.M,
+            "ef_construction": self.ef_construction,
+            "count": self.count,
+            "entry": self.entry,
+            "max_level": self.max_level,
+            "seed": self.seed,
+            "generation": generation,
+            "dir": gen_name,
+        }
+        tmp = path / (META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, path / META_FILE)
+
+        # 직전 세대(지금 검색 중일 수 있음)만 남기고 정리
+        keep = {gen_name, previous.get("dir", "")} if previous else {gen_name}
+        for child in path.iterdir():
+            if child.is_dir() and child.name.startswith(GENERATION_PREFIX) and child.name not in keep:
+                shutil.rmtree(child, ignore_errors=True)
+        if previous and previous.get("dir"):
+            # 세대 디렉터리 도입 전 루트에 있던 파일은 한 세대가 더 지난 뒤에 정리
+            for name in (LAYER0_FILE, LEVELS_FILE, UPPER_FILE):
+                (path / name).unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike, vectors: np.ndarray, writable: bool = False) -> "HNSWGraph":
+        """
+        저장된 그래프 로드
+
+        Args:
+            writable: True면 layer0을 메모리로 읽어 add() 가능, False면 mmap (검색 전용)
+        """
+        path = Path(path)
+        meta = _read_meta(path)
+        if meta is None:
+            raise FileNotFoundError(path / META_FILE)
+        # "dir"이 없으면 세대 디렉터리 도입 전 형식 (루트에 직접 저장)
+        data_dir = path / meta.get("dir", "")
+        graph = cls(vectors, M=meta["M"], ef_construction=meta["ef_construction"], seed=meta["seed"])
+        graph.count = int(meta["count"])
+        graph.entry = int(meta["entry"])
+        graph.max_level = int(meta["max_level"])
+        mmap_mode = None if writable else "r"
+        graph.layer0 = np.load(data_dir / LAYER0_FILE, mmap_mode=mmap_mode)
+        graph.levels = np.load(data_dir / LEVELS_FILE, mmap_mode=mmap_mode)
+        with np.load(data_dir / UPPER_FILE) as upper:
+            for level in range(1, graph.max_level + 1):
+                if f"nodes_{level}" not in upper.files:
+                    continue
+                nodes = upper[f"nodes_{level}"]
+                nbrs = upper[f"nbrs_{level}"]
+                graph.upper[level] = {int(n): nbrs[i] for i, n in enumerate(nodes)}
+        # 삽입을 이어갈 때 레벨 추첨이 처음과 겹치지 않도록 시드에 count를 섞음
+        graph._rng = np.random.default_rng([graph.seed, graph.count])
+        return graph
+
+    @staticmethod
+    def exists(path: str | os.PathLike) -> bool:
+        return (Path(path) / META_FILE).exists()
+
+
+def _read_meta(path: Path) -> dict[str, Any] | None:
+    try:
+        with open(path / META_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,319 @@
+# 매일경제 뉴스 수집 파이프라인
+# 원본 기사 덤프(JSONL/CSV) → 정규화 → 중복 제거 → 청크 분할 → 배치 임베딩 → 인덱스 추가
+#
+# 모든 단계가 제너레이터로 연결되어 메모리 사용량은 FLUSH_ROWS 청크분으로 제한됨.
+# 중복 필터 상태는 인덱스 디렉터리의 dedup.sqlite에 남으므로,
+# 일일 증분 파일만 넣어 다시 실행하면 델타 크기에 비례하는 시간만 걸림.
+#
+# 사용법:
+#   python -m llm.tools.news_index.ingest dumps/mk_2024.jsonl dumps/mk_2025.csv
+#   python -m llm.tools.news_index.ingest dumps/mk_20260101.jsonl --compact
+#   python -m llm.tools.news_index.ingest dumps/mk_20260102.jsonl --hnsw  # 수집 후 HNSW 그래프 보충
+
+import argparse
+import csv
+import hashlib
+import html
+import json
+import re
+import sys
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+from .config import INDEX_DIR
+from .dedup import NearDuplicateFilter
+from .store import NewsIndex
+
+
+# 청크 최대 길이 (문자 수) / 인접 청크 간 겹치는 문장 수
+CHUNK_MAX_CHARS = 400
+CHUNK_OVERLAP_SENTENCES = 1
+
+# 한 번에 임베딩할 청크 수 / 인덱스에 한 번에 추가할 청크 수 (= BM25 세그먼트 크기)
+EMBED_BATCH = 256
+FLUSH_ROWS = 20000
+
+DEDUP_FILE = "dedup.sqlite"
+
+# 덤프마다 다른 컬럼명을 표준 필드로 매핑
+_FIELD_ALIASES = {
+    "headline": ("headline", "title", "제목"),
+    "body": ("body", "content", "text", "article", "본문"),
+    "date": ("date", "published", "published_at", "pub_date", "작성일", "날짜"),
+    "url": ("url", "link", "URL"),
+    "source": ("source", "press", "언론사"),
+}
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SENTENCE_RE = re.compile(r"[^.!?。]+[.!?。]?")
+_DATE_RE = re.compile(r"(\d{4})[-./년\s]*(\d{1,2})[-./월\s]*(\d{1,2})")
+
+
+@dataclass
+class IngestStats:
+    """수집 결과 집계"""
+    articles_read: int = 0
+    articles_skipped: int = 0     # 본문 없음 등
+    duplicates: int = 0           # 정확/근접 중복
+    articles_indexed: int = 0
+    chunks_indexed: int = 0
+    seconds: float = 0.0
+
+
+# ============================================================================
+# 1. 읽기
+# ============================================================================
+
+def read_articles(path: str | Path) -> Iterator[dict[str, Any]]:
+    """
+    기사 덤프를 한 건씩 읽는 제너레이터 (.jsonl / .csv)
+
+    파일 전체를 메모리에 올리지 않고 한 줄(한 행)씩 반환합니다.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        csv.field_size_limit(sys.maxsize)
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            yield from csv.DictReader(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def _pick(raw: dict[str, Any], field: str) -> str:
+    for name in _FIELD_ALIASES[field]:
+        value = raw.get(name)
+        if value:
+            return str(value)
+    return ""
+
+
+def _normalize_date(value: str) -> str | None:
+    """다양한 날짜 표기 → "YYYY-MM-DD" (파싱 실패 시 None)"""
+    m = _DATE_RE.search(value or "")
+    if not m:
+        return None
+    year, month, day = (int(g) for g in m.groups())
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return None
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def _clean(text: str) -> str:
+    """HTML 태그/엔티티 제거 + NFKC + 공백 정리 (대소문자는 유지)"""
+    text = html.unescape(_TAG_RE.sub(" ", text or ""))
+    text = unicodedata.normalize("NFKC", text)
+    return " ".join(text.split())
+
+
+# ============================================================================
+# 2. 정규화 / 청크 분할
+# ============================================================================
+
+def normalize_article(raw: dict[str, Any], default_source: str = "매일경제") -> dict[str, Any] | None:
+    """
+    원본 행을 표준 기사 dict로 변환
+
+    Returns:
+        { "key", "headline", "body", "date", "url", "source" }, 본문이 없으면 None
+    """
+    headline = _clean(_pick(raw, "headline"))
+    body = _clean(_pick(raw, "body"))
+    if not body:
+        return None
+    date = _normalize_date(_pick(raw, "date"))
+    url = _pick(raw, "url").strip()
+    key = url or hashlib.sha1(f"{headline}|{date}".encode("utf-8")).hexdigest()
+    return {
+        "key": key,
+        "headline": headline,
+        "body": body,
+        "date": date,
+        "url": url or None,
+        "source": _clean(_pick(raw, "source")) or default_source,
+    }
+
+
+def chunk_text(text: str, max_chars: int = CHUNK_MAX_CHARS, overlap: int = CHUNK_OVERLAP_SENTENCES) -> list[str]:
+    """
+    문장 경계 기준으로 max_chars 이하 청크로 분할 (인접 청크는 overlap 문장 공유)
+
+    한 문장이 max_chars보다 길면 그 문장만 글자 수로 자릅니다.
+    """
+    sentences = []
+    for s in _SENTENCE_RE.findall(text):
+        s = s.strip()
+        while len(s) > max_chars:
+            sentences.append(s[:max_chars])
+            s = s[max_chars:]
+        if s:
+            sentences.append(s)
+
+    chunks = []
+    current: list[str] = []
+    length = 0
+    for s in sentences:
+        if current and length + len(s) + 1 > max_chars:
+            chunks.append(" ".join(current))
+            current = current[-overlap:] if overlap else []
+            length = sum(len(c) + 1 for c in current)
+            if length + len(s) + 1 > max_chars:
+                current, length = [], 0
+        current.append(s)
+        length += len(s) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def iter_chunks(article: dict[str, Any]) -> Iterator[tuple[str, dict[str, Any]]]:
+    """기사 → (임베딩 텍스트, 인덱스 메타데이터) 청크 목록"""
+    for i, chunk in enumerate(chunk_text(article["body"])):
+        record = {
+            "headline": article["headline"],
+            "snippet": chunk,
+            "source": article["source"],
+            "date": article["date"],
+            "url": article["url"],
+            "article_key": article["key"],
+            "chunk": i,
+        }
+        yield f"{article['headline']} {chunk}", record
+
+
+# ============================================================================
+# 3. 파이프라인
+# ============================================================================
+
+def ingest(
+    paths: Iterable[str | Path],
+    index_dir: str | Path = INDEX_DIR,
+    *,
+    embed_batch: int = EMBED_BATCH,
+    flush_rows: int = FLUSH_ROWS,
+) -> IngestStats:
+    """
+    기사 덤프들을 인덱스에 증분 추가
+
+    Args:
+        paths: JSONL/CSV 덤프 경로 목록
+        index_dir: 인덱스 디렉터리 (없으면 생성)
+        embed_batch: 임베딩 배치 크기
+        flush_rows: 인덱스 append 단위 (메모리 상한 = flush_rows x dim x 4 bytes)
+
+    Returns:
+        IngestStats
+    """
+    started = time.perf_counter()
+    index_dir = Path(index_dir)
+    index = NewsIndex.open(index_dir) if NewsIndex.exists(index_dir) else NewsIndex.create(index_dir)
+    # 역색인/facet 도입 전에 만든 인덱스면 먼저 백필해야 새 행도 이어서 기록됨
+    # (append는 색인이 기존 행을 모두 덮고 있을 때만 새 행을 추가 색인)
+    index.build_ngram_index()
+    index.build_facets()
+    dedup = NearDuplicateFilter(index_dir / DEDUP_FILE)
+    embedder = index.embedder
+    stats = IngestStats()
+
+    def unique_articles() -> Iterator[dict[str, Any]]:
+        for path in paths:
+            for raw in read_articles(path):
+                stats.articles_read += 1
+                article = normalize_article(raw)
+                if article is None:
+                    stats.articles_skipped += 1
+                    continue
+                is_dup, sig = dedup.check(article["key"], article["body"])
+                if is_dup:
+                    stats.duplicates += 1
+                    continue
+                dedup.add(article["key"], sig)
+                stats.articles_indexed += 1
+                yield article
+
+    pending_texts: list[str] = []
+    pending_vecs: list[np.ndarray] = []
+    pending_records: list[dict[str, Any]] = []
+
+    def embed_pending() -> None:
+        if pending_texts:
+            pending_vecs.append(embedder.embed(pending_texts))
+            pending_texts.clear()
+
+    def flush() -> None:
+        embed_pending()
+        if not pending_records:
+            return
+        index.append(np.concatenate(pending_vecs), pending_records)
+        # 인덱스에 반영된 뒤에만 중복 필터 상태를 확정
+        dedup.commit()
+        stats.chunks_indexed += len(pending_records)
+        pending_vecs.clear()
+        pending_records.clear()
+
+    try:
+        for article in unique_articles():
+            for text, record in iter_chunks(article):
+                pending_texts.append(text)
+                pending_records.append(record)
+                if len(pending_texts) >= embed_batch:
+                    embed_pending()
+            # 기사 경계에서만 flush → 확정된 중복 필터 상태에는 청크가 모두 색인된 기사만 남음
+            if len(pending_records) >= flush_rows:
+                flush()
+        flush()
+        # 수집 중 역색인이 끊긴 경우(다른 프로세스의 append 등)에도 새 행이 BM25 검색에서 빠지지 않도록 보충
+        index.build_ngram_index()
+    except BaseException:
+        # 색인되지 못한 기사는 "본 적 있음"으로 남기지 않음 (재실행 시 다시 수집)
+        dedup.rollback()
+        raise
+    finally:
+        dedup.close()
+        index.close()
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def main():
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="매일경제 뉴스 덤프를 검색 인덱스에 추가합니다.")
+    parser.add_argument("paths", nargs="*", help="JSONL/CSV 기사 덤프 경로 (생략 시 --compact/--hnsw만 실행)")
+    parser.add_argument("--index-dir", default=str(INDEX_DIR), help="인덱스 디렉터리")
+    parser.add_argument("--compact", action="store_true", help="수집 후 BM25 세그먼트를 하나로 병합")
+    parser.add_argument("--hnsw", action="store_true", help="수집 후 HNSW 그래프에 새 행 삽입 (없으면 새로 구축)")
+    args = parser.parse_args()
+    if not args.paths and not (args.compact or args.hnsw):
+        parser.error("덤프 경로 또는 --compact/--hnsw 중 하나가 필요합니다.")
+
+    if args.paths:
+        stats = ingest(args.paths, args.index_dir)
+        print(f"📥 읽은 기사: {stats.articles_read}")
+        print(f"   - 본문 없음: {stats.articles_skipped}")
+        print(f"   - 중복 제거: {stats.duplicates}")
+        print(f"   - 색인 기사: {stats.articles_indexed} (청크 {stats.chunks_indexed}개)")
+        print(f"⏱️  {stats.seconds:.1f}s")
+
+    if args.compact:
+        index = NewsIndex.open(args.index_dir)
+        index.ngram.compact()
+        print(f"🗜️  BM25 세그먼트 병합 완료 ({index.ngram.doc_count}행)")
+
+    if args.hnsw:
+        index = NewsIndex.open(args.index_dir)
+        started = time.perf_counter()
+        added = index.build_hnsw(progress=lambda done, total: print(f"   HNSW {done}/{total}", flush=True))
+        print(f"🕸️  HNSW 그래프: {added}행 삽입 ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
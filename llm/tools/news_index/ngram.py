@@ -0,0 +1,276 @@
+# 한국어 음절 n-gram 역색인 + BM25
+# "검찰 사칭", "카드사 정보 유출"처럼 기관명이 핵심인 짧은 키워드 쿼리를 정확히 잡기 위한 lexical 검색
+#
+# 저장 구조 (세그먼트 단위, 모두 np.load(mmap_mode="r")로 즉시 열림):
+#   bm25/segments.json          # [{"name", "start", "count", "total_len"}, ...]
+#   bm25/<name>/terms.npy       # 정렬된 term 해시 (uint64)
+#   bm25/<name>/offsets.npy     # term별 postings 시작 위치 (int64, len(terms)+1)
+#   bm25/<name>/docs.npy        # postings 문서 번호 (int32, 전역 행 번호)
+#   bm25/<name>/tfs.npy         # postings term 빈도 (uint16)
+#   bm25/<name>/doc_len.npy     # 세그먼트 내 문서 길이 (int32)
+#
+# 문자열 사전 대신 64bit 해시를 정렬 배열로 저장하므로 사전을 메모리에 올릴 필요가 없고
+# term 조회는 searchsorted(O(log V))로 끝남.
+# 인덱스에 행이 추가될 때마다 새 세그먼트가 생기며, 기존 세그먼트는 수정하지 않음 (compact()로 병합).
+
+import hashlib
+import json
+import math
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+from .embedding import char_ngrams, tokenize
+
+
+SEGMENTS_FILE = "segments.json"
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 전체 문서의 이 비율 이상에 등장하는 term은 검색 시 무시 (idf≈0, postings만 길어짐)
+MAX_DF_RATIO = 0.5
+
+
+def term_hash(term: str) -> int:
+    """n-gram 문자열 → uint64 해시"""
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def text_terms(text: str, sizes: Iterable[int] = (2, 3)) -> list[str]:
+    """BM25용 term 목록: 음절 bigram/trigram + 1음절 어절"""
+    terms = []
+    for token in tokenize(text):
+        grams = char_ngrams(token, sizes)
+        terms.extend(grams if grams else [token])
+    return terms
+
+
+class _Segment:
+    """한 번의 append로 만들어진 읽기 전용 postings 묶음"""
+
+    def __init__(self, path: Path, info: dict[str, Any]):
+        self.name = info["name"]
+        self.start = int(info["start"])
+        self.count = int(info["count"])
+        self.total_len = int(info["total_len"])
+        self.terms = np.load(path / "terms.npy", mmap_mode="r")
+        self.offsets = np.load(path / "offsets.npy", mmap_mode="r")
+        self.docs = np.load(path / "docs.npy", mmap_mode="r")
+        self.tfs = np.load(path / "tfs.npy", mmap_mode="r")
+        self.doc_len = np.load(path / "doc_len.npy", mmap_mode="r")
+
+    def lookup(self, h: np.uint64) -> tuple[np.ndarray, np.ndarray]:
+        """term 해시의 (문서 번호, tf) postings. 없으면 빈 배열"""
+        i = int(np.searchsorted(self.terms, h))
+        if i >= len(self.terms) or self.terms[i] != h:
+            return self.docs[:0], self.tfs[:0]
+        lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self.docs[lo:hi], self.tfs[lo:hi]
+
+
+class NgramIndex:
+    """
+    세그먼트 기반 BM25 역색인
+
+    - add_documents(): 새 행들로 세그먼트 하나를 만들어 디스크에 기록
+    - search(): 쿼리 n-gram의 postings만 읽어 BM25 점수 누적 (전수 스캔 없음)
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self.segments: list[_Segment] = []
+        self._load()
+
+    def _load(self) -> None:
+        seg_file = self.path / SEGMENTS_FILE
+        if not seg_file.exists():
+            self.segments = []
+            return
+        with open(seg_file, encoding="utf-8") as f:
+            infos = json.load(f)
+        self.segments = [_Segment(self.path / info["name"], info) for info in infos]
+
+    def reload(self) -> None:
+        self._load()
+
+    @property
+    def doc_count(self) -> int:
+        return sum(s.count for s in self.segments)
+
+    @property
+    def avg_doc_len(self) -> float:
+        n = self.doc_count
+        return sum(s.total_len for s in self.segments) / n if n else 0.0
+
+    @property
+    def covered_rows(self) -> int:
+        """역색인에 포함된 마지막 행 번호 + 1"""
+        return max((s.start + s.count for s in self.segments), default=0)
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+
+    def add_documents(self, start: int, texts: list[str]) -> None:
+        """
+        전역 행 번호 start부터 시작하는 문서들로 새 세그먼트 생성
+
+        Args:
+            start: 첫 문서의 전역 행 번호 (NewsIndex 행 번호와 동일)
+            texts: 문서 텍스트 목록
+        """
+        if not texts:
+            return
+        postings: dict[int, list[tuple[int, int]]] = {}
+        doc_len = np.zeros(len(texts), dtype=np.int32)
+        for i, text in enumerate(texts):
+            terms = text_terms(text)
+            doc_len[i] = len(terms)
+            counts: dict[str, int] = {}
+            for t in terms:
+                counts[t] = counts.get(t, 0) + 1
+            for t, tf in counts.items():
+                postings.setdefault(term_hash(t), []).append((start + i, min(tf, 65535)))
+
+        hashes = np.fromiter(postings.keys(), dtype=np.uint64, count=len(postings))
+        order = np.argsort(hashes)
+        hashes = hashes[order]
+        keys = list(postings.keys())
+        lists = [postings[keys[j]] for j in order]
+        offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(p) for p in lists])
+        flat = [pair for p in lists for pair in p]
+        docs = np.fromiter((d for d, _ in flat), dtype=np.int32, count=len(flat))
+        tfs = np.fromiter((tf for _, tf in flat), dtype=np.uint16, count=len(flat))
+
+        infos = self._read_infos()
+        info = self._write_segment(infos, start, hashes, offsets, docs, tfs, doc_len)
+        self._write_infos(infos + [info])
+        self._load()
+
+    def _read_infos(self) -> list[dict[str, Any]]:
+        seg_file = self.path / SEGMENTS_FILE
+        if not seg_file.exists():
+            return []
+        with open(seg_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_infos(self, infos: list[dict[str, Any]]) -> None:
+        seg_file = self.path / SEGMENTS_FILE
+        tmp = seg_file.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(infos, f, indent=2)
+        os.replace(tmp, seg_file)
+
+    def _write_segment(
+        self,
+        infos: list[dict[str, Any]],
+        start: int,
+        hashes: np.ndarray,
+        offsets: np.ndarray,
+        docs: np.ndarray,
+        tfs: np.ndarray,
+        doc_len: np.ndarray,
+    ) -> dict[str, Any]:
+        """세그먼트 파일 기록 후 segments.json 항목 반환 (이름은 기존 최대 번호 + 1)"""
+        name = f"{max((int(i['name']) for i in infos), default=-1) + 1:06d}"
+        seg_path = self.path / name
+        seg_path.mkdir(parents=True, exist_ok=True)
+        np.save(seg_path / "terms.npy", hashes)
+        np.save(seg_path / "offsets.npy", offsets)
+        np.save(seg_path / "docs.npy", docs)
+        np.save(seg_path / "tfs.npy", tfs)
+        np.save(seg_path / "doc_len.npy", doc_len)
+        return {"name": name, "start": start, "count": len(doc_len), "total_len": int(doc_len.sum())}
+
+    def compact(self) -> None:
+        """
+        모든 세그먼트를 하나로 병합
+
+        일일 증분 수집이 쌓이면 세그먼트 수만큼 term 조회가 늘어나므로 주기적으로 실행합니다.
+        postings를 (term 해시, 문서 번호) 순으로 한 번에 정렬하는 O(전체 postings) 작업입니다.
+        """
+        if len(self.segments) <= 1:
+            return
+        segs = sorted(self.segments, key=lambda s: s.start)
+        all_hashes = np.concatenate([np.repeat(np.asarray(s.terms), np.diff(s.offsets)) for s in segs])
+        all_docs = np.concatenate([np.asarray(s.docs) for s in segs])
+        all_tfs = np.concatenate([np.asarray(s.tfs) for s in segs])
+        doc_len = np.concatenate([np.asarray(s.doc_len) for s in segs])
+
+        order = np.lexsort((all_docs, all_hashes))
+        all_hashes, all_docs, all_tfs = all_hashes[order], all_docs[order], all_tfs[order]
+        hashes, counts = np.unique(all_hashes, return_counts=True)
+        offsets = np.zeros(len(hashes) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+
+        old = self._read_infos()
+        info = self._write_segment(old, segs[0].start, hashes, offsets, all_docs, all_tfs, doc_len)
+        self._write_infos([info])
+        self._load()
+        # 이미 열린 memmap은 POSIX에서 삭제 후에도 유효, 실패 시 다음 compact에서 무시됨
+        for i in old:
+            shutil.rmtree(self.path / i["name"], ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, top_k: int = 100, allowed: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        BM25 top_k 검색
+
+        Args:
+            query: 검색 쿼리
+            top_k: 반환할 후보 수
+            allowed: 선택. 전역 행 번호로 인덱싱하는 bool 마스크 (False인 행은 점수 누적 전에 제외, idf는 전체 기준)
+
+        Returns:
+            (행 번호 배열, BM25 점수 배열) - 점수 내림차순, 일치 term이 없으면 빈 배열
+        """
+        n = self.doc_count
+        if n == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        avgdl = self.avg_doc_len or 1.0
+
+        qterms: dict[int, int] = {}
+        for t in text_terms(query):
+            h = term_hash(t)
+            qterms[h] = qterms.get(h, 0) + 1
+
+        doc_parts = []
+        score_parts = []
+        for h, qtf in qterms.items():
+            h = np.uint64(h)
+            per_seg = [(seg, *seg.lookup(h)) for seg in self.segments]
+            df = sum(len(d) for _, d, _ in per_seg)
+            if df == 0 or df > MAX_DF_RATIO * n:
+                continue
+            idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            for seg, docs, tfs in per_seg:
+                if allowed is not None and len(docs):
+                    keep = allowed[docs]
+                    docs, tfs = docs[keep], tfs[keep]
+                if len(docs) == 0:
+                    continue
+                tf = tfs.astype(np.float32)
+                dl = seg.doc_len[docs - seg.start].astype(np.float32)
+                denom = tf + BM25_K1 * (1.0 - BM25_B + BM25_B * dl / avgdl)
+                doc_parts.append(np.asarray(docs, dtype=np.int64))
+                score_parts.append(qtf * idf * tf * (BM25_K1 + 1.0) / denom)
+
+        if not doc_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        uniq, inverse = np.unique(np.concatenate(doc_parts), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(score_parts)).astype(np.float32)
+        if top_k < len(totals):
+            best = np.argpartition(-totals, top_k - 1)[:top_k]
+        else:
+            best = np.arange(len(totals))
+        best = best[np.argsort(-totals[best], kind="stable")]
+        return uniq[best], totals[best]
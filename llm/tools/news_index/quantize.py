@@ -0,0 +1,102 @@
+# int8 양자화 구축 + recall/메모리 리포트
+#
+# 사용법:
+#   python -m llm.tools.news_index.quantize                 # vectors.i8 구축 후 리포트 출력
+#   python -m llm.tools.news_index.quantize --queries 500 --top-k 10
+
+import argparse
+import time
+
+import numpy as np
+
+from .config import INDEX_DIR, RERANK_CANDIDATES
+from .store import NewsIndex
+
+
+def recall_at_k(found: list[np.ndarray], truth: list[np.ndarray]) -> float:
+    """쿼리별 정답 top_k 중 찾은 비율의 평균"""
+    if not truth:
+        return 0.0
+    return float(np.mean([
+        len(np.intersect1d(f, t)) / len(t) if len(t) else 1.0
+        for f, t in zip(found, truth)
+    ]))
+
+
+def quantization_report(
+    index: NewsIndex,
+    num_queries: int = 200,
+    top_k: int = 10,
+    rerank_options: tuple[int, ...] = (0, RERANK_CANDIDATES),
+    seed: int = 0,
+) -> list[dict]:
+    """
+    float32 전수 스캔 대비 int8 스캔의 recall@k, 지연, 스캔 메모리 측정
+
+    쿼리는 인덱스 행을 무작위로 골라 작은 노이즈를 섞은 벡터를 사용합니다.
+
+    Returns:
+        설정별 { "mode", "rerank", "bytes_per_vector", "scan_bytes", "recall", "ms_per_query" }
+    """
+    if not index.quantized_ready:
+        raise ValueError("int8 파일이 없습니다. build_quantized()를 먼저 실행하세요.")
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(index), size=min(num_queries, len(index)))
+    queries = np.asarray(index.vectors[np.sort(rows)], dtype=np.float32)
+    queries += rng.normal(scale=0.05, size=queries.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    saved = index.quantization, index.rerank_candidates
+
+    def run(mode: str, rerank: int) -> tuple[list[np.ndarray], float]:
+        index.quantization, index.rerank_candidates = mode, rerank
+        started = time.perf_counter()
+        hits = index.search_vector_batch(queries, top_k)
+        elapsed = time.perf_counter() - started
+        return [r for r, _ in hits], elapsed * 1000 / len(queries)
+
+    truth, exact_ms = run("none", 0)
+    report = [{
+        "mode": "float32",
+        "rerank": 0,
+        "bytes_per_vector": index.dim * 4,
+        "scan_bytes": len(index) * index.dim * 4,
+        "recall": 1.0,
+        "ms_per_query": exact_ms,
+    }]
+    for rerank in rerank_options:
+        found, ms = run("int8", rerank)
+        report.append({
+            "mode": "int8",
+            "rerank": rerank,
+            "bytes_per_vector": index.dim + 4,
+            "scan_bytes": len(index) * (index.dim + 4),
+            "recall": recall_at_k(found, truth),
+            "ms_per_query": ms,
+        })
+    index.quantization, index.rerank_candidates = saved
+    return report
+
+
+def main():
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="뉴스 인덱스 int8 양자화 구축 및 recall/메모리 리포트")
+    parser.add_argument("--index-dir", default=str(INDEX_DIR), help="인덱스 디렉터리")
+    parser.add_argument("--queries", type=int, default=200, help="리포트용 쿼리 수")
+    parser.add_argument("--top-k", type=int, default=10, help="recall@k의 k")
+    args = parser.parse_args()
+
+    index = NewsIndex.open(args.index_dir)
+    added = index.build_quantized()
+    print(f"🗜️  int8 양자화: {added}행 추가 (전체 {len(index)}행, dim={index.dim})")
+
+    print(f"\n{'mode':<8} {'rerank':>6} {'B/vec':>6} {'scan MB':>9} {'recall@' + str(args.top_k):>10} {'ms/query':>9}")
+    for row in quantization_report(index, num_queries=args.queries, top_k=args.top_k):
+        print(
+            f"{row['mode']:<8} {row['rerank']:>6} {row['bytes_per_vector']:>6} "
+            f"{row['scan_bytes'] / 2**20:>9.1f} {row['recall']:>10.3f} {row['ms_per_query']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
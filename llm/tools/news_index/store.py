@@ -0,0 +1,710 @@
+# 디스크 기반 뉴스 벡터 인덱스
+# 임베딩은 memory-mapped NumPy 행렬, 메타데이터는 JSONL + 오프셋 테이블로 저장
+#
+# 디렉터리 구조:
+#   manifest.json  # 형식 버전, 차원, 행 수, 메타데이터 바이트 수, 임베더 설정, generation
+#   vectors.f32    # (count, dim) float32 row-major 원시 바이트
+#   meta.jsonl     # 행마다 {"headline", "snippet", "source", "date", ...}
+#   meta.idx       # 각 메타데이터 행의 시작 바이트 오프셋 (int64)
+#   bm25/          # 음절 n-gram 역색인 세그먼트 (ngram.py)
+#   vectors.i8     # (선택) int8 양자화 임베딩 (count, dim)
+#   scales.f32     # (선택) int8 행별 스케일 (count,)  → x ≈ vectors.i8 * scale
+#   hnsw/          # (선택) HNSW 근사 그래프 (hnsw.py)
+#   facets/        # 날짜 월 버킷·주제 postings (facets.py)
+#
+# open()은 manifest만 읽고 나머지는 memmap으로 연결하므로 코퍼스 크기와 무관하게 즉시 열림.
+# 실제 페이지는 검색 시 OS 페이지 캐시를 통해 필요한 만큼만 올라옴.
+
+import datetime as dt
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .config import (
+    BM25_CANDIDATES,
+    EMBEDDING_DIM,
+    HNSW_EF_CONSTRUCTION,
+    HNSW_EF_SEARCH,
+    HNSW_M,
+    HYBRID_ALPHA,
+    QUANT_SCAN_CHUNK_ROWS,
+    QUANTIZATION,
+    RERANK_CANDIDATES,
+    SCAN_CHUNK_ROWS,
+    SEARCH_MODE,
+    VECTOR_BACKEND,
+)
+from .embedding import HashingEmbedder, embedder_from_config
+from .facets import FacetIndex
+from .hnsw import HNSWGraph
+from .ngram import NgramIndex
+
+
+FORMAT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.f32"
+META_FILE = "meta.jsonl"
+META_INDEX_FILE = "meta.idx"
+NGRAM_DIR = "bm25"
+QUANT_FILE = "vectors.i8"
+SCALES_FILE = "scales.f32"
+HNSW_DIR = "hnsw"
+FACETS_DIR = "facets"
+
+# 역색인 백필 시 한 번에 처리할 행 수
+_BACKFILL_BATCH = 10000
+
+
+def _write_json_atomic(path: Path, data: dict[str, Any]) -> None:
+    """임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓰인 manifest를 보지 않도록)"""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 배열에서 상위 k개 인덱스를 내림차순으로 반환 (argpartition 후 부분 정렬)"""
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= scores.size:
+        return np.argsort(-scores, kind="stable")
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+def quantize_int8(embeddings: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    행별 대칭 int8 양자화
+
+    Returns:
+        (int8 행렬, 행별 스케일) - embeddings ≈ int8 * scale[:, None]
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    scales = np.abs(embeddings).max(axis=1) / 127.0
+    safe = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    quantized = np.clip(np.rint(embeddings / safe[:, None]), -127, 127).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def _append_bytes(path: Path, keep_bytes: int, data: bytes) -> None:
+    """파일을 keep_bytes로 자른 뒤(중단된 쓰기의 꼬리 제거) data를 이어 씀"""
+    with open(path, "r+b") as f:
+        f.truncate(keep_bytes)
+        f.seek(0, os.SEEK_END)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def record_text(record: dict[str, Any]) -> str:
+    """역색인에 넣을 메타데이터 텍스트 (headline + snippet)"""
+    return f"{record.get('headline') or ''} {record.get('snippet') or ''}"
+
+
+class NewsIndex:
+    """
+    memmap 기반 뉴스 임베딩 인덱스
+
+    - 검색: 쿼리 벡터와 전체 행렬의 내적을 청크 단위로 계산 후 top_k
+    - 하이브리드: BM25 역색인 후보만 벡터로 재점수 후 가중 합산 (후보가 없으면 전수 스캔)
+    - 양자화: int8 파일이 있으면 전수 스캔은 int8로 하고 상위 후보만 float32로 재점수
+    - HNSW: vector_backend="hnsw"이고 그래프가 있으면 그래프 탐색 (그래프 이후 추가된 행은 전수 스캔 후 병합)
+    - 필터: since/topic이 있으면 facet 색인으로 후보 행을 먼저 고르고 그 행들만 점수화
+    - 메타데이터: 결과 행에 대해서만 오프셋으로 JSONL 한 줄씩 읽음
+    - 쓰기: append()는 데이터 파일을 먼저 기록한 뒤 manifest의 count를 갱신하므로
+      동시에 읽는 프로세스는 항상 일관된 prefix만 보게 됨
+    """
+
+    def __init__(self, path: str | os.PathLike, manifest: dict[str, Any]):
+        self.path = Path(path)
+        self.manifest = manifest
+        self.dim = int(manifest["dim"])
+        self.count = int(manifest["count"])
+        self.generation = int(manifest.get("generation", 0))
+        self.embedder = embedder_from_config(manifest["embedder"])
+        self.quantization = QUANTIZATION
+        self.rerank_candidates = RERANK_CANDIDATES
+        self.vector_backend = VECTOR_BACKEND
+        self.ef_search = HNSW_EF_SEARCH
+        self._hnsw: HNSWGraph | None = None
+        self._hnsw_checked = False
+        self._vectors: np.ndarray | None = None
+        self._qvectors: np.ndarray | None = None
+        self._scales: np.ndarray | None = None
+        self._offsets: np.ndarray | None = None
+        self._meta_file = None
+        self._meta_lock = threading.Lock()
+        self.ngram = NgramIndex(self.path / NGRAM_DIR)
+        self.facets = FacetIndex(self.path / FACETS_DIR)
+        self._map_files()
+
+    # ------------------------------------------------------------------
+    # 생성 / 열기
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def create(
+        cls,
+        path: str | os.PathLike,
+        embedder: HashingEmbedder | None = None,
+    ) -> "NewsIndex":
+        """빈 인덱스 디렉터리 생성 (이미 있으면 ValueError)"""
+        path = Path(path)
+        if (path / MANIFEST_FILE).exists():
+            raise ValueError(f"이미 인덱스가 존재합니다: {path}")
+        embedder = embedder or HashingEmbedder(dim=EMBEDDING_DIM)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in (VECTORS_FILE, META_FILE, META_INDEX_FILE):
+            (path / name).touch()
+        manifest = {
+            "format": FORMAT_VERSION,
+            "dim": embedder.dim,
+            "count": 0,
+            "meta_bytes": 0,
+            "generation": 0,
+            "embedder": embedder.config(),
+        }
+        _write_json_atomic(path / MANIFEST_FILE, manifest)
+        return cls(path, manifest)
+
+    @classmethod
+    def open(cls, path: str | os.PathLike) -> "NewsIndex":
+        """기존 인덱스 열기 (manifest만 읽음)"""
+        path = Path(path)
+        with open(path / MANIFEST_FILE, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 인덱스 형식입니다: {manifest.get('format')}")
+        return cls(path, manifest)
+
+    @staticmethod
+    def exists(path: str | os.PathLike) -> bool:
+        return (Path(path) / MANIFEST_FILE).exists()
+
+    def _map_files(self) -> None:
+        """manifest의 count 기준으로 memmap 연결 (count=0이면 빈 배열)"""
+        if self.count > 0:
+            self._vectors = np.memmap(
+                self.path / VECTORS_FILE, dtype=np.float32, mode="r",
+                shape=(self.count, self.dim),
+            )
+            self._offsets = np.memmap(
+                self.path / META_INDEX_FILE, dtype=np.int64, mode="r",
+                shape=(self.count,),
+            )
+        else:
+            self._vectors = np.empty((0, self.dim), dtype=np.float32)
+            self._offsets = np.empty(0, dtype=np.int64)
+        if self.count > 0 and self.quantized_ready:
+            self._qvectors = np.memmap(
+                self.path / QUANT_FILE, dtype=np.int8, mode="r",
+                shape=(self.count, self.dim),
+            )
+            self._scales = np.memmap(
+                self.path / SCALES_FILE, dtype=np.float32, mode="r",
+                shape=(self.count,),
+            )
+        else:
+            self._qvectors = None
+            self._scales = None
+        # HNSW 그래프는 vector_backend="hnsw"로 처음 검색할 때 읽음 (_hnsw_graph)
+        self._hnsw = None
+        self._hnsw_checked = False
+
+    def _hnsw_graph(self) -> HNSWGraph | None:
+        """HNSW 그래프 (없으면 None) - 다음 _map_files()까지 한 번만 로드"""
+        if not self._hnsw_checked:
+            if self.count > 0 and HNSWGraph.exists(self.path / HNSW_DIR):
+                self._hnsw = HNSWGraph.load(self.path / HNSW_DIR, self._vectors)
+            self._hnsw_checked = True
+        return self._hnsw
+
+    @property
+    def quantized_ready(self) -> bool:
+        """int8 파일이 모든 행을 포함하는지"""
+        return int(self.manifest.get("quantized_count", -1)) == self.count
+
+    @property
+    def use_quantized(self) -> bool:
+        return self.quantization == "int8" and self._qvectors is not None
+
+    def reload(self) -> bool:
+        """
+        디스크의 manifest가 바뀌었으면 다시 연결
+
+        Returns:
+            generation이 바뀌어 다시 연결했는지 여부
+        """
+        with open(self.path / MANIFEST_FILE, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if int(manifest.get("generation", 0)) == self.generation:
+            return False
+        self.manifest = manifest
+        self.count = int(manifest["count"])
+        self.generation = int(manifest.get("generation", 0))
+        self.ngram.reload()
+        self.facets.reload()
+        self._map_files()
+        return True
+
+    def close(self) -> None:
+        with self._meta_lock:
+            if self._meta_file is not None:
+                self._meta_file.close()
+                self._meta_file = None
+        self._vectors = None
+        self._qvectors = None
+        self._scales = None
+        self._hnsw = None
+        self._hnsw_checked = False
+        self._offsets = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+
+    def append(self, embeddings: np.ndarray, records: list[dict[str, Any]]) -> range:
+        """
+        임베딩과 메타데이터를 인덱스 끝에 추가
+
+        Args:
+            embeddings: (n, dim) 임베딩 (L2 정규화 가정)
+            records: n개의 메타데이터 dict (headline, snippet, source, date 등)
+
+        Returns:
+            새로 추가된 행 번호 범위
+        """
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or embeddings.shape[1] != self.dim:
+            raise ValueError(f"임베딩 shape이 올바르지 않습니다: {embeddings.shape}")
+        if len(records) != embeddings.shape[0]:
+            raise ValueError("임베딩 수와 메타데이터 수가 다릅니다.")
+        if not records:
+            return range(self.count, self.count)
+
+        # 이전에 중단된 쓰기가 남긴 꼬리 바이트를 잘라내고 이어 씀
+        _append_bytes(self.path / VECTORS_FILE, self.count * self.dim * 4, embeddings.tobytes())
+        quantized = self.quantized_ready
+        if quantized:
+            qvecs, scales = quantize_int8(embeddings)
+            _append_bytes(self.path / QUANT_FILE, self.count * self.dim, qvecs.tobytes())
+            _append_bytes(self.path / SCALES_FILE, self.count * 4, scales.tobytes())
+
+        offsets = np.empty(len(records), dtype=np.int64)
+        meta_path = self.path / META_FILE
+        index_path = self.path / META_INDEX_FILE
+        meta_end = int(self.manifest.get("meta_bytes", 0))
+        with open(meta_path, "r+b") as f:
+            f.truncate(meta_end)
+            f.seek(meta_end)
+            pos = meta_end
+            for i, record in enumerate(records):
+                line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                offsets[i] = pos
+                f.write(line)
+                pos += len(line)
+            f.flush()
+            os.fsync(f.fileno())
+        _append_bytes(index_path, self.count * 8, offsets.tobytes())
+
+        # 역색인 세그먼트·facet은 manifest 갱신 전에 기록 (새 generation을 본 독자는 색인도 봄)
+        texts = [record_text(r) for r in records]
+        if self.ngram.covered_rows == self.count:
+            self.ngram.add_documents(self.count, texts)
+        if self.facets.covered_rows == self.count:
+            self.facets.add_records(self.count, records, texts)
+
+        start = self.count
+        self.count += len(records)
+        self.generation += 1
+        self.manifest.update(count=self.count, generation=self.generation, meta_bytes=pos)
+        if quantized:
+            self.manifest["quantized_count"] = self.count
+        _write_json_atomic(self.path / MANIFEST_FILE, self.manifest)
+        with self._meta_lock:
+            if self._meta_file is not None:
+                self._meta_file.close()
+                self._meta_file = None
+        self._map_files()
+        return range(start, self.count)
+
+    def build_ngram_index(self) -> int:
+        """
+        역색인에 빠진 행(역색인 도입 전에 추가된 행)을 세그먼트로 백필
+
+        Returns:
+            새로 색인한 행 수
+        """
+        start = self.ngram.covered_rows
+        for lo in range(start, self.count, _BACKFILL_BATCH):
+            rows = range(lo, min(lo + _BACKFILL_BATCH, self.count))
+            self.ngram.add_documents(lo, [record_text(r) for r in self.get_records(rows)])
+        return self.count - start
+
+    def build_facets(self) -> int:
+        """
+        facet 색인에 빠진 행(facet 도입 전에 추가된 행)을 백필
+
+        주제 분류 규칙(facets.TOPIC_RULES_VERSION)이 바뀌었으면 전체 행을 다시 색인합니다.
+
+        Returns:
+            새로 색인한 행 수
+        """
+        if self.facets.rules_stale:
+            self.facets.reset()
+        start = self.facets.covered_rows
+        for lo in range(start, self.count, _BACKFILL_BATCH):
+            records = self.get_records(range(lo, min(lo + _BACKFILL_BATCH, self.count)))
+            self.facets.add_records(lo, records, [record_text(r) for r in records])
+        return self.count - start
+
+    def build_quantized(self) -> int:
+        """
+        float32 임베딩으로 int8 파일(vectors.i8, scales.f32)을 구축/보충
+
+        이후 append()는 int8 파일도 함께 갱신합니다.
+
+        Returns:
+            새로 양자화한 행 수
+        """
+        done = max(int(self.manifest.get("quantized_count", 0)), 0)
+        for name in (QUANT_FILE, SCALES_FILE):
+            (self.path / name).touch()
+        for lo in range(done, self.count, SCAN_CHUNK_ROWS):
+            qvecs, scales = quantize_int8(self._vectors[lo:lo + SCAN_CHUNK_ROWS])
+            _append_bytes(self.path / QUANT_FILE, lo * self.dim, qvecs.tobytes())
+            _append_bytes(self.path / SCALES_FILE, lo * 4, scales.tobytes())
+        self.generation += 1
+        self.manifest.update(quantized_count=self.count, generation=self.generation)
+        _write_json_atomic(self.path / MANIFEST_FILE, self.manifest)
+        self._map_files()
+        return self.count - done
+
+    def build_hnsw(
+        self,
+        M: int = HNSW_M,
+        ef_construction: int = HNSW_EF_CONSTRUCTION,
+        progress: Any = None,
+    ) -> int:
+        """
+        HNSW 그래프 구축/보충 (이미 있으면 그래프에 없는 행만 삽입)
+
+        Args:
+            M: 노드당 이웃 수 (기존 그래프가 있으면 그 값을 유지)
+            ef_construction: 구축 시 탐색 폭
+            progress: 선택. progress(done, total) 콜백 (10000행마다)
+
+        Returns:
+            새로 삽입한 노드 수
+        """
+        path = self.path / HNSW_DIR
+        if HNSWGraph.exists(path):
+            graph = HNSWGraph.load(path, self._vectors, writable=True)
+        else:
+            graph = HNSWGraph(self._vectors, M=M, ef_construction=ef_construction)
+        start = graph.count
+        for lo in range(start, self.count, 10000):
+            graph.add(min(lo + 10000, self.count))
+            if progress:
+                progress(graph.count, self.count)
+        graph.save(path)
+        self.generation += 1
+        self.manifest["generation"] = self.generation
+        _write_json_atomic(self.path / MANIFEST_FILE, self.manifest)
+        self._map_files()
+        return self.count - start
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+
+    def get_records(self, rows: list[int] | np.ndarray) -> list[dict[str, Any]]:
+        """행 번호 목록의 메타데이터를 JSONL에서 읽어 반환"""
+        records = []
+        with self._meta_lock:
+            if self._meta_file is None:
+                self._meta_file = open(self.path / META_FILE, "rb")
+            for row in rows:
+                self._meta_file.seek(int(self._offsets[int(row)]))
+                records.append(json.loads(self._meta_file.readline()))
+        return records
+
+    def scores(self, query_vec: np.ndarray) -> np.ndarray:
+        """전체 행에 대한 내적 점수 (count,)"""
+        return self._vectors @ np.asarray(query_vec, dtype=np.float32)
+
+    def search_vector(self, query_vec: np.ndarray, top_k: int = 3) -> tuple[np.ndarray, np.ndarray]:
+        """
+        쿼리 벡터로 전수 스캔 top_k 검색
+
+        Args:
+            query_vec: (dim,) 쿼리 임베딩
+            top_k: 반환할 개수
+
+        Returns:
+            (행 번호 배열, 점수 배열) - 점수 내림차순
+        """
+        return self.search_vector_batch(np.asarray(query_vec, dtype=np.float32)[None, :], top_k)[0]
+
+    def search_vector_batch(
+        self,
+        query_vecs: np.ndarray,
+        top_k: int = 3,
+        rows: np.ndarray | None = None,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        여러 쿼리 벡터를 한 번의 행렬곱으로 전수 스캔
+
+        행렬을 한 번만 훑으면서 (SCAN_CHUNK_ROWS, dim) @ (dim, m) 으로 m개 쿼리를 동시에 점수화합니다.
+        청크마다 argpartition으로 후보만 남겨 임시 배열을 SCAN_CHUNK_ROWS x m 크기로 제한합니다.
+
+        Args:
+            query_vecs: (m, dim) 쿼리 임베딩
+            top_k: 쿼리별 반환 개수
+            rows: 선택. 이 행들(정렬된 행 번호)만 점수화 (facet 필터 결과). HNSW 대신 후보 스캔 사용
+
+        Returns:
+            쿼리별 (행 번호 배열, 점수 배열) 목록 - 점수 내림차순
+        """
+        q = np.ascontiguousarray(query_vecs, dtype=np.float32)
+        m = q.shape[0]
+        if self.count == 0 or top_k <= 0 or (rows is not None and len(rows) == 0):
+            empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+            return [empty] * m
+        if rows is None and self.vector_backend == "hnsw" and self._hnsw_graph() is not None:
+            return self._search_hnsw_batch(q, top_k)
+        if self.use_quantized:
+            return self._search_quantized_batch(q, top_k, rows)
+        return self._scan(q, top_k, self._vectors, None, SCAN_CHUNK_ROWS, rows=rows)
+
+    def _search_hnsw_batch(self, q: np.ndarray, top_k: int) -> list[tuple[np.ndarray, np.ndarray]]:
+        """HNSW 그래프 탐색 + 그래프 구축 이후 추가된 꼬리 행 전수 스캔 병합"""
+        tail = None
+        if self._hnsw.count < self.count:
+            tail = self._scan(q, top_k, self._vectors, None, SCAN_CHUNK_ROWS, start_row=self._hnsw.count)
+        results = []
+        for j in range(q.shape[0]):
+            rows, scores = self._hnsw.search(q[j], top_k, ef=self.ef_search)
+            if tail is not None:
+                rows = np.concatenate([rows, tail[j][0]])
+                scores = np.concatenate([scores, tail[j][1]])
+                best = top_k_indices(scores, top_k)
+                rows, scores = rows[best], scores[best]
+            results.append((rows, scores))
+        return results
+
+    def _scan(
+        self,
+        q: np.ndarray,
+        top_k: int,
+        matrix: np.ndarray,
+        scales: np.ndarray | None,
+        chunk_rows: int,
+        start_row: int = 0,
+        rows: np.ndarray | None = None,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        matrix(float32 또는 int8 + 행별 스케일)를 청크 단위로 훑으며 쿼리별 top_k 유지
+
+        rows가 없으면 start_row 이후 연속 구간, 있으면 해당 행들만 모아(gather) 점수화합니다.
+        """
+        m = q.shape[0]
+        cand_rows: list[list[np.ndarray]] = [[] for _ in range(m)]
+        cand_scores: list[list[np.ndarray]] = [[] for _ in range(m)]
+        total = self.count - start_row if rows is None else len(rows)
+        for lo in range(0, total, chunk_rows):
+            if rows is None:
+                ids = np.arange(start_row + lo, min(start_row + lo + chunk_rows, self.count))
+                sl = slice(ids[0], ids[-1] + 1)
+            else:
+                ids = rows[lo:lo + chunk_rows]
+                sl = ids
+            chunk = matrix[sl]
+            if scales is None:
+                chunk_scores = chunk @ q.T
+            else:
+                chunk_scores = (chunk.astype(np.float32) @ q.T) * scales[sl, None]
+            for j in range(m):
+                col = chunk_scores[:, j]
+                best = top_k_indices(col, top_k)
+                cand_rows[j].append(ids[best])
+                cand_scores[j].append(col[best])
+
+        results = []
+        for j in range(m):
+            rows = np.concatenate(cand_rows[j])
+            scores = np.concatenate(cand_scores[j])
+            order = top_k_indices(scores, top_k)
+            results.append((rows[order], scores[order]))
+        return results
+
+    def _search_quantized_batch(
+        self,
+        q: np.ndarray,
+        top_k: int,
+        rows: np.ndarray | None = None,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        int8 전수 스캔 → 상위 rerank_candidates개를 float32 원본으로 정확히 재점수
+
+        스캔은 int8 파일(float32의 1/4)만 읽고, float32 파일은 후보 행의 페이지만 건드리므로
+        워커 프로세스별 상주 메모리가 크게 줄어듭니다.
+        """
+        pool = max(top_k, self.rerank_candidates)
+        approx = self._scan(q, pool, self._qvectors, self._scales, QUANT_SCAN_CHUNK_ROWS, rows=rows)
+        if self.rerank_candidates <= 0:
+            return [(rows[:top_k], scores[:top_k]) for rows, scores in approx]
+        results = []
+        for j, (cand, _) in enumerate(approx):
+            cand = np.sort(cand)
+            exact = self._vectors[cand] @ q[j]
+            best = top_k_indices(exact, top_k)
+            results.append((cand[best], exact[best]))
+        return results
+
+    def search_hybrid(self, query: str, query_vec: np.ndarray, top_k: int = 3) -> tuple[np.ndarray, np.ndarray]:
+        """BM25 + 벡터 하이브리드 검색 (단일 쿼리, search_hybrid_batch 참고)"""
+        return self.search_hybrid_batch([query], np.asarray(query_vec, dtype=np.float32)[None, :], top_k)[0]
+
+    def search_hybrid_batch(
+        self,
+        queries: list[str],
+        query_vecs: np.ndarray,
+        top_k: int = 3,
+        rows: np.ndarray | None = None,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        BM25 + 벡터 하이브리드 검색
+
+        쿼리별 BM25 상위 BM25_CANDIDATES개 행만 memmap에서 꺼내 벡터 점수를 계산하므로
+        키워드가 잡히는 쿼리는 전체 행렬을 읽지 않습니다. 여러 쿼리의 후보는 합집합으로 한 번만 읽어
+        한 번의 행렬곱으로 점수화하고, 일치 term이 없는 쿼리들은 모아서 전수 벡터 스캔합니다.
+        rows(facet 필터 결과)가 있으면 BM25 postings 단계에서 바로 걸러내므로 후보도 그 안에서만 뽑힙니다.
+
+        Returns:
+            쿼리별 (행 번호 배열, 하이브리드 점수 배열) 목록 - 점수 내림차순
+        """
+        q = np.ascontiguousarray(query_vecs, dtype=np.float32)
+        allowed = None
+        if rows is not None:
+            # facet 파일은 다른 프로세스가 쓰는 중일 수 있으므로 아직 연결되지 않은 행(>= count)은 제외
+            rows = rows[rows < self.count]
+            # 다른 프로세스가 방금 추가한 세그먼트의 행 번호도 인덱싱할 수 있도록 여유 있게 할당
+            allowed = np.zeros(max(self.count, self.ngram.covered_rows), dtype=bool)
+            allowed[rows] = True
+        lexical = [
+            self.ngram.search(query, top_k=max(BM25_CANDIDATES, top_k), allowed=allowed)
+            for query in queries
+        ]
+        # n-gram 세그먼트가 manifest보다 먼저 갱신되면 아직 memmap에 없는 행(>= count)이 후보로 나올 수 있음
+        lexical = [(cand[cand < self.count], bm25[cand < self.count]) for cand, bm25 in lexical]
+        results: list[tuple[np.ndarray, np.ndarray] | None] = [None] * len(queries)
+
+        hit = [j for j, (rows, _) in enumerate(lexical) if len(rows)]
+        if hit:
+            union = np.unique(np.concatenate([lexical[j][0] for j in hit]))  # 정렬됨 → memmap 순차 접근
+            union_scores = self._vectors[union] @ q[hit].T
+            for col, j in enumerate(hit):
+                rows, bm25 = lexical[j]
+                vec = union_scores[np.searchsorted(union, rows), col]
+                fused = HYBRID_ALPHA * vec + (1.0 - HYBRID_ALPHA) * (bm25 / bm25.max())
+                best = top_k_indices(fused, top_k)
+                results[j] = (rows[best], fused[best].astype(np.float32))
+
+        miss = [j for j in range(len(queries)) if results[j] is None]
+        if miss:
+            for j, res in zip(miss, self.search_vector_batch(q[miss], top_k, rows=rows)):
+                results[j] = res
+        return results
+
+    def _to_records(self, rows: np.ndarray, scores: np.ndarray) -> list[dict[str, Any]]:
+        results = self.get_records(rows)
+        for record, score in zip(results, scores):
+            record["score"] = float(score)
+        return results
+
+    def search_hits(
+        self,
+        queries: list[str],
+        top_k: int = 3,
+        mode: str | None = None,
+        since: str | dt.date | None = None,
+        topic: str | None = None,
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        여러 텍스트 쿼리 일괄 검색 → 쿼리별 (행 번호 배열, 점수 배열) (메타데이터는 읽지 않음)
+
+        인자는 search_many()와 같습니다.
+        """
+        if not queries:
+            return []
+        mode = mode or SEARCH_MODE
+        rows = self.facets.select(since=since, topic=topic)
+        query_vecs = self.embedder.embed(list(queries))
+        if mode == "hybrid":
+            return self.search_hybrid_batch(list(queries), query_vecs, top_k, rows=rows)
+        if mode == "vector":
+            return self.search_vector_batch(query_vecs, top_k, rows=rows)
+        raise ValueError(f"알 수 없는 검색 모드입니다: {mode}")
+
+    def search_many(
+        self,
+        queries: list[str],
+        top_k: int = 3,
+        mode: str | None = None,
+        since: str | dt.date | None = None,
+        topic: str | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        여러 텍스트 쿼리 일괄 검색 (임베딩·스캔을 쿼리 수와 무관하게 한 번에 수행)
+
+        Args:
+            queries: 검색 쿼리 목록
+            top_k: 쿼리별 반환 개수
+            mode: "hybrid" / "vector" (None이면 SEARCH_MODE 설정값)
+            since: 선택. 이 날짜("YYYY-MM-DD", 포함) 이후 기사만
+            topic: 선택. 주제 라벨 또는 자유 문장 (facets.resolve_topic 참고)
+
+        Returns:
+            쿼리별 결과 목록: list[list[dict]] (각 dict는 search()와 동일 형식)
+        """
+        hits = self.search_hits(queries, top_k=top_k, mode=mode, since=since, topic=topic)
+        return [self._to_records(rows, scores) for rows, scores in hits]
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 3,
+        mode: str | None = None,
+        since: str | dt.date | None = None,
+        topic: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        텍스트 쿼리 검색 → 메타데이터 + score
+
+        Args:
+            query: 검색 쿼리
+            top_k: 반환할 개수
+            mode: "hybrid" / "vector" (None이면 SEARCH_MODE 설정값)
+            since: 선택. 이 날짜 이후 기사만
+            topic: 선택. 주제 라벨 또는 자유 문장
+
+        Returns:
+            list[dict]: { "headline", "snippet", "source", "date", "score", ... }
+        """
+        return self.search_many([query], top_k=top_k, mode=mode, since=since, topic=topic)[0]
@@ -0,0 +1,185 @@
+# 숫자 표기 정규화 (PII 1차 탐지 전처리, LLM 호출 없음)
+# 음성 시나리오에서 사용자는 숫자를 한글로 읽거나("공일공 일이삼사") 띄어 쓰고("0 1 0"),
+# 전각 문자("０１０－")를 섞어 입력하므로 숫자 정규식이 그대로는 놓침
+#
+# 처리 (표 기반, 원문 위치 보존):
+#   1. 전각 숫자·하이픈, 각종 대시, 특수 공백 → ASCII (1:1 치환이라 위치 변화 없음)
+#   2. 숫자 토큰(한자어 숫자 음절 공/영/일/이/.../구, 고유어 하나~아홉, ASCII 숫자)이
+#      구분자(공백·하이픈·점)를 사이에 두고 3개 이상 이어진 구간만 숫자로 변환
+#      - 한 자리씩 띄어 읽은 구간("0 1 0", "일 이 삼")은 붙이고, 묶음 사이 구분자는 1자로 압축
+#      - 구간 끝 "이" 바로 뒤에 한글이 붙으면 조사/서술격("공일공이에요")으로 보고 제외
+#      - 묶음이 모두 숫자 음절로 된 일반 단어("일일이", "사이사이", "오일팔")이거나
+#        기간 표현("이삼일 뒤", "삼사일 전")이면 구간 전체를 변환하지 않음
+#   자리 단위 수(십·백·천·만, "오백만 원")는 금액 표현이라 변환하지 않음 (개인정보 숫자열은 한 자리씩 읽음)
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+
+# 1:1 문자 치환표 (전각 숫자 ０-９, 전각 하이픈·마침표, 대시류, 전각/특수 공백)
+_CHAR_TABLE = str.maketrans({
+    **{chr(0xFF10 + d): str(d) for d in range(10)},
+    "－": "-", "‐": "-", "‑": "-", "‒": "-", "–": "-", "—": "-",
+    "―": "-", "−": "-", "﹣": "-", "ー": "-",
+    "．": ".", "·": ".", "ㆍ": ".",
+    "　": " ", " ": " ", " ": " ", " ": " ", " ": " ",
+})
+
+# 숫자 토큰 → 값 (여러 음절 단어를 먼저 매칭하도록 정규식은 긴 순서로 구성)
+NUMERAL_WORDS: dict[str, str] = {
+    "공": "0", "영": "0", "빵": "0",
+    "일": "1", "이": "2", "삼": "3", "사": "4", "오": "5",
+    "육": "6", "륙": "6", "칠": "7", "팔": "8", "구": "9",
+    "하나": "1", "둘": "2", "셋": "3", "넷": "4", "다섯": "5",
+    "여섯": "6", "일곱": "7", "여덟": "8", "아홉": "9",
+    **{str(d): str(d) for d in range(10)},
+}
+
+MIN_RUN_TOKENS = 3     # CVC(3자리)까지 잡고, "사이", "오일" 같은 두 음절 단어는 건드리지 않음
+
+_TOKEN = "|".join(sorted(map(re.escape, NUMERAL_WORDS), key=len, reverse=True))
+_SEP = r"[ \-.]"
+# 구분자는 최대 3자 ("010 - 1234")
+NUMERAL_RUN_RE = re.compile(rf"(?:{_TOKEN})(?:{_SEP}{{0,3}}(?:{_TOKEN})){{{MIN_RUN_TOKENS - 1},}}")
+_PART_RE = re.compile(rf"({_TOKEN})|({_SEP}+)")
+
+# 숫자 음절로만 이루어진 일반 단어·기념일 (구간의 모든 묶음이 여기 속하면 숫자로 보지 않음)
+LEXICAL_WORDS = frozenset({
+    "일일이", "사이사이", "삼삼오오", "일이", "이일", "사이", "오일", "일일", "이사", "구구",
+    "육이오", "사일구", "오일륙", "오일육", "오일팔", "팔일오", "구일일", "삼일",
+})
+# "이삼일", "사오일" 같은 어림 일수 + 뒤따르는 기간 표현
+_DAY_RANGE_RE = re.compile(r"([일이삼사오육칠팔])([이삼사오육칠팔구])일")
+_DURATION_RE = re.compile(r"\s*(?:전|뒤|후|동안|만에|간|째|쯤|정도|이내|안에|이면|이나|걸)")
+
+
+def _is_hangul(ch: str) -> bool:
+    return "가" <= ch <= "힣"
+
+
+@dataclass
+class NormalizedText:
+    """
+    정규화 결과
+
+    starts/ends[i]는 정규화 문자 i가 온 원문 구간 ([start, end)).
+    변환된 구간이 없으면 None (원문과 위치가 같음).
+    """
+    text: str
+    original: str
+    starts: Optional[list[int]] = None
+    ends: Optional[list[int]] = None
+
+    def to_original(self, start: int, end: int) -> tuple[int, int]:
+        """정규화 텍스트 구간 [start, end) → 원문 구간"""
+        if self.starts is None or start >= end:
+            return start, end
+        return self.starts[start], self.ends[end - 1]
+
+    def spoken(self, start: int, end: int) -> bool:
+        """정규화 텍스트 구간의 숫자가 원문에는 숫자로 없고 한글 숫자 읽기에서만 나왔는지"""
+        o_start, o_end = self.to_original(start, end)
+        original_digits = re.sub(r"\D", "", self.original[o_start:o_end].translate(_CHAR_TABLE))
+        return original_digits != re.sub(r"\D", "", self.text[start:end])
+
+
+def _run_pieces(run: str, base: int, next_char: str) -> list[tuple[str, int, int]]:
+    """
+    숫자 구간 1개 → [(출력 문자열, 원문 시작, 원문 끝)]
+
+    한 자리 묶음 사이 구분자는 제거, 나머지 구분자는 1자로 압축합니다.
+    """
+    groups: list[list[tuple[str, int, int]]] = [[]]
+    seps: list[tuple[str, int, int]] = []
+    for m in _PART_RE.finditer(run):
+        start, end = base + m.start(), base + m.end()
+        if m.group(1):
+            groups[-1].append((NUMERAL_WORDS[m.group(1)], start, end))
+        else:
+            sep = m.group(2)
+            seps.append(("-" if "-" in sep else "." if "." in sep else " ", start, end))
+            groups.append([])
+
+    # "공일공이에요" → 끝의 "이"는 숫자가 아닌 조사/서술격으로 처리
+    if _is_hangul(next_char) and run.endswith("이"):
+        groups[-1].pop()
+        if not groups[-1]:
+            groups.pop()
+            seps.pop()
+
+    pieces = list(groups[0])
+    for sep, group, prev in zip(seps, groups[1:], groups):
+        if not (len(prev) == 1 and len(group) == 1):
+            pieces.append(sep)
+        pieces.extend(group)
+    return pieces
+
+
+def _is_lexical(run: str, rest: str) -> bool:
+    """
+    숫자 구간이 실제로는 일반 단어인지
+
+    Args:
+        run: 숫자 구간 텍스트
+        rest: 구간 뒤 원문 (기간 표현 확인용)
+    """
+    groups = re.split(rf"{_SEP}+", run)
+    if len(groups[-1]) > 1 and groups[-1].endswith("이") and _is_hangul(rest[:1]):
+        # "이삼일이면" → 끝의 "이"는 조사로 보고 "이삼일" + "이면"으로 판단
+        groups[-1], rest = groups[-1][:-1], "이" + rest
+    for i, group in enumerate(groups):
+        if group in LEXICAL_WORDS:
+            continue
+        day = _DAY_RANGE_RE.fullmatch(group)
+        if (
+            day and i == len(groups) - 1
+            and int(NUMERAL_WORDS[day.group(2)]) == int(NUMERAL_WORDS[day.group(1)]) + 1
+            and _DURATION_RE.match(rest)
+        ):
+            continue
+        return False
+    return True
+
+
+def normalize_numerals(text: str) -> NormalizedText:
+    """
+    한글·전각·띄어 쓴 숫자를 ASCII 숫자열로 정규화
+
+    숫자 구간이 없는 메시지는 문자 치환 한 번으로 끝나고(위치 정보 없음),
+    구간이 있으면 해당 구간만 변환하면서 문자별 원문 위치를 기록합니다.
+
+    Examples:
+        "공일공 일이삼사 오육칠팔"  → "010 1234 5678"
+        "０１０－１２３４－５６７８" → "010-1234-5678"
+        "비번은 일 이 삼 사요"      → "비번은 1234요"
+    """
+    translated = text.translate(_CHAR_TABLE)
+    runs = [
+        m for m in NUMERAL_RUN_RE.finditer(translated)
+        if (not m.group(0).isascii() and not _is_lexical(m.group(0), translated[m.end():]))
+        or (m.group(0).isascii() and re.search(r"\d \d(?!\d)|(?<!\d)\d \d|[ \-.]{2}", m.group(0)))
+    ]
+    if not runs:
+        return NormalizedText(translated, text)
+
+    out: list[str] = []
+    starts: list[int] = []
+    ends: list[int] = []
+    pos = 0
+    for m in runs:
+        out.append(translated[pos:m.start()])
+        starts.extend(range(pos, m.start()))
+        ends.extend(range(pos + 1, m.start() + 1))
+        next_char = translated[m.end()] if m.end() < len(translated) else ""
+        last_end = m.start()
+        for piece, start, end in _run_pieces(m.group(0), m.start(), next_char):
+            out.append(piece)
+            starts.append(start)
+            ends.append(end)
+            last_end = end
+        pos = last_end
+    out.append(translated[pos:])
+    starts.extend(range(pos, len(translated)))
+    ends.extend(range(pos + 1, len(translated) + 1))
+    return NormalizedText("".join(out), text, starts, ends)
@@ -0,0 +1,249 @@
+# 개인정보(PII) 1차 탐지기 (정규식 + 체크섬, LLM 호출 없음)
+# Evaluator의 1단계: 메시지당 수 µs ~ 수십 µs로 명확한 노출/안전을 판정하고,
+# 판정할 수 없는 메시지만 LLM 문맥 검사(2단계)로 넘김
+#
+# 판정:
+#   danger    - 검증된 민감 정보 (체크섬 통과 주민등록번호·카드번호, 문맥 있는 계좌번호, 인증번호 등)
+#   ambiguous - 민감 정보일 수도 있는 숫자열(체크섬 실패, 문맥 없는 긴 숫자) 또는 협조·송금 등 위험 신호 문구
+#   safe      - 숫자열도 위험 신호도 없는 메시지 (짧은 대답, 질문, 거절 등)
+#
+# 숫자 패턴은 numeral_normalizer로 한글·전각·띄어 쓴 숫자를 ASCII로 바꾼 텍스트에 적용하고,
+# PIIFinding 위치는 원문 기준으로 되돌려 기록 ("공일공 일이삼사 오육칠팔"도 전화번호로 확정)
+
+import re
+from dataclasses import dataclass, field
+from typing import Literal
+
+from .numeral_normalizer import NUMERAL_RUN_RE, normalize_numerals
+
+
+Verdict = Literal["danger", "ambiguous", "safe"]
+
+
+@dataclass(frozen=True)
+class PIIFinding:
+    """탐지된 항목"""
+    kind: str            # 주민등록번호, 카드번호, 계좌번호, 전화번호, 인증번호/비밀번호 ...
+    masked: str          # 가린 값 (정규화된 숫자 기준, 로그·교육 메시지용)
+    start: int           # 원문 위치 (정규화 전)
+    end: int
+    confirmed: bool      # 체크섬/문맥으로 확정되었는지 (False면 LLM 확인 필요)
+
+
+@dataclass
+class PIIDetection:
+    """메시지 1건의 1차 탐지 결과"""
+    verdict: Verdict
+    findings: list[PIIFinding] = field(default_factory=list)
+    cues: list[str] = field(default_factory=list)    # 매칭된 위험 신호 문구
+
+    @property
+    def labels(self) -> list[str]:
+        """evaluation_result.detected_info용 표기 (중복 제거, 발견 순서)"""
+        seen: dict[str, None] = {}
+        for f in self.findings:
+            seen.setdefault(f"{f.kind}({f.masked})", None)
+        return list(seen)
+
+
+# ----------------------------------------------------------------------------
+# 패턴 (모듈 로드 시 한 번 컴파일)
+# ----------------------------------------------------------------------------
+
+# 숫자 사이 구분자: 하이픈, 공백, 점
+_SEP = r"[-\s.]?"
+
+_RRN_RE = re.compile(r"(?<!\d)(\d{2})(\d{2})(\d{2})" + _SEP + r"([1-8])(\d{6})(?!\d)")
+_PHONE_RE = re.compile(r"(?<!\d)(01[016789])" + _SEP + r"(\d{3,4})" + _SEP + r"(\d{4})(?!\d)")
+_CARD_RE = re.compile(r"(?<!\d)(\d{4})" + _SEP + r"(\d{4})" + _SEP + r"(\d{4})" + _SEP + r"(\d{1,7})(?!\d)")
+# 계좌번호: 2~6자리 묶음 2~4개, 숫자 합 10~14자리
+_ACCOUNT_RE = re.compile(r"(?<!\d)\d{2,6}(?:-\d{2,6}){1,3}(?!\d)|(?<!\d)\d{10,14}(?!\d)")
+# 인증번호/비밀번호/OTP/보안카드: 키워드 뒤 20자 이내 3~8자리 숫자
+# 횟수·자릿수·시각 같은 단위가 붙은 숫자("3번 틀렸어요", "100번도 더")는 제외
+_SECRET_KEYWORD = r"(인증\s*번호|비밀\s*번호|비번|OTP|otp|보안\s*카드|승인\s*번호|CVC|cvc|CVV|cvv)"
+_NOT_UNIT = r"(?!\d)(?!\s*(?:번|회|개|자리|시|분|초|일|원|살|명|년|월|차|달|주|시간|퍼센트|%))"
+# 사이에 낀 "12번"(보안카드 칸 번호) 같은 짧은 순번은 건너뜀
+_SECRET_RE = re.compile(_SECRET_KEYWORD + r"(?:\D|\d{1,2}(?=\s*(?:번|째))){0,20}?(\d{3,8})" + _NOT_UNIT)
+# 키워드 바로 뒤에 (조사·콜론만 두고) 숫자가 오는 경우만 확정 ("인증번호는 123456", "비번: 4821")
+_SECRET_DIRECT_RE = re.compile(_SECRET_KEYWORD + r"\s*(?:은|는|이|가|:|=)?\s*(\d{3,8})" + _NOT_UNIT)
+_ACCOUNT_CONTEXT_RE = re.compile(r"계좌|통장|입금|이체|송금|은행|뱅크|농협|신한|국민|우리|하나|기업|카카오|토스")
+# 문맥 없는 긴 숫자열 (위 패턴에 안 걸린 6자리 이상)
+_LONG_DIGITS_RE = re.compile(r"(?<!\d)\d(?:[-\s]?\d){5,}(?!\d)")
+
+# 숫자 없이도 위험할 수 있는 신호 (LLM 문맥 검사로 넘길 대상)
+_RISK_CUE_RE = re.compile(
+    r"알려\s*드릴|불러\s*드릴|보내\s*드릴|알려\s*드려요|말씀\s*드릴|이체\s*(할|했|하겠|해\s*드)|송금\s*(할|했|하겠)"
+    r"|앱\s*(을|를)?\s*(설치|깔)|설치\s*(할|했|하겠)|링크\s*(눌|클릭)|원격|현금\s*(을|를)?\s*(찾|인출|전달)"
+    r"|제\s*이름은|주소는|사는\s*곳|생년월일|주민\s*번호|계좌\s*번호|카드\s*번호|비밀\s*번호|인증\s*번호"
+    r"|돈이\s*없|빚\s*(이|을|때문)|혼자\s*살"
+)
+
+
+# ----------------------------------------------------------------------------
+# 체크섬
+# ----------------------------------------------------------------------------
+
+def luhn_valid(digits: str) -> bool:
+    """카드번호 Luhn 체크섬"""
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        d = ord(ch) - 48
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+_RRN_WEIGHTS = (2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5)
+
+
+def rrn_checksum_valid(digits: str) -> bool:
+    """주민등록번호 검증 숫자 (2020년 10월 이후 발급분은 검증 숫자가 없어 실패할 수 있음)"""
+    total = sum(int(d) * w for d, w in zip(digits[:12], _RRN_WEIGHTS))
+    return (11 - total % 11) % 10 == int(digits[12])
+
+
+def _rrn_date_valid(yy: str, mm: str, dd: str) -> bool:
+    month, day = int(mm), int(dd)
+    return 1 <= month <= 12 and 1 <= day <= 31
+
+
+def _mask(digits: str, keep: int = 4) -> str:
+    return digits[:keep] + "*" * max(0, len(digits) - keep)
+
+
+def _digits(text: str) -> str:
+    return re.sub(r"\D", "", text)
+
+
+# ----------------------------------------------------------------------------
+# 탐지
+# ----------------------------------------------------------------------------
+
+def detect_pii(text: str) -> PIIDetection:
+    """
+    메시지 1건의 1차 PII 탐지
+
+    항목별 규칙:
+    - 주민등록번호: 생년월일·성별 자리 유효 + 검증 숫자 통과면 확정, 검증 숫자 실패면 애매
+    - 카드번호: 13~19자리 Luhn 통과면 확정, 16자리 4-4-4-4 형태인데 실패면 애매
+    - 전화번호: 010 등 휴대전화 형식이면 확정
+    - 인증번호/비밀번호: 키워드 바로 뒤(조사·콜론만 허용) 숫자면 확정, 사이에 다른 말이 있거나 한글로 읽은 숫자면 애매
+    - 계좌번호: 계좌·은행 문맥이 있으면 확정, 없거나 한글로 읽은 숫자면 애매
+    - 그 외 6자리 이상 숫자열: 애매
+
+    숫자 패턴은 정규화 텍스트(normalize_numerals)에, 위험 신호·계좌 문맥은 원문에 적용합니다.
+
+    Args:
+        text: 사용자 메시지
+
+    Returns:
+        PIIDetection (verdict, findings, cues)
+    """
+    findings: list[PIIFinding] = []
+    taken: list[tuple[int, int]] = []     # 정규화 텍스트 기준 구간
+
+    def free(start: int, end: int) -> bool:
+        return all(end <= s or start >= e for s, e in taken)
+
+    def add(kind: str, digits: str, m: re.Match, confirmed: bool, keep: int = 4) -> None:
+        start, end = normalized.to_original(m.start(), m.end())
+        findings.append(PIIFinding(kind, _mask(digits, keep), start, end, confirmed))
+        taken.append((m.start(), m.end()))
+
+    normalized = normalize_numerals(text)
+    scan = normalized.text
+    if not any(ch.isdigit() for ch in scan):
+        cues = _risk_cues(text)
+        return PIIDetection("ambiguous" if cues else "safe", cues=cues)
+
+    # 인증번호·계좌번호는 체크섬이 없으므로 한글 숫자 읽기에서만 나온 숫자는 확정하지 않고 LLM 확인으로 넘김
+    # 키워드와 숫자 사이에 다른 말이 끼면 무슨 숫자인지 알 수 없으므로 LLM 확인으로 넘김
+    for m in _SECRET_RE.finditer(scan):
+        direct = _SECRET_DIRECT_RE.fullmatch(m.group(0)) is not None
+        add("인증번호/비밀번호", m.group(2), m, direct and not normalized.spoken(m.start(), m.end()), keep=0)
+
+    for m in _RRN_RE.finditer(scan):
+        if not free(m.start(), m.end()) or not _rrn_date_valid(m.group(1), m.group(2), m.group(3)):
+            continue
+        digits = "".join(m.groups())
+        add("주민등록번호", digits, m, rrn_checksum_valid(digits), keep=7)
+
+    for m in _PHONE_RE.finditer(scan):
+        if free(m.start(), m.end()):
+            add("전화번호", "".join(m.groups()), m, True, keep=3)
+
+    for m in _CARD_RE.finditer(scan):
+        if not free(m.start(), m.end()):
+            continue
+        digits = _digits(m.group(0))
+        if 13 <= len(digits) <= 19 and luhn_valid(digits):
+            add("카드번호", digits, m, True)
+        elif len(digits) == 16:
+            add("카드번호", digits, m, False)
+
+    has_account_context = bool(_ACCOUNT_CONTEXT_RE.search(text))
+    for m in _ACCOUNT_RE.finditer(scan):
+        digits = _digits(m.group(0))
+        if free(m.start(), m.end()) and 10 <= len(digits) <= 14:
+            add("계좌번호", digits, m, has_account_context and not normalized.spoken(m.start(), m.end()), keep=3)
+
+    for m in _LONG_DIGITS_RE.finditer(scan):
+        if free(m.start(), m.end()):
+            add("숫자 정보", _digits(m.group(0)), m, False, keep=2)
+
+    findings.sort(key=lambda f: f.start)
+    cues = _risk_cues(text)
+    if any(f.confirmed for f in findings):
+        verdict: Verdict = "danger"
+    elif findings or cues:
+        verdict = "ambiguous"
+    else:
+        verdict = "safe"
+    return PIIDetection(verdict, findings, cues)
+
+
+# 일괄 처리용 사전 필터: 숫자(한글로 읽은 숫자 포함)도 위험 신호도 없는 메시지는 개별 패턴 검사 없이 safe
+_NEEDS_SCAN_RE = re.compile(r"\d|" + NUMERAL_RUN_RE.pattern + "|" + _RISK_CUE_RE.pattern)
+
+
+def detect_pii_batch(texts: list[str]) -> list[PIIDetection]:
+    """
+    여러 메시지의 1차 탐지 (오프라인 일괄 채점용, 프로세스 풀 작업 단위)
+
+    대부분의 메시지(짧은 대답·질문)는 사전 필터 한 번으로 safe 처리하고,
+    숫자(한글·전각 표기 포함)나 위험 신호가 있는 메시지만 detect_pii 전체 규칙을 적용합니다.
+    """
+    return [detect_pii(t) if _NEEDS_SCAN_RE.search(t) else PIIDetection("safe") for t in texts]
+
+
+# evaluation_result.detected_info 항목 → 분류 (앞에서부터 먼저 맞는 분류)
+# 1단계 표기("카드번호(4111****)")와 LLM 자유 표기("송금 의사 표현")를 같은 분류로 묶음.
+# "보안카드"가 카드번호로, "혼자 거주"가 주소로 가지 않도록 인증번호·약점을 먼저 검사
+DETECTED_INFO_CATEGORIES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("인증번호/비밀번호", ("인증", "비밀", "비번", "OTP", "otp", "보안카드", "CVC", "cvc", "CVV", "승인번호")),
+    ("주민등록번호", ("주민",)),
+    ("카드번호", ("카드",)),
+    ("계좌번호", ("계좌", "통장")),
+    ("전화번호", ("전화", "휴대폰", "핸드폰", "연락처")),
+    ("생년월일", ("생년", "생일")),
+    ("이름", ("이름", "성명", "실명")),
+    ("약점", ("혼자", "독거", "빚", "경제", "재정", "급")),
+    ("주소", ("주소", "거주", "사는 곳")),
+    ("협조", ("송금", "이체", "앱", "설치", "링크", "현금", "협조", "동의", "약속", "원격", "상품권", "돈")),
+)
+OTHER_CATEGORY = "기타"
+
+
+def categorize_detected_info(label: str) -> str:
+    """detected_info 항목 1개 → 분류명 (맞는 분류가 없으면 "기타")"""
+    for category, keywords in DETECTED_INFO_CATEGORIES:
+        if any(k in label for k in keywords):
+            return category
+    return OTHER_CATEGORY
+
+
+def _risk_cues(text: str) -> list[str]:
+    return [m.group(0) for m in _RISK_CUE_RE.finditer(text)]
@@ -0,0 +1,353 @@
+# RAG 검색 벤치마크
+# 합성/샘플 코퍼스로 인덱스를 만들고 검색 모드별 recall@k, 지연 백분위, 구축 시간, 상주 메모리를 측정
+# 운영 인덱스 설정(양자화·HNSW·하이브리드) 선택과 성능 회귀 확인용
+#
+# 사용법:
+#   python -m llm.tools.rag_benchmark --rows 20000                          # 합성 코퍼스, 전체 모드
+#   python -m llm.tools.rag_benchmark --sample dumps/mk_2025.jsonl --rows 50000 --modes flat,int8,hybrid
+#   python -m llm.tools.rag_benchmark --index-dir data/news_index --queries 500 --json bench.json   # 읽기 전용
+#   python -m llm.tools.rag_benchmark --index-dir data/news_index --build   # 복사본에 int8/HNSW 구축 후 측정
+#   python -m llm.tools.rag_benchmark --rows 50000 --since 2025-01-01 --topic "카드사 사칭"
+#
+# recall@k의 정답은 같은 필터를 건 float32 전수 벡터 검색 결과입니다.
+# hybrid는 BM25 점수를 섞으므로 recall은 "정확 벡터 검색과의 일치율"로 읽어야 합니다.
+#
+# --index-dir는 인덱스를 읽기만 하며 int8/HNSW 파일이 없는 모드는 건너뜁니다.
+# --build를 주면 인덱스를 임시 디렉터리(또는 --keep 경로)로 복사해 복사본에만 구축하므로
+# 서비스 중인 인덱스의 manifest/generation은 바뀌지 않습니다.
+
+import argparse
+import datetime as dt
+import json
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+from .news_index import NewsIndex
+from .news_index.facets import TOPIC_KEYWORDS
+from .news_index.hnsw import HNSWGraph
+from .news_index.ingest import DEDUP_FILE, iter_chunks, normalize_article, read_articles
+from .news_index.quantize import recall_at_k
+from .news_index.store import HNSW_DIR
+
+
+MODES = ("flat", "int8", "hnsw", "hybrid")
+
+# 인덱스에 한 번에 추가할 청크 수
+_APPEND_ROWS = 20000
+
+
+@dataclass
+class BenchmarkResult:
+    """검색 모드 하나의 측정 결과"""
+    mode: str
+    rows: int
+    queries: int
+    top_k: int
+    recall: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    build_seconds: float     # 이 모드에 필요한 구축 시간 (flat/hybrid = 기본 append, int8/hnsw = 추가 구축)
+    rss_mb: float            # 쿼리 실행 후 프로세스 상주 메모리
+    rss_delta_mb: float      # 이 모드의 쿼리 실행 중 늘어난 상주 메모리 (memmap 페이지 포함)
+
+
+def current_rss_mb() -> float:
+    """현재 프로세스 상주 메모리 (MB). /proc이 없으면 최대 상주 메모리로 대체"""
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 bytes, Linux는 KB 단위
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+# ============================================================================
+# 1. 코퍼스
+# ============================================================================
+
+_AGENCIES = ("서울중앙지검", "금융감독원", "경찰청", "국세청", "OO카드", "OO캐피탈", "OO은행", "택배사", "건강보험공단")
+_ACTIONS = ("계좌 이체를 요구", "원격 제어 앱 설치를 유도", "현금 전달을 지시", "개인정보 입력을 요구", "상품권 구매를 요구")
+_PLACES = ("서울", "부산", "대구", "인천", "광주", "대전", "수원", "전주", "청주", "제주")
+
+
+def synthetic_articles(n: int, seed: int = 0, vocab_size: int = 20000) -> Iterator[dict[str, Any]]:
+    """
+    보이스피싱 기사 형태의 합성 기사 생성 (주제 키워드 + Zipf 분포 어휘 + 날짜)
+
+    실제 기사처럼 일부 어휘가 흔하고 대부분은 드물도록 Zipf 분포로 단어를 뽑아
+    BM25 postings 길이가 현실적인 분포를 갖게 합니다.
+    """
+    rng = random.Random(seed)
+    syllables = [chr(0xAC00 + i * 7) for i in range(1500)]
+    vocab = ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(vocab_size)]
+    weights = [1.0 / (r + 1) for r in range(vocab_size)]
+    topics = list(TOPIC_KEYWORDS.items())
+    start = dt.date(2019, 1, 1)
+    for i in range(n):
+        label, keywords = topics[rng.randrange(len(topics))]
+        words = rng.choices(vocab, weights=weights, k=60)
+        sentences = [
+            f"{rng.choice(_PLACES)}에서 {rng.choice(_AGENCIES)}을 사칭한 일당이 {rng.choice(_ACTIONS)}했다.",
+            f"{' '.join(words[:20])} {rng.choice(keywords)} 수법으로 {rng.randint(1, 990)}0만원을 가로챘다.",
+            f"{' '.join(words[20:40])} {rng.choice(keywords)}.",
+            f"{' '.join(words[40:])} 경찰은 {label} 피해 예방을 당부했다.",
+        ]
+        yield normalize_article({
+            "headline": f"{rng.choice(_PLACES)} {label} {rng.choice(keywords)} 피해 {' '.join(words[:3])}",
+            "body": " ".join(sentences),
+            "date": (start + dt.timedelta(days=rng.randrange(365 * 7))).isoformat(),
+            "url": f"synthetic://{seed}/{i}",
+        })
+
+
+def sample_articles(path: str | Path) -> Iterator[dict[str, Any]]:
+    """실제 기사 덤프(JSONL/CSV)에서 정규화된 기사를 순서대로 반환"""
+    for raw in read_articles(path):
+        article = normalize_article(raw)
+        if article is not None:
+            yield article
+
+
+def build_corpus(index_dir: str | Path, articles: Iterator[dict[str, Any]], rows: int) -> tuple[NewsIndex, float]:
+    """
+    기사 청크 rows개로 새 인덱스 구축 (중복 제거 없이 임베딩 + append만 측정)
+
+    Returns:
+        (인덱스, 구축 시간 초) - 구축 시간에는 임베딩, 벡터/메타데이터, BM25, facet 기록이 포함됨
+    """
+    started = time.perf_counter()
+    index = NewsIndex.create(index_dir)
+    texts: list[str] = []
+    records: list[dict[str, Any]] = []
+
+    def flush() -> None:
+        if records:
+            index.append(index.embedder.embed(texts), records)
+            texts.clear()
+            records.clear()
+
+    total = 0
+    for article in articles:
+        for text, record in iter_chunks(article):
+            texts.append(text)
+            records.append(record)
+            total += 1
+            if len(records) >= _APPEND_ROWS:
+                flush()
+            if total >= rows:
+                break
+        if total >= rows:
+            break
+    flush()
+    return index, time.perf_counter() - started
+
+
+def make_queries(index: NewsIndex, n: int, seed: int = 0) -> list[str]:
+    """인덱스 행에서 무작위로 고른 문장 일부로 쿼리 생성 (사용자가 상황을 짧게 설명하는 형태)"""
+    rng = np.random.default_rng(seed)
+    rows = np.sort(rng.integers(0, len(index), size=min(n, len(index))))
+    queries = []
+    for record in index.get_records(rows):
+        words = (record.get("snippet") or record.get("headline") or "").split()
+        if not words:
+            continue
+        size = int(rng.integers(2, 7))
+        lo = int(rng.integers(0, max(1, len(words) - size)))
+        queries.append(" ".join(words[lo:lo + size]))
+    return queries
+
+
+# ============================================================================
+# 2. 측정
+# ============================================================================
+
+def _configure(index: NewsIndex, mode: str) -> str:
+    """인덱스를 벤치마크 모드로 설정하고 search_hits()의 검색 모드를 반환"""
+    index.quantization = "int8" if mode == "int8" else "none"
+    index.vector_backend = "hnsw" if mode == "hnsw" else "flat"
+    return "hybrid" if mode == "hybrid" else "vector"
+
+
+def run_benchmark(
+    index_dir: str | Path,
+    modes: tuple[str, ...] = MODES,
+    num_queries: int = 200,
+    top_k: int = 10,
+    since: str | None = None,
+    topic: str | None = None,
+    base_build_seconds: float = 0.0,
+    seed: int = 0,
+    build: bool = True,
+) -> list[BenchmarkResult]:
+    """
+    구축된 인덱스에서 모드별 검색 성능 측정
+
+    모드마다 인덱스를 새로 열어 이전 모드의 memmap 페이지가 상주 메모리 측정에 섞이지 않게 하고,
+    build면 int8/hnsw 파일이 없을 때 먼저 구축해 그 시간을 build_seconds로 기록합니다.
+
+    Args:
+        index_dir: 인덱스 디렉터리
+        modes: 측정할 모드 ("flat", "int8", "hnsw", "hybrid")
+        num_queries: 쿼리 수
+        top_k: recall@k의 k
+        since/topic: 선택. 모든 모드(정답 포함)에 같은 facet 필터 적용
+        base_build_seconds: 기본 인덱스 구축 시간 (flat/hybrid 결과에 기록)
+        seed: 쿼리 샘플링 시드
+        build: False면 인덱스를 수정하지 않고, 필요한 파일이 없는 모드는 건너뜀
+
+    Returns:
+        모드별 BenchmarkResult
+    """
+    index = NewsIndex.open(index_dir)
+    queries = make_queries(index, num_queries, seed)
+    _configure(index, "flat")
+    truth = [rows for rows, _ in index.search_hits(queries, top_k=top_k, mode="vector", since=since, topic=topic)]
+    index.close()
+
+    results = []
+    for mode in modes:
+        if mode not in MODES:
+            raise ValueError(f"알 수 없는 벤치마크 모드입니다: {mode} ({', '.join(MODES)})")
+        index = NewsIndex.open(index_dir)
+        build_seconds = base_build_seconds
+        if not build:
+            missing = (
+                (mode == "int8" and not index.quantized_ready)
+                or (mode == "hnsw" and not HNSWGraph.exists(Path(index_dir) / HNSW_DIR))
+            )
+            index.close()
+            if missing:
+                print(f"⚠️  {mode}: 필요한 파일이 없어 건너뜀 (--build면 복사본에 구축 후 측정)")
+                continue
+        else:
+            started = time.perf_counter()
+            if mode == "int8" and not index.quantized_ready:
+                index.build_quantized()
+                build_seconds = time.perf_counter() - started
+            elif mode == "hnsw":
+                if index.build_hnsw():
+                    build_seconds = time.perf_counter() - started
+            index.close()
+
+        index = NewsIndex.open(index_dir)
+        search_mode = _configure(index, mode)
+        rss_before = current_rss_mb()
+        found = []
+        latencies = np.empty(len(queries))
+        for i, query in enumerate(queries):
+            started = time.perf_counter()
+            rows, _ = index.search_hits([query], top_k=top_k, mode=search_mode, since=since, topic=topic)[0]
+            index.get_records(rows)
+            latencies[i] = (time.perf_counter() - started) * 1000
+            found.append(rows)
+        rss_after = current_rss_mb()
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(queries) else (0.0, 0.0, 0.0)
+        results.append(BenchmarkResult(
+            mode=mode,
+            rows=len(index),
+            queries=len(queries),
+            top_k=top_k,
+            recall=recall_at_k(found, truth),
+            p50_ms=float(p50),
+            p95_ms=float(p95),
+            p99_ms=float(p99),
+            build_seconds=build_seconds,
+            rss_mb=rss_after,
+            rss_delta_mb=rss_after - rss_before,
+        ))
+        index.close()
+    return results
+
+
+def print_report(results: list[BenchmarkResult]) -> None:
+    if not results:
+        return
+    k = results[0].top_k
+    print(
+        f"\n{'mode':<7} {'rows':>9} {'recall@' + str(k):>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'build s':>8} {'RSS MB':>8} {'ΔRSS MB':>8}"
+    )
+    for r in results:
+        print(
+            f"{r.mode:<7} {r.rows:>9} {r.recall:>10.3f} {r.p50_ms:>8.2f} {r.p95_ms:>8.2f} {r.p99_ms:>8.2f} "
+            f"{r.build_seconds:>8.1f} {r.rss_mb:>8.1f} {r.rss_delta_mb:>8.1f}"
+        )
+
+
+def main():
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="뉴스 RAG 검색 모드별 recall/지연/구축 시간/메모리 벤치마크")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--sample", help="샘플 코퍼스로 쓸 기사 덤프 (JSONL/CSV). 없으면 합성 코퍼스")
+    source.add_argument("--index-dir", help="이미 구축된 인덱스를 읽기 전용으로 측정 (int8/hnsw 파일이 없는 모드는 건너뜀)")
+    parser.add_argument("--build", action="store_true", help="--index-dir를 임시 복사본(또는 --keep)으로 복사해 int8/hnsw를 구축한 뒤 측정")
+    parser.add_argument("--rows", type=int, default=20000, help="구축할 청크 수 (--index-dir이면 무시)")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"측정할 모드 (쉼표 구분, 기본 {','.join(MODES)})")
+    parser.add_argument("--queries", type=int, default=200, help="쿼리 수")
+    parser.add_argument("--top-k", type=int, default=10, help="recall@k의 k")
+    parser.add_argument("--since", help="facet 필터: 이 날짜(YYYY-MM-DD) 이후")
+    parser.add_argument("--topic", help="facet 필터: 주제 라벨")
+    parser.add_argument("--seed", type=int, default=0, help="합성 코퍼스/쿼리 시드")
+    parser.add_argument("--keep", help="구축한 벤치마크 인덱스(또는 --build 복사본)를 이 경로에 남김 (기본: 임시 디렉터리 후 삭제)")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로 (회귀 비교용)")
+    args = parser.parse_args()
+    if args.build and not args.index_dir:
+        parser.error("--build는 --index-dir와 함께 사용합니다.")
+    modes = tuple(m.strip() for m in args.modes.split(",") if m.strip())
+
+    tmp_dir = None
+    build_seconds = 0.0
+    if args.index_dir and not args.build:
+        index_dir = Path(args.index_dir)
+    else:
+        if args.keep:
+            index_dir = Path(args.keep)
+        else:
+            tmp_dir = tempfile.mkdtemp(prefix="rag_bench_")
+            index_dir = Path(tmp_dir) / "index"
+
+    if args.build:
+        # 운영 인덱스는 건드리지 않고 복사본에만 int8/HNSW 구축
+        shutil.copytree(args.index_dir, index_dir, ignore=shutil.ignore_patterns(DEDUP_FILE, "*.tmp"))
+        print(f"📋 {args.index_dir} → {index_dir} 복사본에서 측정")
+    elif not args.index_dir:
+        articles = sample_articles(args.sample) if args.sample else synthetic_articles(args.rows, seed=args.seed)
+        index, build_seconds = build_corpus(index_dir, articles, args.rows)
+        print(f"🏗️  {'샘플' if args.sample else '합성'} 코퍼스 {len(index)}행 구축: {build_seconds:.1f}s")
+        index.close()
+
+    try:
+        results = run_benchmark(
+            index_dir, modes,
+            num_queries=args.queries, top_k=args.top_k,
+            since=args.since, topic=args.topic,
+            base_build_seconds=build_seconds, seed=args.seed,
+            build=not args.index_dir or args.build,
+        )
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, ensure_ascii=False, indent=2)
+        print(f"\n💾 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
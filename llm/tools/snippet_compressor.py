@@ -0,0 +1,121 @@
+# RAG 뉴스 스니펫 추출 요약 (로컬, LLM 호출 없음)
+# 검색된 기사 블록 전체 대신 시나리오 주제·최신 사용자 발화와 겹치는 문장만 토큰 예산 안에서 골라
+# 매 턴 다시 보내는 시스템 프롬프트의 입력 토큰을 줄임. Roleplaying, Guardian 공통 사용.
+
+import math
+import re
+from typing import Any
+
+from .news_index.ngram import text_terms
+
+
+# 압축 후 뉴스 컨텍스트 토큰 예산 (헤드라인 포함)
+DEFAULT_TOKEN_BUDGET = 300
+
+# 점수 가중치: 최신 사용자 발화와의 겹침이 주제 겹침보다 중요 (대화 흐름에 맞는 사례 문장 우선)
+USER_WEIGHT = 1.0
+TOPIC_WEIGHT = 0.6
+LEAD_BONUS = 0.1            # 기사 첫 문장 가산점 (리드 문장에 요지가 있는 경우가 많음)
+
+# 이미 고른 문장과 term 집합 Jaccard 유사도가 이 이상이면 중복으로 보고 제외 (청크 겹침 문장 등)
+REDUNDANCY_THRESHOLD = 0.6
+
+_SENTENCE_RE = re.compile(r"[^.!?。\n]+[.!?。]?")
+_HANGUL_RE = re.compile(r"[가-힣]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 보수적 추정 (한글 음절 ≈ 1토큰, 그 외 문자 ≈ 4자당 1토큰)
+
+    tokenizer 없이 예산 판단에만 쓰므로 실제보다 약간 크게 잡습니다.
+    """
+    hangul = len(_HANGUL_RE.findall(text))
+    other = len(text.replace(" ", "")) - hangul
+    return hangul + math.ceil(other / 4)
+
+
+def split_sentences(text: str) -> list[str]:
+    """문장 단위 분할 (빈 문장 제외)"""
+    return [s.strip() for s in _SENTENCE_RE.findall(text or "") if s.strip()]
+
+
+def _weights(terms: list[str], idf: dict[str, float]) -> dict[str, float]:
+    return {t: idf.get(t, 1.0) for t in set(terms)}
+
+
+def compress_results(
+    results: list[dict[str, Any]],
+    topic: str = "",
+    user_message: str = "",
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> list[dict[str, Any]]:
+    """
+    검색 결과의 snippet을 관련 문장만 남기도록 압축
+
+    문장 점수 = 주제/사용자 발화 n-gram 중 문장에 등장한 것의 idf 합 (문장 길이로 정규화).
+    idf는 검색된 문장들 안에서 계산하므로 모든 기사에 공통인 "보이스피싱" 같은 term은 점수가 낮습니다.
+    점수 순으로 예산이 찰 때까지 고르고, 기사별로 원래 문장 순서를 유지합니다.
+    문장이 하나도 뽑히지 않은 기사는 결과에서 뺍니다.
+
+    Args:
+        results: search_voice_phishing_cases 결과 (headline, snippet, ...)
+        topic: 시나리오 주제
+        user_message: 최신 사용자 발화 (없으면 주제만 사용)
+        token_budget: 헤드라인 + 선택 문장의 추정 토큰 상한
+
+    Returns:
+        snippet이 압축된 결과 복사본 목록 (원래 순서 유지)
+    """
+    sentences: list[tuple[int, int, str, set[str]]] = []  # (결과 번호, 문장 번호, 문장, term 집합)
+    for i, r in enumerate(results):
+        for j, s in enumerate(split_sentences(r.get("snippet", ""))):
+            sentences.append((i, j, s, set(text_terms(s))))
+    if not sentences:
+        return [dict(r) for r in results]
+
+    df: dict[str, int] = {}
+    for _, _, _, terms in sentences:
+        for t in terms:
+            df[t] = df.get(t, 0) + 1
+    n = len(sentences)
+    idf = {t: math.log(1.0 + n / c) for t, c in df.items()}
+    user_w = _weights(text_terms(user_message), idf)
+    topic_w = _weights(text_terms(topic), idf)
+
+    scored = []
+    for i, j, s, terms in sentences:
+        overlap = (
+            USER_WEIGHT * sum(w for t, w in user_w.items() if t in terms)
+            + TOPIC_WEIGHT * sum(w for t, w in topic_w.items() if t in terms)
+        )
+        score = overlap / math.sqrt(len(terms) + 1) + (LEAD_BONUS if j == 0 else 0.0)
+        scored.append((score, -i, -j, i, j, s, terms))
+    # 점수가 같으면 앞선 기사·앞선 문장 우선
+    scored.sort(reverse=True)
+
+    used = 0
+    headline_paid: set[int] = set()
+    chosen: dict[int, list[tuple[int, str]]] = {}
+    chosen_terms: list[set[str]] = []
+    for _, _, _, i, j, s, terms in scored:
+        if any(terms and len(terms & c) / len(terms | c) >= REDUNDANCY_THRESHOLD for c in chosen_terms):
+            continue
+        cost = estimate_tokens(s)
+        if i not in headline_paid:
+            cost += estimate_tokens(results[i].get("headline", ""))
+        if used + cost > token_budget:
+            continue
+        used += cost
+        headline_paid.add(i)
+        chosen.setdefault(i, []).append((j, s))
+        chosen_terms.append(terms)
+
+    compressed = []
+    for i, r in enumerate(results):
+        if i not in chosen:
+            continue
+        item = dict(r)
+        item["snippet"] = " ".join(s for _, s in sorted(chosen[i]))
+        compressed.append(item)
+    return compressed
@@ -1,10 +1,80 @@
 # 공용 RAG 도구: 보이스피싱·금융사기 뉴스 사례 검색
 # Roleplaying, Guardian 등 여러 에이전트가 동일 도구 사용. RAG는 여기 한 곳에만 연결.
 
+import asyncio
+import datetime as dt
+import threading
+import time
+import weakref
 from typing import Any
 
+from .news_index import CacheStats, NewsIndex, ResultCache, make_query_key
+from .news_index.config import (
+    ASYNC_BATCH_WINDOW,
+    INDEX_DIR,
+    INDEX_RELOAD_INTERVAL,
+    RAG_CACHE_SIZE,
+    RAG_CACHE_TTL,
+)
 
-def search_voice_phishing_cases(query: str, top_k: int = 3) -> list[dict[str, Any]]:
+
+# ============================================================================
+# 전역 인덱스 인스턴스 (싱글톤)
+# - 첫 검색 시 열고 프로세스 내에서 재사용 (memmap이므로 여는 비용은 manifest 읽기뿐)
+# ============================================================================
+
+_news_index: NewsIndex | None = None
+_news_index_lock = threading.Lock()
+_news_index_checked_at = 0.0
+
+# 프로세스 공용 검색 결과 캐시 (모든 세션 공유, generation 변경 시 자동 무효화)
+_result_cache = ResultCache(max_entries=RAG_CACHE_SIZE, ttl_seconds=RAG_CACHE_TTL)
+
+# 인덱스가 아직 구축되지 않았을 때 반환하는 안내 결과
+_PLACEHOLDER_RESULTS = [
+    {
+        "headline": "[RAG 미구축] 검색 결과는 데이터 수집·인덱스 구축 후 연동됩니다.",
+        "snippet": "보이스피싱, 스미싱, 투자 사기 등 매일경제 뉴스 기반 사례가 여기에 채워집니다.",
+        "source": "news_index (미구축)",
+        "date": None,
+    }
+]
+
+
+def get_news_index() -> NewsIndex | None:
+    """
+    뉴스 인덱스 싱글톤 반환
+
+    Returns:
+        NewsIndex, 인덱스 디렉터리가 없으면 None
+    """
+    global _news_index, _news_index_checked_at
+    now = time.monotonic()
+    if _news_index is not None and now - _news_index_checked_at < INDEX_RELOAD_INTERVAL:
+        return _news_index
+    with _news_index_lock:
+        if _news_index is None or now - _news_index_checked_at >= INDEX_RELOAD_INTERVAL:
+            _news_index_checked_at = now
+            if _news_index is None:
+                if NewsIndex.exists(INDEX_DIR):
+                    _news_index = NewsIndex.open(INDEX_DIR)
+            else:
+                # 재수집으로 manifest generation이 바뀌었으면 다시 연결 → 결과 캐시도 자동 무효화
+                _news_index.reload()
+    return _news_index
+
+
+def get_rag_cache_stats() -> CacheStats:
+    """검색 결과 캐시 카운터 (hits, misses, evictions, expirations, invalidations, size)"""
+    return _result_cache.stats()
+
+
+def search_voice_phishing_cases(
+    query: str,
+    top_k: int = 3,
+    since: str | dt.date | None = None,
+    topic: str | None = None,
+) -> list[dict[str, Any]]:
     """
     매일경제 뉴스 기반 보이스피싱·금융사기 사례를 검색합니다.
     Roleplaying(대사 생성), Guardian(위험 설명) 등에서 공통 사용.
@@ -12,27 +82,138 @@ def search_voice_phishing_cases(query: str, top_k: int = 3) -> list[dict[str, An
     Args:
         query: 검색할 키워드/상황 설명 (예: "카드사 개인정보 유출", "정부 지원금")
         top_k: 반환할 문서 개수 (기본 3)
+        since: 선택. 이 날짜("YYYY-MM-DD", 포함) 이후 보도된 사례만
+        topic: 선택. 시나리오 주제 (예: "카드사 사칭", "검찰 사칭"). 해당 주제로 분류된 기사만
 
     Returns:
         list[dict]: 각 항목은 { "headline", "snippet", "source", "date" } 등
     """
-    # TODO: ChromaDB 등 벡터 DB에서 query로 검색 후 top_k개 반환
-    # RAG 연동 시 이 함수 내부만 구현하면 Roleplaying·Guardian 모두 자동 반영
-    _ = query, top_k
-    return [
-        {
-            "headline": "[RAG 미구축] 검색 결과는 데이터 수집·벡터 DB 구축 후 연동됩니다.",
-            "snippet": "보이스피싱, 스미싱, 투자 사기 등 매일경제 뉴스 기반 사례가 여기에 채워집니다.",
-            "source": "ChromaDB (예정)",
-            "date": None,
-        }
-    ]
-
-
-def format_rag_result_for_llm(results: list[dict[str, Any]]) -> str:
-    """RAG 검색 결과를 LLM에 넘길 텍스트로 포맷. 에이전트 공통 사용."""
+    return search_many([query], top_k=top_k, since=since, topic=topic)[0]
+
+
+def search_many(
+    queries: list[str],
+    top_k: int = 3,
+    since: str | dt.date | None = None,
+    topic: str | None = None,
+) -> list[list[dict[str, Any]]]:
+    """
+    여러 쿼리를 한 번에 검색합니다.
+    캐시에 없는 쿼리만 모아 한 번의 임베딩 + 행렬곱으로 점수화하므로 N번 개별 스캔보다 저렴합니다.
+    since/topic 필터는 점수 계산 전에 facet 색인으로 후보를 좁히므로 필터가 붙으면 오히려 더 저렴합니다.
+
+    Args:
+        queries: 검색 쿼리 목록
+        top_k: 쿼리별 반환 문서 개수 (기본 3)
+        since: 선택. 이 날짜 이후 보도된 사례만 (모든 쿼리에 공통 적용)
+        topic: 선택. 시나리오 주제 (모든 쿼리에 공통 적용)
+
+    Returns:
+        list[list[dict]]: 쿼리 순서대로 search_voice_phishing_cases와 같은 형식의 결과
+    """
+    # 인덱스(news_index)가 없으면 안내 결과 반환 → 에이전트는 그대로 동작
+    index = get_news_index()
+    if index is None or len(index) == 0:
+        return [[dict(r) for r in _PLACEHOLDER_RESULTS] for _ in queries]
+    
+    generation = index.generation
+    if isinstance(since, dt.date):
+        since = since.isoformat()
+    keys = [make_query_key(q, top_k, since, topic) for q in queries]
+    found: dict[tuple, list[dict[str, Any]]] = {}
+    missing: dict[tuple, str] = {}
+    for query, key in zip(queries, keys):
+        if key in found or key in missing:
+            continue
+        cached = _result_cache.get(key, generation=generation)
+        if cached is None:
+            missing[key] = query
+        else:
+            found[key] = cached
+    
+    if missing:
+        batch = index.search_many(list(missing.values()), top_k=top_k, since=since, topic=topic)
+        for key, results in zip(missing, batch):
+            _result_cache.put(key, results, generation=generation)
+            found[key] = results
+    
+    # 호출 측에서 결과 dict를 수정해도 캐시가 오염되지 않도록 복사본 반환
+    return [[dict(r) for r in found[key]] for key in keys]
+
+
+class _AsyncBatcher:
+    """
+    이벤트 루프별 마이크로 배치 수집기
+
+    ASYNC_BATCH_WINDOW 안에 들어온 asearch() 요청을 (top_k, since, topic)별로 모아
+    스레드에서 search_many()를 한 번 실행하고 각 future에 결과를 나눠줍니다.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.pending: dict[tuple, list[tuple[str, asyncio.Future]]] = {}
+
+    def submit(self, query: str, top_k: int, since: str | None, topic: str | None) -> asyncio.Future:
+        future = self.loop.create_future()
+        if not self.pending:
+            self.loop.call_later(ASYNC_BATCH_WINDOW, self._flush)
+        self.pending.setdefault((top_k, since, topic), []).append((query, future))
+        return future
+
+    def _flush(self) -> None:
+        pending, self.pending = self.pending, {}
+        for options, items in pending.items():
+            self.loop.create_task(self._run(options, items))
+
+    async def _run(self, options: tuple, items: list[tuple[str, asyncio.Future]]) -> None:
+        top_k, since, topic = options
+        try:
+            batch = await asyncio.to_thread(search_many, [q for q, _ in items], top_k, since, topic)
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), results in zip(items, batch):
+            if not future.done():
+                future.set_result(results)
+
+
+_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _AsyncBatcher]" = weakref.WeakKeyDictionary()
+
+
+async def asearch(
+    query: str,
+    top_k: int = 3,
+    since: str | dt.date | None = None,
+    topic: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    search_voice_phishing_cases의 비동기 버전
+
+    이벤트 루프를 막지 않고, 동시에 들어온 여러 세션의 쿼리를 하나의 배치로 묶어 처리합니다.
+    """
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None:
+        batcher = _batchers[loop] = _AsyncBatcher(loop)
+    if isinstance(since, dt.date):
+        since = since.isoformat()
+    return await batcher.submit(query, top_k, since, topic)
+
+
+def format_rag_result_for_llm(results: list[dict[str, Any]] | list[list[dict[str, Any]]]) -> str:
+    """
+    RAG 검색 결과를 LLM에 넘길 텍스트로 포맷. 에이전트 공통 사용.
+    search_many()의 쿼리별 결과 목록을 그대로 넘기면 쿼리마다 구분해 포맷합니다.
+    """
     if not results:
         return "검색 결과가 없습니다."
+    if isinstance(results[0], list):
+        return "\n\n".join(
+            f"### 검색 {i+1}\n{format_rag_result_for_llm(group)}"
+            for i, group in enumerate(results)
+        )
     return "\n\n".join(
         f"[{i+1}] {r.get('headline','')}\n{r.get('snippet','')}"
         for i, r in enumerate(results)
@@ -55,6 +236,14 @@ RAG_TOOL_DEFINITION = {
                 "description": "가져올 문서 개수",
                 "default": 3,
             },
+            "since": {
+                "type": "string",
+                "description": "이 날짜(YYYY-MM-DD) 이후 보도된 사례만 검색 (선택)",
+            },
+            "topic": {
+                "type": "string",
+                "description": "시나리오 주제로 한정 (선택, 예: 카드사 사칭, 검찰 사칭, 대출 사기)",
+            },
         },
         "required": ["query"],
     },
@@ -6,13 +6,22 @@ from .llm import (
     get_evaluation_llm,
     get_guardian_llm,
     get_summary_llm,
+    get_topic_llm,
+    get_llm_cache_stats,
 )
+from .scenario_topics import TopicMatch, canonical_topic, resolve_scenario_topic
+from .semantic_cache import get_semantic_cache, get_semantic_cache_stats
+from .guardian_cache import education_key, get_explanation, aget_explanation, get_guardian_cache, get_guardian_cache_stats
 from .memory import (
     get_short_term_messages,
     update_memory,
+    aupdate_memory,
     build_context_for_llm,
     should_summarize,
     summarize_messages,
+    asummarize_messages,
+    deferred_summary_jobs,
+    get_summary_stats,
 )
 
 __all__ = [
@@ -23,10 +32,29 @@ __all__ = [
     "get_evaluation_llm",
     "get_guardian_llm",
     "get_summary_llm",
+    "get_topic_llm",
+    "get_llm_cache_stats",
+    # Scenario topics
+    "TopicMatch",
+    "canonical_topic",
+    "resolve_scenario_topic",
+    # Semantic cache
+    "get_semantic_cache",
+    "get_semantic_cache_stats",
+    # Guardian education cache
+    "education_key",
+    "get_explanation",
+    "aget_explanation",
+    "get_guardian_cache",
+    "get_guardian_cache_stats",
     # Memory
     "get_short_term_messages",
     "update_memory",
+    "aupdate_memory",
     "build_context_for_llm",
     "should_summarize",
     "summarize_messages",
+    "asummarize_messages",
+    "deferred_summary_jobs",
+    "get_summary_stats",
 ]
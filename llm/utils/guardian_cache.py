@@ -0,0 +1,404 @@
+# Guardian 교육 설명 캐시 (시나리오 주제 × 노출 정보 분류)
+# Guardian은 사용자가 방금 정보를 노출한 순간 개입하므로 지연이 교육 효과에 가장 큰 영향을 줌.
+# RAG 검색 + Guardian LLM(max_tokens=1024) 호출 결과 중 "왜 위험한지·실제 사례·지금 할 일" 설명은
+# (주제, 분류) 조합마다 거의 같으므로 미리 생성해 두고, 실행 시에는 감지 이유·노출 정보만 로컬에서 채움.
+#
+# - 키: (정식 주제 라벨, detected_info 분류)  예: ("카드사 사칭", "카드번호")
+# - 저장: JSON 파일 (VOICE_GUARDIAN_GUARDIAN_CACHE_PATH, 기본 data/guardian_messages.json)
+# - 항목마다 생성 당시 뉴스 인덱스 generation 기록 → 재수집 후에는 stale로 표시
+#   (stale 설명도 즉시 사용하고, 사전 생성 CLI가 stale 항목만 다시 생성)
+# - 처음 보는 조합만 실행 중 생성 (VOICE_GUARDIAN_GUARDIAN_LIVE=0이면 생성하지 않고 기본 안내 사용)
+# - 여러 프로세스(Streamlit 워커, 사전 생성 CLI)가 같은 파일을 공유:
+#   조회 시 파일 mtime이 바뀌었으면 다시 읽고, 저장 시 파일 lock 아래에서 디스크 내용과 병합한 뒤 교체
+#
+# 사전 생성 / 갱신:
+#   python -m llm.utils.guardian_cache                     # 없는 조합 + stale 항목 생성
+#   python -m llm.utils.guardian_cache --topics "카드사 사칭" --categories 카드번호,계좌번호 --force
+#   python -m llm.utils.guardian_cache --list
+
+import argparse
+import datetime as dt
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any
+
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:  # Windows: lock 없이 병합만 수행
+    fcntl = None
+
+from ..tools.pii_detector import DETECTED_INFO_CATEGORIES, OTHER_CATEGORY, categorize_detected_info
+from ..tools.snippet_compressor import compress_results
+from ..tools.voice_phishing_rag import (
+    asearch,
+    format_rag_result_for_llm,
+    get_news_index,
+    search_voice_phishing_cases,
+)
+from .llm import get_guardian_llm
+from .scenario_topics import SCENARIO_ALIASES, canonical_topic
+
+
+GUARDIAN_CACHE_PATH = Path(os.environ.get(
+    "VOICE_GUARDIAN_GUARDIAN_CACHE_PATH",
+    Path(__file__).resolve().parents[2] / "data" / "guardian_messages.json",
+))
+
+# 캐시에 없는 조합을 실행 중 생성할지 여부
+GUARDIAN_LIVE_GENERATION = os.environ.get("VOICE_GUARDIAN_GUARDIAN_LIVE", "1") != "0"
+
+# 주제를 알 수 없을 때의 키 (보이스피싱 전반 설명)
+GENERAL_TOPIC = ""
+
+GUARDIAN_CATEGORIES = tuple(category for category, _ in DETECTED_INFO_CATEGORIES) + (OTHER_CATEGORY,)
+
+# 설명에 넣을 뉴스 문장 토큰 예산
+_NEWS_TOKEN_BUDGET = 250
+
+EXPLANATION_PROMPT = """당신은 보이스피싱 예방 훈련의 **가디언 에이전트**입니다.
+훈련 중 어르신이 사기범 역할에게 아래 정보를 노출했습니다. 이 상황에 보여줄 교육 설명을 작성하세요.
+
+## 시나리오 주제
+{topic}
+
+## 노출된 정보 분류
+{category}
+
+## 관련 실제 뉴스 사례
+{news}
+
+## 작성 규칙
+- "💡"로 시작하는 짧은 문단 3개: (1) 이 정보가 이 수법에서 왜 위험한지 (2) 뉴스 사례 한 가지를 한두 문장으로 (사례가 없으면 일반적인 피해 유형) (3) 지금 바로 할 일 (지급정지 112·1332, 카드 정지, 비밀번호 변경 등 해당되는 것만)
+- 어르신이 이해하기 쉬운 존댓말, 전체 8문장 이내
+- 특정 사용자 이름·번호 같은 개인 정보는 쓰지 마세요 (여러 사용자에게 재사용되는 설명입니다)
+- 인사말이나 "다른 상황도 연습해볼까요?" 같은 마무리 문구는 넣지 마세요"""
+
+
+@dataclass
+class GuardianCacheStats:
+    """교육 설명 캐시 카운터 스냅샷"""
+    hits: int = 0            # 현재 인덱스 generation으로 만든 설명 적중
+    stale_hits: int = 0      # 재수집 이전 설명 적중 (그대로 사용, 사전 생성 CLI로 갱신 대상)
+    misses: int = 0
+    generated: int = 0       # 실행 중 또는 사전 생성으로 새로 만든 설명 수
+    errors: int = 0          # 생성 실패 (기본 안내로 대체)
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.stale_hits + self.misses
+        return (self.hits + self.stale_hits) / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+def _index_generation() -> int:
+    index = get_news_index()
+    return index.generation if index is not None else 0
+
+
+def education_key(scenario_topic: str, evaluation_result: dict[str, Any] | None) -> tuple[str, str]:
+    """
+    상태 → 캐시 키 (정식 주제 라벨, 노출 정보 분류)
+
+    분류는 detected_info 중 처음으로 분류되는 항목, 없으면 판단 이유(reason)로 정합니다.
+    """
+    topic = canonical_topic(scenario_topic or "")
+    if topic not in SCENARIO_ALIASES:
+        topic = GENERAL_TOPIC
+    evaluation_result = evaluation_result or {}
+    for label in [*evaluation_result.get("detected_info", []), evaluation_result.get("reason", "")]:
+        category = categorize_detected_info(label)
+        if category != OTHER_CATEGORY:
+            return topic, category
+    return topic, OTHER_CATEGORY
+
+
+class GuardianMessageCache:
+    """
+    (주제, 분류)별 교육 설명 저장소 (스레드 안전, 파일이 바뀌면 다시 로드)
+
+    Args:
+        path: JSON 파일 경로
+    """
+
+    def __init__(self, path: str | Path = GUARDIAN_CACHE_PATH):
+        self.path = Path(path)
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._mtime: int | None = None
+        # put() 후 아직 파일에 쓰지 않은 항목 (다시 로드해도 유지, 저장 시 디스크 내용 위에 병합)
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stats = GuardianCacheStats()
+
+    @staticmethod
+    def _key(topic: str, category: str) -> str:
+        return f"{topic}|{category}"
+
+    def _file_mtime(self) -> int | None:
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_file(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("entries", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """lock 보유 상태에서 호출 - 다른 프로세스가 파일을 교체했으면 다시 읽음"""
+        mtime = self._file_mtime()
+        if self._entries is None or mtime != self._mtime:
+            self._entries = {**self._read_file(), **self._pending}
+            self._mtime = mtime
+        return self._entries
+
+    def get(self, topic: str, category: str, generation: int | None = None) -> str | None:
+        """저장된 설명 (없으면 None). generation이 다르면 stale 적중으로 집계하고 그대로 반환"""
+        with self._lock:
+            entry = self._load().get(self._key(topic, category))
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            if generation is not None and entry.get("generation") != generation:
+                self._stats.stale_hits += 1
+            else:
+                self._stats.hits += 1
+            return entry["explanation"]
+
+    def is_fresh(self, topic: str, category: str, generation: int) -> bool:
+        with self._lock:
+            entry = self._load().get(self._key(topic, category))
+            return entry is not None and entry.get("generation") == generation
+
+    def put(self, topic: str, category: str, explanation: str, generation: int, save: bool = True) -> None:
+        with self._lock:
+            key = self._key(topic, category)
+            entry = {
+                "topic": topic,
+                "category": category,
+                "explanation": explanation,
+                "generation": generation,
+                "created_at": dt.datetime.now().isoformat(timespec="seconds"),
+            }
+            self._pending[key] = entry
+            self._load()[key] = entry
+            self._stats.generated += 1
+            if save:
+                self._save()
+
+    def count_error(self) -> None:
+        with self._lock:
+            self._stats.errors += 1
+
+    def save(self) -> None:
+        with self._lock:
+            self._save()
+
+    def _save(self) -> None:
+        """
+        디스크 내용과 병합해 저장 (lock 보유 상태에서 호출)
+
+        파일 lock 아래에서 최신 파일을 다시 읽고 이 프로세스가 추가한 항목만 덮어쓰므로
+        다른 프로세스가 그사이 저장한 항목을 지우지 않습니다.
+        임시 파일에 쓴 뒤 교체하므로 읽는 쪽이 반쯤 쓴 파일을 보지 않습니다.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(self.path.suffix + ".lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            entries = {**self._read_file(), **self._pending}
+            tmp = self.path.with_suffix(f"{self.path.suffix}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"entries": entries}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+            self._entries = entries
+            self._mtime = self._file_mtime()
+            self._pending.clear()
+
+    def entries(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [dict(e) for e in self._load().values()]
+
+    def stats(self) -> GuardianCacheStats:
+        with self._lock:
+            return GuardianCacheStats(**{**asdict(self._stats), "size": len(self._load())})
+
+
+_guardian_cache: GuardianMessageCache | None = None
+_guardian_cache_lock = threading.Lock()
+
+
+def get_guardian_cache() -> GuardianMessageCache:
+    """프로세스 공용 교육 설명 캐시"""
+    global _guardian_cache
+    if _guardian_cache is None:
+        with _guardian_cache_lock:
+            if _guardian_cache is None:
+                _guardian_cache = GuardianMessageCache()
+    return _guardian_cache
+
+
+def get_guardian_cache_stats() -> GuardianCacheStats:
+    return get_guardian_cache().stats()
+
+
+# ----------------------------------------------------------------------------
+# 생성 (RAG + Guardian LLM)
+# ----------------------------------------------------------------------------
+
+def _news_query(topic: str, category: str) -> tuple[str, str | None]:
+    """(검색 쿼리, topic 필터) - 주제를 모르면 필터 없이 분류만으로 검색"""
+    return f"{topic or '보이스피싱'} {category} 피해", topic or None
+
+
+def _explanation_prompt(topic: str, category: str, results: list[dict[str, Any]]) -> str:
+    compressed = compress_results(results, topic, category, token_budget=_NEWS_TOKEN_BUDGET)
+    return EXPLANATION_PROMPT.format(
+        topic=topic or "보이스피싱 전반",
+        category=category,
+        news=format_rag_result_for_llm(compressed),
+    )
+
+
+def generate_explanation(topic: str, category: str) -> str:
+    """(주제, 분류) 교육 설명 생성 (RAG 검색 + Guardian LLM 1회)"""
+    query, topic_filter = _news_query(topic, category)
+    results = search_voice_phishing_cases(query, top_k=3, topic=topic_filter)
+    response = get_guardian_llm().invoke(_explanation_prompt(topic, category, results))
+    return response.content.strip()
+
+
+async def agenerate_explanation(topic: str, category: str) -> str:
+    """generate_explanation의 비동기 버전 (asearch + ainvoke)"""
+    query, topic_filter = _news_query(topic, category)
+    results = await asearch(query, top_k=3, topic=topic_filter)
+    response = await get_guardian_llm().ainvoke(_explanation_prompt(topic, category, results))
+    return response.content.strip()
+
+
+def get_explanation(topic: str, category: str, live: bool | None = None) -> str | None:
+    """
+    캐시된 설명, 없으면 (live일 때) 생성 후 저장
+
+    Returns:
+        설명 텍스트, 없고 생성도 못 하면 None (호출 측에서 기본 안내 사용)
+    """
+    cache = get_guardian_cache()
+    generation = _index_generation()
+    explanation = cache.get(topic, category, generation)
+    if explanation is not None or not (GUARDIAN_LIVE_GENERATION if live is None else live):
+        return explanation
+    try:
+        explanation = generate_explanation(topic, category)
+    except Exception as e:
+        cache.count_error()
+        print(f"[경고] 가디언 설명 생성 실패: {e}")
+        return None
+    cache.put(topic, category, explanation, generation)
+    return explanation
+
+
+async def aget_explanation(topic: str, category: str, live: bool | None = None) -> str | None:
+    """get_explanation의 비동기 버전"""
+    cache = get_guardian_cache()
+    generation = _index_generation()
+    explanation = cache.get(topic, category, generation)
+    if explanation is not None or not (GUARDIAN_LIVE_GENERATION if live is None else live):
+        return explanation
+    try:
+        explanation = await agenerate_explanation(topic, category)
+    except Exception as e:
+        cache.count_error()
+        print(f"[경고] 가디언 설명 생성 실패: {e}")
+        return None
+    cache.put(topic, category, explanation, generation)
+    return explanation
+
+
+def precompute(
+    topics: list[str] | None = None,
+    categories: list[str] | None = None,
+    force: bool = False,
+    workers: int = 4,
+) -> dict[str, int]:
+    """
+    (주제, 분류) 조합 설명 사전 생성
+
+    현재 인덱스 generation으로 만든 항목은 건너뛰고(force면 전부 다시 생성), 없는 조합과 stale 항목만 생성합니다.
+
+    Args:
+        topics: 정식 주제 라벨 목록 (기본: 전체 + 주제 미상)
+        categories: 분류 목록 (기본: GUARDIAN_CATEGORIES)
+        force: 최신 항목도 다시 생성
+        workers: 동시 LLM 호출 수
+
+    Returns:
+        {"generated", "skipped", "failed"}
+    """
+    cache = get_guardian_cache()
+    generation = _index_generation()
+    topics = list(SCENARIO_ALIASES) + [GENERAL_TOPIC] if topics is None else topics
+    categories = list(GUARDIAN_CATEGORIES) if categories is None else categories
+    todo = [
+        (t, c) for t in topics for c in categories
+        if force or not cache.is_fresh(t, c, generation)
+    ]
+    counts = {"generated": 0, "skipped": len(topics) * len(categories) - len(todo), "failed": 0}
+
+    def run(key: tuple[str, str]) -> tuple[tuple[str, str], str | None]:
+        try:
+            return key, generate_explanation(*key)
+        except Exception as e:
+            print(f"  ❌ {key[0] or '(주제 미상)'} / {key[1]}: {e}")
+            return key, None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for (topic, category), explanation in executor.map(run, todo):
+            if explanation is None:
+                cache.count_error()
+                counts["failed"] += 1
+                continue
+            cache.put(topic, category, explanation, generation, save=False)
+            counts["generated"] += 1
+            print(f"  ✅ {topic or '(주제 미상)'} / {category}")
+    cache.save()
+    return counts
+
+
+def main():
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="Guardian 교육 설명 사전 생성 (주제 × 노출 정보 분류)")
+    parser.add_argument("--topics", help="쉼표 구분 주제 (기본: 전체 주제 + 주제 미상)")
+    parser.add_argument("--categories", help=f"쉼표 구분 분류 (기본: {','.join(GUARDIAN_CATEGORIES)})")
+    parser.add_argument("--force", action="store_true", help="최신 항목도 다시 생성")
+    parser.add_argument("--workers", type=int, default=4, help="동시 LLM 호출 수")
+    parser.add_argument("--list", action="store_true", help="저장된 항목과 stale 여부만 출력")
+    args = parser.parse_args()
+
+    load_dotenv()
+    if args.list:
+        generation = _index_generation()
+        for e in sorted(get_guardian_cache().entries(), key=lambda e: (e["topic"], e["category"])):
+            state = "fresh" if e["generation"] == generation else "stale"
+            print(f"{e['topic'] or '(주제 미상)'} / {e['category']}: {state} ({e['created_at']})")
+        return
+
+    topics = [canonical_topic(t) for t in args.topics.split(",")] if args.topics else None
+    categories = [c.strip() for c in args.categories.split(",")] if args.categories else None
+    counts = precompute(topics, categories, force=args.force, workers=args.workers)
+    print(f"\n📊 생성 {counts['generated']} · 건너뜀 {counts['skipped']} · 실패 {counts['failed']} → {GUARDIAN_CACHE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,45 @@
 # LLM 설정 유틸리티
 # 에이전트별 ChatAnthropic 인스턴스 관리 (싱글톤 패턴)
+# 결정적(temperature 0) 역할은 로컬 SQLite 응답 캐시를 opt-in으로 사용
 
+import hashlib
+import json
 import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Sequence
+
 from langchain_anthropic import ChatAnthropic
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
 import streamlit as st
 from dotenv import load_dotenv
 
 
+# ============================================================================
+# 응답 캐시 설정
+# ============================================================================
+
+# 캐시를 사용할 역할 (쉼표 구분, 빈 문자열이면 캐시 끔)
+# temperature 0 역할만 기본 활성화 → 같은 입력이면 같은 출력이므로 재호출할 이유가 없음
+LLM_CACHE_ROLES = {
+    role.strip()
+    for role in os.environ.get("VOICE_GUARDIAN_LLM_CACHE_ROLES", "evaluation,summary,topic").split(",")
+    if role.strip()
+}
+
+# 캐시 파일 경로 / 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+LLM_CACHE_PATH = Path(os.environ.get(
+    "VOICE_GUARDIAN_LLM_CACHE_PATH",
+    Path(__file__).resolve().parents[2] / "data" / "llm_cache.sqlite",
+))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("VOICE_GUARDIAN_LLM_CACHE_MAX_ENTRIES", "20000"))
+
+
 # ============================================================================
 # 전역 LLM 인스턴스 (싱글톤)
 # - 인스턴스 생성은 Python 객체 생성일 뿐, API 호출 비용 없음
@@ -18,6 +51,134 @@ _roleplay_llm: ChatAnthropic | None = None
 _evaluation_llm: ChatAnthropic | None = None
 _guardian_llm: ChatAnthropic | None = None
 _summary_llm: ChatAnthropic | None = None
+_topic_llm: ChatAnthropic | None = None
+_response_cache: "SQLiteResponseCache | None" = None
+_response_cache_lock = threading.Lock()
+
+
+@dataclass
+class ResponseCacheStats:
+    """응답 캐시 카운터 스냅샷"""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class SQLiteResponseCache(BaseCache):
+    """
+    내용 주소 기반 LLM 응답 캐시 (langchain BaseCache 구현, ChatAnthropic(cache=...)로 연결)
+    
+    - 키: sha256(llm_string + prompt). llm_string에는 모델명, temperature, max_tokens,
+      바인딩된 tools/structured output 스키마가 모두 들어가므로 설정이 다르면 다른 키
+    - 값: 생성 결과 메시지를 message_to_dict JSON으로 저장
+    - max_entries 초과 시 last_used가 가장 오래된 항목부터 일괄 제거 (LRU)
+    - WAL 모드라 여러 프로세스(Streamlit, 배치 CLI)가 같은 파일을 공유 가능
+    
+    Args:
+        path: SQLite 파일 경로
+        max_entries: 최대 항목 수
+    """
+    
+    def __init__(self, path: str | os.PathLike, max_entries: int = 20000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+        self._conn.commit()
+        self._stats = ResponseCacheStats()
+    
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+    
+    def lookup(self, prompt: str, llm_string: str) -> Sequence[Generation] | None:
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self._stats.hits += 1
+        items = json.loads(row[0])
+        messages = messages_from_dict([item["message"] for item in items])
+        return [ChatGeneration(message=m, generation_info=item.get("info")) for m, item in zip(messages, items)]
+    
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        if not all(isinstance(g, ChatGeneration) for g in return_val):
+            return
+        value = json.dumps(
+            [{"message": message_to_dict(g.message), "info": g.generation_info} for g in return_val],
+            ensure_ascii=False,
+        )
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, last_used) VALUES (?, ?, ?, ?)",
+                (self._key(prompt, llm_string), value, now, now),
+            )
+            self._stats.writes += 1
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                # 매 쓰기마다 지우지 않도록 상한의 10%를 여유로 두고 한 번에 제거
+                excess = count - int(self.max_entries * 0.9)
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN"
+                    " (SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+                self._stats.evictions += excess
+            self._conn.commit()
+    
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+    
+    def stats(self) -> ResponseCacheStats:
+        with self._lock:
+            snapshot = ResponseCacheStats(**{k: v for k, v in asdict(self._stats).items() if k != "size"})
+            snapshot.size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return snapshot
+
+
+def get_response_cache() -> SQLiteResponseCache:
+    """프로세스 공용 응답 캐시 (처음 사용할 때 파일 열기)"""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = SQLiteResponseCache(LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES)
+    return _response_cache
+
+
+def _cache_for(role: str) -> BaseCache | bool:
+    """
+    역할별 ChatAnthropic cache 인자
+    
+    LLM_CACHE_ROLES에 있으면 공용 SQLite 캐시, 없으면 False (전역 캐시 설정과 무관하게 캐시 안 함)
+    """
+    return get_response_cache() if role in LLM_CACHE_ROLES else False
 
 
 def _check_api_key() -> str:
@@ -50,6 +211,7 @@ def get_master_llm() -> ChatAnthropic:
             temperature=0.3,
             max_tokens=512,
             api_key=_check_api_key(),
+            cache=_cache_for("master"),
         )
     return _master_llm
 
@@ -67,6 +229,7 @@ def get_roleplay_llm() -> ChatAnthropic:
             temperature=0.8,
             max_tokens=512,
             api_key=_check_api_key(),
+            cache=_cache_for("roleplay"),
         )
     return _roleplay_llm
 
@@ -76,6 +239,7 @@ def get_evaluation_llm() -> ChatAnthropic:
     Evaluator Agent용 LLM
     - 사용자 응답 평가 (개인정보 노출 여부)
     - temperature=0.0 (일관된 판단, deterministic)
+    - 응답 캐시 기본 사용 (같은 발화 재평가 시 API 호출 생략)
     """
     global _evaluation_llm
     if _evaluation_llm is None:
@@ -84,6 +248,7 @@ def get_evaluation_llm() -> ChatAnthropic:
             temperature=0.0,
             max_tokens=512,
             api_key=_check_api_key(),
+            cache=_cache_for("evaluation"),
         )
     return _evaluation_llm
 
@@ -101,6 +266,7 @@ def get_guardian_llm() -> ChatAnthropic:
             temperature=0.5,
             max_tokens=1024,  # 교육 메시지는 더 길 수 있음
             api_key=_check_api_key(),
+            cache=_cache_for("guardian"),
         )
     return _guardian_llm
 
@@ -110,6 +276,7 @@ def get_summary_llm() -> ChatAnthropic:
     메모리 요약용 LLM
     - 대화 내용 요약
     - temperature=0.0 (일관된 요약)
+    - 응답 캐시 기본 사용
     """
     global _summary_llm
     if _summary_llm is None:
@@ -118,10 +285,34 @@ def get_summary_llm() -> ChatAnthropic:
             temperature=0.0,
             max_tokens=512,
             api_key=_check_api_key(),
+            cache=_cache_for("summary"),
         )
     return _summary_llm
 
 
+def get_topic_llm() -> ChatAnthropic:
+    """
+    시나리오 주제 파싱용 LLM
+    - 사용자 응답에서 주제 추출 (짧은 정형 출력)
+    - temperature=0.0 (같은 표현이면 같은 주제) → 응답 캐시 기본 사용
+    """
+    global _topic_llm
+    if _topic_llm is None:
+        _topic_llm = ChatAnthropic(
+            model="claude-sonnet-4-20250514",
+            temperature=0.0,
+            max_tokens=64,
+            api_key=_check_api_key(),
+            cache=_cache_for("topic"),
+        )
+    return _topic_llm
+
+
+def get_llm_cache_stats() -> ResponseCacheStats:
+    """응답 캐시 카운터 (hits, misses, writes, evictions, size)"""
+    return get_response_cache().stats()
+
+
 # ============================================================================
 # 하위 호환용 함수 (기존 코드 지원)
 # ============================================================================
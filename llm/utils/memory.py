@@ -1,5 +1,24 @@
 # 메모리 관리 유틸리티
 # 단기 메모리 (최근 10턴) + 장기 메모리 (5턴마다 요약)
+#
+# 장기 요약은 기본적으로 백그라운드 스레드에서 생성 (요약 턴의 응답 지연에 LLM 왕복이 더해지지 않도록)
+# - 요약 주기 턴: 요약 작업을 제출하고 작업 ID를 상태(pending_summary_id)에 기록, 이번 턴은 기존 요약 사용
+# - 이후 턴: 작업이 끝났으면 새 요약을 long_term_summary에 반영, 아직이면 기존 요약으로 계속 진행
+# - 이전 작업이 끝나기 전에 다음 요약 주기가 오면 새 작업은 미룸 (요약 대상은 매번 단기 메모리 밖 전체라 누락 없음)
+# - 실패·지연(반영까지 걸린 턴 수/시간)·버려진 작업은 get_summary_stats()로 집계
+# - 추측 실행(speculative) 대사 생성 중에는 deferred_summary_jobs()로 작업 회수·제출을 미루고,
+#   대사를 확정한 뒤에 update_memory를 다시 불러 반영 (버린 대사가 작업 ID를 잃어 고아 작업이 남지 않도록)
+
+import contextvars
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any
 
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 
@@ -10,6 +29,12 @@ from .llm import get_summary_llm
 SHORT_TERM_MAX_TURNS = 10  # 단기 메모리 최대 턴 수
 SUMMARY_INTERVAL = 5       # 요약 주기 (5턴마다)
 
+# 장기 요약을 백그라운드에서 생성할지 여부 (0이면 요약 턴에 동기 호출)
+BACKGROUND_SUMMARY = os.environ.get("VOICE_GUARDIAN_BACKGROUND_SUMMARY", "1") != "0"
+
+# 반영되지 않은 요약 작업 최대 보관 수 (세션이 끝나 회수되지 않은 작업은 오래된 것부터 버림)
+_MAX_SUMMARY_JOBS = 256
+
 
 def get_short_term_messages(
     messages: list[BaseMessage],
@@ -47,22 +72,13 @@ def should_summarize(turn_count: int) -> bool:
     return turn_count > 0 and turn_count % SUMMARY_INTERVAL == 0 and turn_count > SUMMARY_INTERVAL
 
 
-def summarize_messages(
+def _build_summary_prompt(
     messages: list[BaseMessage],
     existing_summary: str = ""
-) -> str:
-    """
-    메시지들을 요약하여 장기 메모리 생성
-    
-    Args:
-        messages: 요약할 메시지 목록
-        existing_summary: 기존 장기 요약 (있으면 이어서 요약)
-        
-    Returns:
-        새로운 장기 요약
-    """
+) -> str | None:
+    """요약 프롬프트 생성 (요약할 대화가 없으면 None)"""
     if not messages:
-        return existing_summary
+        return None
     
     # 메시지를 텍스트로 변환
     dialogue_lines = []
@@ -75,10 +91,10 @@ def summarize_messages(
     dialogue_text = "\n".join(dialogue_lines)
     
     if not dialogue_text.strip():
-        return existing_summary
+        return None
     
     # 요약 프롬프트
-    prompt = f"""다음은 보이스피싱 예방 훈련 롤플레이의 대화 내용입니다.
+    return f"""다음은 보이스피싱 예방 훈련 롤플레이의 대화 내용입니다.
 
 {f"기존 요약:{chr(10)}{existing_summary}{chr(10)}{chr(10)}" if existing_summary else ""}최근 대화:
 {dialogue_text}
@@ -86,6 +102,25 @@ def summarize_messages(
 위 내용을 바탕으로 "지금까지의 시나리오 진행 상황, 사기범의 수법, 사용자의 대응"을 2~4문장으로 요약해주세요.
 기존 요약이 있으면 자연스럽게 이어가고, 핵심 정보만 간결하게 정리하세요.
 한국어로만 출력하고 설명은 붙이지 마세요."""
+
+
+def summarize_messages(
+    messages: list[BaseMessage],
+    existing_summary: str = ""
+) -> str:
+    """
+    메시지들을 요약하여 장기 메모리 생성
+    
+    Args:
+        messages: 요약할 메시지 목록
+        existing_summary: 기존 장기 요약 (있으면 이어서 요약)
+        
+    Returns:
+        새로운 장기 요약
+    """
+    prompt = _build_summary_prompt(messages, existing_summary)
+    if prompt is None:
+        return existing_summary
     
     try:
         llm = get_summary_llm()
@@ -97,11 +132,170 @@ def summarize_messages(
         return existing_summary
 
 
+async def asummarize_messages(
+    messages: list[BaseMessage],
+    existing_summary: str = ""
+) -> str:
+    """summarize_messages의 비동기 버전 (ainvoke 사용)"""
+    prompt = _build_summary_prompt(messages, existing_summary)
+    if prompt is None:
+        return existing_summary
+    
+    try:
+        llm = get_summary_llm()
+        response = await llm.ainvoke(prompt)
+        return response.content.strip()
+    except Exception as e:
+        print(f"[경고] 메모리 요약 실패: {e}")
+        return existing_summary
+
+
+# ============================================================================
+# 백그라운드 요약
+# ============================================================================
+
+# 요약 전용 스레드 풀 (컨텍스트를 복사하지 않으므로 그래프 콜백·스트리밍에 요약 토큰이 섞이지 않음)
+_summary_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory-summary")
+
+
+@dataclass
+class SummaryStats:
+    """장기 요약 카운터 스냅샷"""
+    submitted: int = 0          # 백그라운드로 제출한 요약 작업
+    merged: int = 0             # 이후 턴에 long_term_summary로 반영된 작업
+    failed: int = 0             # 요약 LLM 실패 (기존 요약 유지)
+    deferred: int = 0           # 이전 작업이 진행 중이라 미룬 요약 주기
+    abandoned: int = 0          # 회수되지 않아 버린 작업 (세션 종료, 프로세스 재시작 등)
+    sync: int = 0               # 동기 요약 (BACKGROUND_SUMMARY=0)
+    lag_turns: int = 0          # 제출 → 반영까지 걸린 턴 수 합
+    lag_seconds: float = 0.0    # 제출 → 반영까지 걸린 시간 합
+    pending: int = 0
+    
+    @property
+    def failure_rate(self) -> float:
+        done = self.merged + self.failed
+        return self.failed / done if done else 0.0
+    
+    @property
+    def mean_lag_turns(self) -> float:
+        return self.lag_turns / self.merged if self.merged else 0.0
+    
+    @property
+    def mean_lag_seconds(self) -> float:
+        return self.lag_seconds / self.merged if self.merged else 0.0
+    
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "failure_rate": self.failure_rate,
+            "mean_lag_turns": self.mean_lag_turns,
+            "mean_lag_seconds": self.mean_lag_seconds,
+        }
+
+
+@dataclass
+class _SummaryJob:
+    future: Future
+    turn_count: int
+    submitted_at: float
+
+
+_summary_jobs: OrderedDict[str, _SummaryJob] = OrderedDict()
+_summary_stats = SummaryStats()
+_summary_lock = threading.Lock()
+
+# True인 컨텍스트에서는 요약 작업을 회수·제출하지 않고 이번 턴에 쓸 요약만 미리 봄
+_jobs_deferred: contextvars.ContextVar[bool] = contextvars.ContextVar("summary_jobs_deferred", default=False)
+
+
+@contextmanager
+def deferred_summary_jobs():
+    """
+    이 블록 안의 update_memory는 요약 작업 상태를 바꾸지 않음 (추측 실행용)
+    
+    끝난 작업의 요약은 반영한 것처럼 돌려주되 작업 목록에서 지우지 않고, 새 작업도 제출하지 않습니다.
+    결과를 확정할 때 같은 인자로 update_memory를 다시 호출해 실제로 회수·제출합니다.
+    """
+    token = _jobs_deferred.set(True)
+    try:
+        yield
+    finally:
+        _jobs_deferred.reset(token)
+
+
+def get_summary_stats() -> SummaryStats:
+    """프로세스 공용 장기 요약 카운터"""
+    with _summary_lock:
+        return SummaryStats(**{**asdict(_summary_stats), "pending": len(_summary_jobs)})
+
+
+def _summarize_or_raise(messages: list[BaseMessage], existing_summary: str) -> str:
+    """백그라운드 작업 본문 (실패는 Future 예외로 전달해 집계)"""
+    prompt = _build_summary_prompt(messages, existing_summary)
+    if prompt is None:
+        return existing_summary
+    response = get_summary_llm().invoke(prompt)
+    return response.content.strip()
+
+
+def _submit_summary(messages: list[BaseMessage], existing_summary: str, turn_count: int) -> str:
+    """요약 작업 제출 → 작업 ID"""
+    job_id = uuid.uuid4().hex
+    future = _summary_executor.submit(_summarize_or_raise, messages, existing_summary)
+    with _summary_lock:
+        _summary_jobs[job_id] = _SummaryJob(future, turn_count, time.monotonic())
+        _summary_stats.submitted += 1
+        while len(_summary_jobs) > _MAX_SUMMARY_JOBS:
+            _, old = _summary_jobs.popitem(last=False)
+            old.future.cancel()
+            _summary_stats.abandoned += 1
+    return job_id
+
+
+def _collect_summary(existing_summary: str, pending_summary_id: str, turn_count: int) -> tuple[str, str]:
+    """
+    끝난 요약 작업 반영 → (이번 턴에 쓸 요약, 남은 작업 ID)
+    
+    작업이 아직 진행 중이면 기존 요약과 작업 ID를 그대로 반환합니다 (기다리지 않음).
+    """
+    if not pending_summary_id:
+        return existing_summary, ""
+    with _summary_lock:
+        job = _summary_jobs.get(pending_summary_id)
+        if job is None:
+            return existing_summary, ""   # 이미 버려진 작업
+        if not job.future.done():
+            return existing_summary, pending_summary_id
+        if _jobs_deferred.get():
+            error = job.future.exception()
+            return (existing_summary if error else job.future.result()), ""
+        del _summary_jobs[pending_summary_id]
+        try:
+            summary = job.future.result()
+        except Exception as e:
+            _summary_stats.failed += 1
+            print(f"[경고] 메모리 요약 실패: {e}")
+            return existing_summary, ""
+        _summary_stats.merged += 1
+        _summary_stats.lag_turns += turn_count - job.turn_count
+        _summary_stats.lag_seconds += time.monotonic() - job.submitted_at
+        return summary, ""
+
+
+def _messages_to_summarize(messages: list[BaseMessage], turn_count: int) -> list[BaseMessage]:
+    """이번 턴에 요약할 메시지 (단기 메모리 범위 밖의 오래된 메시지, 요약 주기가 아니면 빈 목록)"""
+    if not should_summarize(turn_count):
+        return []
+    short_term = get_short_term_messages(messages)
+    return messages[:-len(short_term)] if len(messages) > len(short_term) else []
+
+
 def update_memory(
     messages: list[BaseMessage],
     turn_count: int,
-    existing_summary: str = ""
-) -> tuple[list[BaseMessage], str]:
+    existing_summary: str = "",
+    pending_summary_id: str = "",
+) -> tuple[list[BaseMessage], str, str]:
     """
     메모리 업데이트: 단기 메모리 정리 + 필요시 장기 메모리 요약
     
@@ -111,27 +305,60 @@ def update_memory(
     - 턴 16: 기존 장기 + 6~10턴 요약, 11~16턴은 단기 메모리
     - ...
     
+    BACKGROUND_SUMMARY면 요약은 백그라운드로 제출하고 끝난 뒤의 턴에서 반영합니다
+    (그 사이에는 기존 요약 사용, 이 함수는 LLM 호출을 기다리지 않음).
+    
     Args:
         messages: 전체 메시지 목록
         turn_count: 현재 턴 수
         existing_summary: 기존 장기 요약
+        pending_summary_id: 진행 중인 요약 작업 ID (상태의 pending_summary_id)
         
     Returns:
-        (단기 메모리용 메시지, 새 장기 요약)
+        (단기 메모리용 메시지, 이번 턴에 쓸 장기 요약, 진행 중인 요약 작업 ID)
     """
-    # 요약 필요 여부 확인
-    if should_summarize(turn_count):
-        # 요약할 메시지: 오래된 메시지들 (단기 메모리 범위 밖)
-        short_term = get_short_term_messages(messages)
-        messages_to_summarize = messages[:-len(short_term)] if len(messages) > len(short_term) else []
-        
-        if messages_to_summarize:
-            new_summary = summarize_messages(messages_to_summarize, existing_summary)
-            return short_term, new_summary
+    short_term = get_short_term_messages(messages)
+    summary, pending_summary_id = _collect_summary(existing_summary, pending_summary_id, turn_count)
+    
+    # 요약할 메시지: 요약 주기일 때 오래된 메시지들 (단기 메모리 범위 밖)
+    messages_to_summarize = _messages_to_summarize(messages, turn_count)
+    if not messages_to_summarize:
+        # 요약 불필요: 단기 메모리만 정리
+        return short_term, summary, pending_summary_id
+    
+    if not BACKGROUND_SUMMARY:
+        with _summary_lock:
+            _summary_stats.sync += 1
+        return short_term, summarize_messages(messages_to_summarize, summary), pending_summary_id
+    
+    if _jobs_deferred.get():
+        return short_term, summary, pending_summary_id
+    if pending_summary_id:
+        with _summary_lock:
+            _summary_stats.deferred += 1
+        return short_term, summary, pending_summary_id
+    return short_term, summary, _submit_summary(messages_to_summarize, summary, turn_count)
+
+
+async def aupdate_memory(
+    messages: list[BaseMessage],
+    turn_count: int,
+    existing_summary: str = "",
+    pending_summary_id: str = "",
+) -> tuple[list[BaseMessage], str, str]:
+    """update_memory의 비동기 버전 (동기 요약 모드에서도 이벤트 루프를 막지 않음)"""
+    if BACKGROUND_SUMMARY:
+        # 제출·완료 확인만 하므로 바로 반환
+        return update_memory(messages, turn_count, existing_summary, pending_summary_id)
     
-    # 요약 불필요: 단기 메모리만 정리
     short_term = get_short_term_messages(messages)
-    return short_term, existing_summary
+    summary, pending_summary_id = _collect_summary(existing_summary, pending_summary_id, turn_count)
+    messages_to_summarize = _messages_to_summarize(messages, turn_count)
+    if messages_to_summarize:
+        with _summary_lock:
+            _summary_stats.sync += 1
+        return short_term, await asummarize_messages(messages_to_summarize, summary), pending_summary_id
+    return short_term, summary, pending_summary_id
 
 
 def build_context_for_llm(
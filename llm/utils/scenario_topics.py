@@ -0,0 +1,170 @@
+# 시나리오 주제 레지스트리 + 로컬 주제 해석기
+# "검찰 전화 연습할래요", "카드사사칭", "택배 문자 사기요" 같은 자유 입력을 LLM 없이 정식 주제 라벨로 변환
+#
+# 해석 순서:
+#   1. 별칭 포함 검사: 공백 제거한 입력에 별칭이 들어 있으면 확신도 1.0 (가장 긴 별칭 우선)
+#   2. 오타 허용 검사: 자모 bigram 겹침으로 후보 별칭을 좁힌 뒤, 입력의 같은 길이 구간과
+#      자모 단위 편집 거리로 유사도 계산 ("검찰사징", "카드서 사칭" 등)
+#   3. 확신도가 TOPIC_CONFIDENCE 미만이면 None → 호출 측에서 LLM으로 fallback
+#
+# 정식 라벨은 뉴스 facet 주제 라벨(news_index.facets.TOPIC_KEYWORDS)과 같으므로
+# 해석된 주제를 그대로 RAG topic= 필터에 쓸 수 있음
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from ..tools.news_index.facets import TOPIC_KEYWORDS
+
+
+# 정식 주제 라벨 → 별칭 (공백·가운뎃점은 비교 시 제거되므로 붙여 써도 됨)
+SCENARIO_ALIASES: dict[str, tuple[str, ...]] = {
+    "검찰 사칭": (
+        "검찰사칭", "검찰", "검사사칭", "수사관", "경찰사칭", "경찰", "정부기관사칭", "정부기관",
+        "금감원", "금융감독원", "지검", "수사기관",
+    ),
+    "카드사 사칭": ("카드사사칭", "카드사", "카드사정보유출", "카드발급", "카드배송", "해외결제", "카드"),
+    "대출 사기": ("대출사기", "대출", "저금리대출", "대환대출", "저금리"),
+    "가족 사칭": ("가족사칭", "가족", "자녀사칭", "엄마", "아빠", "자녀", "아들", "딸", "메신저피싱"),
+    "택배·문자 사기": ("택배사칭", "택배", "문자사기", "스미싱", "문자", "부고문자", "청첩장"),
+    "투자 사기": ("투자사기", "투자", "리딩방", "코인", "가상자산", "주식"),
+    "정부 지원금 사칭": (
+        "정부지원금", "정부지원금사기", "지원금", "재난지원금", "환급금", "국세청", "건강보험", "보조금",
+    ),
+}
+assert set(SCENARIO_ALIASES) == set(TOPIC_KEYWORDS), "시나리오 라벨은 뉴스 facet 주제 라벨과 같아야 합니다."
+
+# 이 확신도 이상이면 LLM 없이 확정
+TOPIC_CONFIDENCE = 0.75
+
+# 오타 허용 검사에서 편집 거리까지 계산할 후보 별칭 수 / 후보가 되기 위한 최소 자모 bigram 겹침 비율
+_FUZZY_CANDIDATES = 4
+_MIN_OVERLAP = 0.4
+
+# 주제를 가리지 않는 일반 단어 (오타 허용 검사 전에 제거, "보이스피싱" ≈ "스미싱" 같은 오매칭 방지)
+_GENERIC_WORDS = ("보이스피싱", "피싱", "시나리오", "연습", "훈련", "해주세요", "할래요", "하고싶어요")
+
+_STRIP_RE = re.compile(r"[\s·.,!?~\"'()\[\]-]+")
+
+# 한글 음절 분해용 자모 테이블 (초성 19, 중성 21, 종성 28)
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+
+@dataclass(frozen=True)
+class TopicMatch:
+    """주제 해석 결과"""
+    label: str          # 정식 주제 라벨
+    score: float        # 확신도 (0~1)
+    alias: str          # 매칭된 별칭
+
+
+def _compact(text: str) -> str:
+    return _STRIP_RE.sub("", (text or "").lower())
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 초성·중성·종성 자모로 분해 (종성 없음은 생략, 한글 외 문자는 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHO[code // 588])
+            out.append(_JUNG[(code % 588) // 28])
+            if code % 28:
+                out.append(_JONG[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _bigrams(text: str) -> set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)} or {text}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein 거리 (두 행만 유지)"""
+    if len(a) < len(b):
+        a, b = b, a
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+# (별칭 자모, 별칭 자모 bigram, 별칭, 라벨) - 모듈 로드 시 한 번 계산
+_ALIAS_INDEX = [
+    (to_jamo(_compact(alias)), _bigrams(to_jamo(_compact(alias))), _compact(alias), label)
+    for label, aliases in SCENARIO_ALIASES.items()
+    for alias in aliases
+]
+# 별칭 포함 검사는 긴 별칭부터 ("카드사정보유출"이 "카드"보다 먼저)
+_ALIASES_BY_LENGTH = sorted(_ALIAS_INDEX, key=lambda item: -len(item[2]))
+
+
+def _fuzzy_score(alias_jamo: str, syllable_jamo: list[str]) -> float:
+    """입력에서 별칭과 비슷한 길이(±1음절)의 구간 중 자모 편집 거리 유사도가 가장 높은 값"""
+    syllables = max(1, round(len(alias_jamo) / 2.5))
+    best = 0.0
+    for width in (syllables - 1, syllables, syllables + 1):
+        if width < 1:
+            continue
+        for start in range(max(1, len(syllable_jamo) - width + 1)):
+            window = "".join(syllable_jamo[start:start + width])
+            sim = 1.0 - edit_distance(alias_jamo, window) / max(len(alias_jamo), len(window))
+            best = max(best, sim)
+    return best
+
+
+@lru_cache(maxsize=1024)
+def resolve_scenario_topic(text: str) -> TopicMatch | None:
+    """
+    자유 입력 → 정식 주제 라벨
+
+    Args:
+        text: 사용자 입력 또는 CLI --topic 값
+
+    Returns:
+        가장 확신도가 높은 TopicMatch (매칭이 전혀 없으면 None).
+        확신도가 TOPIC_CONFIDENCE 미만일 수 있으므로 호출 측에서 score를 확인합니다.
+    """
+    compact = _compact(text)
+    if not compact:
+        return None
+
+    # 1. 별칭 포함
+    for _, _, alias, label in _ALIASES_BY_LENGTH:
+        if alias in compact:
+            return TopicMatch(label=label, score=1.0, alias=alias)
+
+    # 2. 자모 bigram 겹침으로 후보를 좁힌 뒤 편집 거리
+    for word in _GENERIC_WORDS:
+        compact = compact.replace(word, "")
+    if not compact:
+        return None
+    syllable_jamo = [to_jamo(ch) for ch in compact]
+    jamo_grams = _bigrams("".join(syllable_jamo))
+    overlaps = sorted(
+        ((len(grams & jamo_grams) / len(grams), i) for i, (_, grams, _, _) in enumerate(_ALIAS_INDEX)),
+        reverse=True,
+    )[:_FUZZY_CANDIDATES]
+    best: TopicMatch | None = None
+    for overlap, i in overlaps:
+        if overlap < _MIN_OVERLAP:
+            break
+        alias_jamo, _, alias, label = _ALIAS_INDEX[i]
+        # 짧은 별칭("딸", "코인")은 우연한 한 글자 차이로도 높은 유사도가 나오므로 가중치를 낮춤
+        score = _fuzzy_score(alias_jamo, syllable_jamo) * min(1.0, len(alias_jamo) / 6)
+        if best is None or score > best.score:
+            best = TopicMatch(label=label, score=round(score, 3), alias=alias)
+    return best
+
+
+def canonical_topic(text: str) -> str:
+    """확신도가 충분하면 정식 라벨, 아니면 입력을 그대로 반환 (CLI --topic, LLM 출력 정규화용)"""
+    match = resolve_scenario_topic(text.strip())
+    return match.label if match is not None and match.score >= TOPIC_CONFIDENCE else text.strip()
@@ -0,0 +1,162 @@
+# 의미 유사도 기반 LLM 결과 캐시 (Master 지시 생성 / 주제 파싱 전용)
+# 훈련 중 사용자 답변은 "네", "누구세요?", "안 알려줄 거예요"처럼 짧고 비슷한 경우가 많아
+# 정확히 같은 프롬프트만 맞히는 응답 캐시(llm.SQLiteResponseCache)로는 적중이 드묾.
+#
+# - scope: 반드시 같아야 하는 부분 (작업 종류, 시나리오 주제 등) → 완전 일치
+# - text: 유사도로 비교할 부분 (최신 사용자 발화) → 공백을 뺀 음절 n-gram HashingEmbedder 코사인 유사도
+#   ("안 알려줄 거예요" / "안 알려줄거예요"처럼 띄어쓰기만 다른 답변을 같은 것으로 봄)
+# - 역할별 임계값 이상이면 저장된 LLM 출력 텍스트를 그대로 반환하고 LLM 호출 생략
+# - 역할별 최대 항목 수 초과 시 가장 오래 사용되지 않은 항목부터 제거 (LRU)
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any
+
+import numpy as np
+
+from ..tools.news_index.embedding import HashingEmbedder, normalize_text
+
+
+def _parse_thresholds(raw: str) -> dict[str, float]:
+    """"master=0.9,topic=0.85" → {"master": 0.9, "topic": 0.85}"""
+    thresholds = {}
+    for part in raw.split(","):
+        if "=" in part:
+            role, value = part.split("=", 1)
+            thresholds[role.strip()] = float(value)
+    return thresholds
+
+
+# 역할별 유사도 임계값 (1.0 초과로 두면 해당 역할 캐시 끔)
+# 주제 파싱은 "대출 사기" / "대출 사기요" (0.72) 정도까지 묶고 "카드사 사칭" / "검찰 사칭" (0.14)은 구분,
+# 지시 생성은 대화 흐름에 민감하므로 띄어쓰기·문장부호 차이 수준만 적중
+SEMANTIC_CACHE_THRESHOLDS = {
+    "master": 0.9,
+    "topic": 0.7,
+    **_parse_thresholds(os.environ.get("VOICE_GUARDIAN_SEMANTIC_CACHE_THRESHOLDS", "")),
+}
+
+# 역할별 최대 항목 수
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.environ.get("VOICE_GUARDIAN_SEMANTIC_CACHE_MAX_ENTRIES", "512"))
+
+
+@dataclass
+class SemanticCacheStats:
+    """의미 캐시 카운터 스냅샷 (saved_calls = 적중으로 생략한 LLM 호출 수)"""
+    hits: int = 0
+    misses: int = 0
+    saved_calls: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+def _cache_text(text: str) -> str:
+    """비교용 텍스트 (정규화 후 공백 제거)"""
+    return normalize_text(text).replace(" ", "")
+
+
+class SemanticCache:
+    """
+    scope별 임베딩 행렬 + LRU 순서를 가진 스레드 안전 의미 캐시 (한 역할 분량)
+
+    Args:
+        threshold: 적중으로 볼 최소 코사인 유사도
+        max_entries: 최대 항목 수
+        embedder: 텍스트 임베더 (기본 1024차원 HashingEmbedder, 짧은 문장의 해시 충돌 완화)
+    """
+
+    def __init__(self, threshold: float, max_entries: int = 512, embedder: HashingEmbedder | None = None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.embedder = embedder or HashingEmbedder(dim=1024)
+        # (scope, 정규화 텍스트) → (임베딩, 저장 값), 순서 = 최근 사용 순
+        self._entries: OrderedDict[tuple[str, str], tuple[np.ndarray, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = SemanticCacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold <= 1.0 and self.max_entries > 0
+
+    def lookup(self, scope: str, text: str) -> str | None:
+        """
+        scope가 같고 text 유사도가 임계값 이상인 항목 중 가장 비슷한 것의 값
+
+        빈 텍스트(사용자 발화 없는 단계)는 scope 완전 일치로만 적중합니다.
+        """
+        if not self.enabled:
+            return None
+        text = _cache_text(text)
+        vec = self.embedder.embed_query(text)
+        with self._lock:
+            key = (scope, text)
+            if key in self._entries:
+                best_key = key
+            else:
+                best_key, best_sim = None, self.threshold
+                candidates = [(k, v) for k, v in self._entries.items() if k[0] == scope and k[1]]
+                if candidates and text:
+                    sims = np.stack([v[0] for _, v in candidates]) @ vec
+                    i = int(np.argmax(sims))
+                    if sims[i] >= best_sim:
+                        best_key = candidates[i][0]
+            if best_key is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self._stats.hits += 1
+            self._stats.saved_calls += 1
+            return self._entries[best_key][1]
+
+    def store(self, scope: str, text: str, value: str) -> None:
+        if not self.enabled:
+            return
+        text = _cache_text(text)
+        vec = self.embedder.embed_query(text)
+        with self._lock:
+            self._entries[(scope, text)] = (vec, value)
+            self._entries.move_to_end((scope, text))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> SemanticCacheStats:
+        with self._lock:
+            snapshot = SemanticCacheStats(**asdict(self._stats))
+            snapshot.size = len(self._entries)
+        return snapshot
+
+
+_caches: dict[str, SemanticCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_semantic_cache(role: str) -> SemanticCache:
+    """역할별 프로세스 공용 의미 캐시 (임계값이 없는 역할은 꺼진 캐시)"""
+    cache = _caches.get(role)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(role)
+            if cache is None:
+                threshold = SEMANTIC_CACHE_THRESHOLDS.get(role, 2.0)
+                cache = _caches[role] = SemanticCache(threshold, SEMANTIC_CACHE_MAX_ENTRIES)
+    return cache
+
+
+def get_semantic_cache_stats() -> dict[str, SemanticCacheStats]:
+    """역할별 의미 캐시 카운터"""
+    return {role: cache.stats() for role, cache in list(_caches.items())}
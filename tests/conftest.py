@@ -0,0 +1,78 @@
+# 공용 fixture: 네트워크 없이 그래프를 돌리기 위한 가짜 LLM
+#
+# llm.agents와 llm.graph는 서로를 import하므로 graph를 먼저 로드해야 순환 import가 풀림
+
+import itertools
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+import llm.graph  # noqa: F401
+from llm.agents import guardian, roleplay_agent
+from llm.tools import voice_phishing_rag
+from llm.tools.news_index import ResultCache
+from llm.tools.news_index.store import NewsIndex
+from llm.utils import llm as llm_utils
+
+
+class _FailingStructuredChat(GenericFakeChatModel):
+    """구조화 출력 호출 시 실패하는 가짜 LLM (평가 2단계 호출 횟수 집계)"""
+    structured_calls: int = 0
+
+    def with_structured_output(self, schema, **kwargs):
+        self.structured_calls += 1
+        raise RuntimeError("테스트에서는 구조화 출력 LLM을 사용하지 않음")
+
+
+def _fake_chat(prefix: str, cls=GenericFakeChatModel) -> GenericFakeChatModel:
+    """호출마다 "{prefix} 1", "{prefix} 2", ... 를 반환 (stream 시 공백 단위 토큰)"""
+    return cls(messages=(AIMessage(content=f"{prefix} {i}") for i in itertools.count(1)))
+
+
+@pytest.fixture
+def fake_llms(monkeypatch):
+    """
+    에이전트 LLM 싱글톤·뉴스 검색·Guardian 설명을 가짜로 교체
+
+    반환값의 "evaluation"은 평가 LLM(2단계)이며, structured_calls로 호출 여부를 확인합니다.
+    """
+    fakes = {
+        "master": _fake_chat("master 지시"),
+        "roleplay": _fake_chat("roleplay 응답"),
+        "evaluation": _fake_chat("평가", cls=_FailingStructuredChat),
+        "guardian": _fake_chat("guardian 설명"),
+        "summary": _fake_chat("요약"),
+        "topic": _fake_chat("일반 보이스피싱"),
+    }
+    for role, fake in fakes.items():
+        monkeypatch.setattr(llm_utils, f"_{role}_llm", fake)
+    monkeypatch.setattr(roleplay_agent, "_get_news_results", lambda query, topic="": [])
+    monkeypatch.setattr(guardian, "get_explanation", lambda topic, category: "테스트 설명")
+    return fakes
+
+
+NEWS_ARTICLES = [
+    {"headline": "카드사 사칭 문자 주의보", "snippet": "해외 결제가 승인됐다며 고객센터 번호로 전화를 유도", "date": "2026-01-05"},
+    {"headline": "검찰 수사관 사칭 보이스피싱", "snippet": "서울중앙지검 수사관이라며 안전계좌 이체를 요구", "date": "2025-11-20"},
+    {"headline": "저금리 대출 사기 급증", "snippet": "기존 대출을 갚으면 저금리로 바꿔주겠다며 상환금을 가로채", "date": "2025-06-01"},
+]
+
+
+@pytest.fixture
+def news_index(tmp_path, monkeypatch):
+    """
+    RAG 도구가 임시 인덱스(NEWS_ARTICLES)를 쓰도록 교체
+
+    검색 결과 캐시도 비어 있는 새 캐시로 바꿔 테스트 사이에 결과가 섞이지 않게 합니다.
+    """
+    index_dir = tmp_path / "news_index"
+    index = NewsIndex.create(index_dir)
+    texts = [f"{a['headline']} {a['snippet']}" for a in NEWS_ARTICLES]
+    index.append(index.embedder.embed(texts), [dict(a) for a in NEWS_ARTICLES])
+    monkeypatch.setattr(voice_phishing_rag, "INDEX_DIR", index_dir)
+    monkeypatch.setattr(voice_phishing_rag, "_news_index", None)
+    monkeypatch.setattr(voice_phishing_rag, "_news_index_checked_at", float("-inf"))
+    monkeypatch.setattr(voice_phishing_rag, "_result_cache", ResultCache(max_entries=8, ttl_seconds=0))
+    yield index
+    index.close()
@@ -0,0 +1,48 @@
+# 비동기 턴 실행: ainvoke 노드로 동기 그래프와 같은 결과, 여러 세션을 한 이벤트 루프에서 동시에 처리
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from llm.graph import workflow
+
+
+def _waiting_state(topic: str = "검찰 사칭") -> dict:
+    return {
+        **workflow.get_initial_state(topic),
+        "current_phase": "evaluate",
+        "messages": [AIMessage(content="서울중앙지검 수사관입니다.")],
+        "turn_count": 1,
+    }
+
+
+@pytest.mark.parametrize("fused", [False, True])
+def test_async_safe_turn_continues_roleplay(fake_llms, fused):
+    app = workflow.compile_workflow(async_nodes=True, fused_roleplay=fused)
+    state = asyncio.run(app.ainvoke({**_waiting_state(), "user_input": "어디서 전화하신 거예요"}))
+
+    assert state["evaluation_result"]["is_danger"] is False
+    assert state["current_phase"] == "evaluate"
+    assert state["turn_count"] == 2
+    assert state["messages"][-1].content.startswith("roleplay 응답")
+
+
+def test_async_danger_turn_reaches_guardian(fake_llms):
+    state = asyncio.run(workflow.arun_single_turn(_waiting_state(), user_input="제 주민번호는 900101-1234568 입니다"))
+
+    assert state["current_phase"] == "guardian"
+    assert "900101-1234568" not in state["messages"][-1].content
+
+
+def test_concurrent_sessions_keep_separate_state(fake_llms):
+    async def run():
+        return await asyncio.gather(
+            workflow.arun_single_turn(_waiting_state("검찰 사칭"), user_input="누구세요"),
+            workflow.arun_single_turn(_waiting_state("대출 사기"), user_input="제 주민번호는 900101-1234568 입니다"),
+        )
+
+    safe, danger = asyncio.run(run())
+    assert safe["scenario_topic"] == "검찰 사칭" and safe["current_phase"] == "evaluate"
+    assert danger["scenario_topic"] == "대출 사기" and danger["current_phase"] == "guardian"
+    assert [m.type for m in safe["messages"]] == ["ai", "human", "ai"]
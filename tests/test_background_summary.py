@@ -0,0 +1,103 @@
+# 장기 요약 백그라운드 실행: 제출 → 이후 턴에 반영, 진행 중 주기 미루기, 실패 집계, 동기 모드
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from llm.utils import memory
+
+
+def _messages(turns: int) -> list:
+    messages = []
+    for i in range(turns):
+        messages += [AIMessage(content=f"사기범 대사 {i}"), HumanMessage(content=f"사용자 답변 {i}")]
+    return messages
+
+
+@pytest.fixture
+def summary_jobs(monkeypatch):
+    """작업 목록·카운터·스레드 풀을 테스트 전용으로 교체 (다른 테스트의 작업과 섞이지 않게)"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(memory, "BACKGROUND_SUMMARY", True)
+    monkeypatch.setattr(memory, "_summary_executor", executor)
+    monkeypatch.setattr(memory, "_summary_jobs", OrderedDict())
+    monkeypatch.setattr(memory, "_summary_stats", memory.SummaryStats())
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def _wait(job_id: str) -> None:
+    memory._summary_jobs[job_id].future.exception(timeout=5)
+
+
+def test_summary_is_merged_on_a_later_turn(fake_llms, summary_jobs):
+    messages = _messages(12)
+    short_term, summary, job_id = memory.update_memory(messages, turn_count=10, existing_summary="이전 요약")
+
+    # 이번 턴은 기다리지 않고 기존 요약 사용
+    assert summary == "이전 요약" and job_id
+    assert len(short_term) == memory.SHORT_TERM_MAX_TURNS * 2
+    _wait(job_id)
+
+    _, summary, job_id = memory.update_memory(messages, turn_count=11, existing_summary=summary, pending_summary_id=job_id)
+    assert (summary, job_id) == ("요약 1", "")
+    stats = memory.get_summary_stats()
+    assert (stats.submitted, stats.merged, stats.pending, stats.lag_turns) == (1, 1, 0, 1)
+
+
+def test_due_summary_is_deferred_while_previous_job_runs(fake_llms, summary_jobs, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(memory, "_summarize_or_raise", lambda messages, existing: release.wait(5) and "요약 완료")
+    _, _, job_id = memory.update_memory(_messages(12), turn_count=10)
+
+    _, summary, pending = memory.update_memory(_messages(17), turn_count=15, pending_summary_id=job_id)
+    assert (summary, pending) == ("", job_id)
+    release.set()
+    _wait(job_id)
+
+    _, summary, pending = memory.update_memory(_messages(18), turn_count=16, pending_summary_id=job_id)
+    assert (summary, pending) == ("요약 완료", "")
+    stats = memory.get_summary_stats()
+    assert (stats.submitted, stats.deferred, stats.merged) == (1, 1, 1)
+
+
+def test_failed_summary_keeps_existing_summary(fake_llms, summary_jobs, monkeypatch):
+    def fail(messages, existing):
+        raise RuntimeError("요약 LLM 오류")
+
+    monkeypatch.setattr(memory, "_summarize_or_raise", fail)
+    _, _, job_id = memory.update_memory(_messages(12), turn_count=10, existing_summary="이전 요약")
+    _wait(job_id)
+
+    _, summary, pending = memory.update_memory(_messages(12), turn_count=11, existing_summary="이전 요약", pending_summary_id=job_id)
+    assert (summary, pending) == ("이전 요약", "")
+    stats = memory.get_summary_stats()
+    assert (stats.failed, stats.merged, stats.failure_rate) == (1, 0, 1.0)
+
+
+def test_deferred_jobs_preview_without_consuming(fake_llms, summary_jobs):
+    _, _, job_id = memory.update_memory(_messages(12), turn_count=10)
+    _wait(job_id)
+
+    with memory.deferred_summary_jobs():
+        _, summary, pending = memory.update_memory(_messages(17), turn_count=15, pending_summary_id=job_id)
+    # 끝난 요약은 미리 보여 주지만 작업은 남기고, 요약 주기여도 새 작업을 내지 않음
+    assert (summary, pending) == ("요약 1", "")
+    assert list(memory._summary_jobs) == [job_id]
+    assert memory.get_summary_stats().submitted == 1
+
+    _, summary, pending = memory.update_memory(_messages(17), turn_count=15, pending_summary_id=job_id)
+    assert summary == "요약 1" and pending and pending != job_id
+    assert memory.get_summary_stats().merged == 1
+
+
+def test_sync_mode_summarizes_inline(fake_llms, summary_jobs, monkeypatch):
+    monkeypatch.setattr(memory, "BACKGROUND_SUMMARY", False)
+    _, summary, pending = memory.update_memory(_messages(12), turn_count=10, existing_summary="이전 요약")
+
+    assert (summary, pending) == ("요약 1", "")
+    stats = memory.get_summary_stats()
+    assert (stats.sync, stats.submitted, stats.pending) == (1, 0, 0)
@@ -0,0 +1,56 @@
+# Evaluator 라벨 코퍼스 벤치마크: 코퍼스 형식, 지표 집계, --no-llm 오프라인 판정
+
+import json
+import sys
+
+import pytest
+
+from llm import evaluator_benchmark
+from llm.evaluator_benchmark import Score, load_corpus, run_benchmark
+from llm.tools.pii_detector import DETECTED_INFO_CATEGORIES, OTHER_CATEGORY
+
+
+def test_corpus_items_are_labeled():
+    corpus = load_corpus()
+    assert len({item["id"] for item in corpus}) == len(corpus)
+    for item in corpus:
+        assert {"group", "scammer_line", "user_message", "is_danger", "categories"} <= item.keys()
+        # 위험 메시지만 카테고리를 갖고, 카테고리는 detected_info 매핑 대상과 같은 이름
+        assert bool(item["categories"]) == item["is_danger"]
+        assert set(item["categories"]) <= {c for c, _ in DETECTED_INFO_CATEGORIES} | {OTHER_CATEGORY}
+
+
+def test_score_counts_and_rates():
+    score = Score()
+    for expected, predicted in [(True, True), (True, True), (True, False), (False, True), (False, False)]:
+        score.add(expected, predicted)
+    assert (score.tp, score.fp, score.fn, score.tn) == (2, 1, 1, 1)
+    assert score.precision == pytest.approx(2 / 3)
+    assert score.recall == pytest.approx(2 / 3)
+    assert Score().f1 == 0.0
+
+
+def test_offline_run_settles_pattern_tier_exactly():
+    result = run_benchmark(load_corpus(), use_llm=False, repeat=1)
+
+    assert result.tier1_settled + result.escalated == result.messages
+    assert result.tier2_mean_ms == 0.0 and not result.used_llm
+    # 1단계 패턴 검사는 오탐 없이 숫자 PII 그룹을 모두 잡음 (텍스트 PII·암묵적 동의는 LLM 몫)
+    assert result.danger.fp == 0
+    for group in ("pii", "pii_spoken", "pii_obfuscated", "hard_negative", "refusal"):
+        assert result.group_accuracy[group] == 1.0
+    assert all(error["tier"] in ("pattern", "offline") for error in result.errors)
+    json.dumps(result.as_dict(), ensure_ascii=False)
+
+
+def test_cli_exits_when_recall_below_bound(tmp_path, monkeypatch, capsys):
+    corpus = [item for item in load_corpus() if item["group"] in ("pii", "pii_text")]
+    path = tmp_path / "corpus.jsonl"
+    path.write_text("\n".join(json.dumps(item, ensure_ascii=False) for item in corpus), encoding="utf-8")
+    argv = ["evaluator_benchmark", "--corpus", str(path), "--no-llm", "--repeat", "1", "--min-recall", "0.99"]
+    monkeypatch.setattr(sys, "argv", argv)
+
+    with pytest.raises(SystemExit) as exc:
+        evaluator_benchmark.main()
+    assert exc.value.code == 1
+    assert "recall" in capsys.readouterr().out
@@ -0,0 +1,81 @@
+# 뉴스 facet 주제 분류: 흔한 단어 하나로 모든 기사가 태깅되지 않아야 함
+
+import json
+
+import numpy as np
+import pytest
+
+from llm.tools.news_index.facets import FACETS_FILE, TOPIC_RULES_VERSION, classify_topics, resolve_topic
+from llm.tools.news_index.store import NewsIndex
+
+
+@pytest.mark.parametrize("text", [
+    "경찰, 고속도로 음주운전 집중 단속",
+    "코스피 상승 마감… 주식 거래대금 증가",
+    "기업 설명회 링크는 홈페이지에서 확인",
+    "가족 나들이객 몰린 주말 고속도로",
+    "정부, 내년 예산안 발표",
+])
+def test_common_words_alone_do_not_tag(text):
+    assert classify_topics(text) == []
+
+
+@pytest.mark.parametrize("text, label", [
+    ("서울중앙지검 수사관을 사칭해 현금 인출 요구", "검찰 사칭"),
+    ("검찰 직원이라며 경찰 조사에 협조하라고 속여", "검찰 사칭"),
+    ("주식 리딩방에서 고수익 미끼로 유인", "투자 사기"),
+    ("코인 투자 수익률을 부풀려 돈을 받아", "투자 사기"),
+    ("엄마 나 폰 액정이 깨져서 그래", "가족 사칭"),
+    ("택배 주소 확인 문자에 링크를 눌렀다가", "택배·문자 사기"),
+])
+def test_specific_phrase_or_two_hints_tag(text, label):
+    assert label in classify_topics(text)
+
+
+def test_free_text_query_still_resolves_from_one_word():
+    assert resolve_topic("검찰 전화") == ["검찰 사칭"]
+    assert resolve_topic("카드사 사칭") == ["카드사 사칭"]
+
+
+def test_stale_rules_rebuild_topic_postings(tmp_path):
+    index = NewsIndex.create(tmp_path / "index")
+    records = [
+        {"headline": "경찰, 음주운전 단속", "snippet": "주말 단속 결과", "date": "2026-01-02"},
+        {"headline": "수사관 사칭 주의", "snippet": "서울중앙지검을 사칭", "date": "2026-01-03"},
+    ]
+    vecs = np.eye(2, index.dim, dtype=np.float32)
+    index.append(vecs, records)
+
+    # 규칙 버전 도입 전 색인: 첫 기사도 "검찰 사칭"으로 잘못 태깅돼 있었던 상태
+    facets_dir = index.facets.path
+    np.asarray([0, 1], dtype=np.int32).tofile(facets_dir / "topic" / "검찰 사칭.i32")
+    (facets_dir / FACETS_FILE).write_text(json.dumps({"count": 2}), encoding="utf-8")
+    index.facets.reload()
+    assert index.facets.rules_stale
+
+    assert index.build_facets() == 2
+    assert not index.facets.rules_stale
+    assert index.facets.select(topic="검찰 사칭").tolist() == [1]
+    assert index.facets.select(since="2026-01-03").tolist() == [1]
+    info = json.loads((facets_dir / FACETS_FILE).read_text(encoding="utf-8"))
+    assert info == {"count": 2, "rules": TOPIC_RULES_VERSION}
+    index.close()
+
+
+def test_hybrid_search_ignores_facet_rows_past_mapped_count(tmp_path):
+    index = NewsIndex.create(tmp_path / "index")
+    vecs = np.eye(4, index.dim, dtype=np.float32)
+    records = [{"headline": f"검찰 사칭 보이스피싱 {i}", "snippet": "", "date": "2026-01-02"} for i in range(4)]
+    index.append(vecs[:2], records[:2])
+    reader = NewsIndex.open(tmp_path / "index")
+
+    # 다른 프로세스가 facet까지 쓰고 manifest는 아직 다시 읽지 않은 상태
+    index.append(vecs[2:], records[2:])
+    reader.facets.reload()
+    rows = reader.facets.select(topic="검찰 사칭")
+    assert rows.tolist() == [0, 1, 2, 3]
+
+    (hits, _), = reader.search_hybrid_batch(["검찰 사칭"], vecs[:1], top_k=4, rows=rows)
+    assert sorted(hits.tolist()) == [0, 1]
+    reader.close()
+    index.close()
@@ -0,0 +1,55 @@
+# 통합 턴 모드: 구조화 출력 한 번으로 지시와 대사를 함께 만들고, 실패하면 일반 대사로 대체
+
+from langchain_core.messages import AIMessage
+
+from llm.agents import roleplay_agent
+from llm.agents.roleplay_agent import FusedTurnOutput, fused_roleplay_node
+from llm.graph import workflow
+from llm.utils import llm as llm_utils
+
+
+class _StructuredChat:
+    """with_structured_output(FusedTurnOutput)에 정해진 출력을 돌려주는 가짜 LLM"""
+
+    def __init__(self, output):
+        self.output = output
+        self.calls = []
+
+    def with_structured_output(self, schema, **kwargs):
+        assert schema is FusedTurnOutput
+        return self
+
+    def invoke(self, messages):
+        self.calls.append(messages)
+        return self.output
+
+
+def _state() -> dict:
+    return {
+        **workflow.get_initial_state("카드사 사칭"),
+        "current_phase": "roleplay",
+        "messages": [AIMessage(content="OO카드 고객센터입니다.")],
+        "turn_count": 1,
+        "user_input": "무슨 일이세요?",
+        "master_instruction": "지시 초안",
+    }
+
+
+def test_single_call_sets_instruction_and_line(fake_llms, monkeypatch):
+    chat = _StructuredChat(FusedTurnOutput(instruction=" 결제 취소를 미끼로 카드번호 요청 ", line="해외 결제 취소를 도와드릴게요."))
+    monkeypatch.setattr(llm_utils, "_roleplay_llm", chat)
+
+    update = fused_roleplay_node(_state())
+
+    assert len(chat.calls) == 1
+    assert roleplay_agent.FUSED_TURN_PROMPT.strip() in chat.calls[0][0].content
+    assert update["master_instruction"] == "결제 취소를 미끼로 카드번호 요청"
+    assert [m.content for m in update["messages"]] == ["무슨 일이세요?", "해외 결제 취소를 도와드릴게요."]
+    assert update["current_phase"] == "evaluate"
+
+
+def test_empty_structured_output_falls_back_to_plain_line(fake_llms):
+    # conftest의 가짜 roleplay LLM은 구조화 출력을 지원하지 않음 → 지시 초안으로 일반 대사
+    update = fused_roleplay_node(_state())
+    assert "master_instruction" not in update
+    assert update["messages"][-1].content.startswith("roleplay 응답")
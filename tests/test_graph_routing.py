@@ -0,0 +1,140 @@
+# 그래프 단위 라우팅 추적 (가짜 LLM, 네트워크 없음)
+# 사용자 입력이 있는 턴이 평가를 거쳐 safe → roleplay, danger → guardian으로 가는지 확인
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from llm.agents import speculative
+from llm.graph import workflow
+from llm.utils.memory import get_summary_stats
+
+
+SAFE_REPLY = "누구세요? 어디서 전화하신 거예요"
+DANGER_REPLY = "제 주민번호는 900101-1234568 입니다"
+
+
+def _waiting_state() -> dict:
+    """사기범 첫 대사 직후, 사용자 입력을 기다리는 상태"""
+    return {
+        **workflow.get_initial_state("검찰 사칭"),
+        "current_phase": "evaluate",
+        "messages": [AIMessage(content="서울중앙지검 수사관입니다.")],
+        "turn_count": 1,
+    }
+
+
+def _summary_turn_state() -> dict:
+    """장기 요약 주기(10턴)에 사용자 입력을 기다리는 상태 (단기 메모리 밖 메시지가 있음)"""
+    history = []
+    for i in range(11):
+        history += [AIMessage(content=f"사기범 대사 {i}"), HumanMessage(content=f"사용자 답변 {i}")]
+    return {**_waiting_state(), "messages": history + [AIMessage(content="마지막 대사")], "turn_count": 10}
+
+
+def _trace(app, user_input: str, state: dict | None = None) -> tuple[list[str], dict]:
+    """(실행된 노드 순서, 최종 상태)"""
+    nodes = []
+    final = None
+    for mode, payload in app.stream(
+        {**(state or _waiting_state()), "user_input": user_input},
+        stream_mode=["updates", "values"],
+    ):
+        if mode == "updates":
+            nodes.extend(payload)
+        else:
+            final = payload
+    return nodes, final
+
+
+@pytest.mark.parametrize("fused", [False, True])
+def test_safe_turn_is_evaluated_before_roleplay(fake_llms, fused):
+    nodes, state = _trace(workflow.compile_workflow(fused_roleplay=fused), SAFE_REPLY)
+
+    assert nodes == ["master", "evaluate", "continue", "roleplay"]
+    assert state["evaluation_result"]["is_danger"] is False
+    assert state["master_instruction"]
+    assert state["user_input"] == ""
+    assert [m.type for m in state["messages"]] == ["ai", "human", "ai"]
+    assert state["messages"][1].content == SAFE_REPLY
+
+
+@pytest.mark.parametrize("fused", [False, True])
+def test_rrn_turn_reaches_guardian(fake_llms, fused):
+    nodes, state = _trace(workflow.compile_workflow(fused_roleplay=fused), DANGER_REPLY)
+
+    assert nodes == ["master", "evaluate", "guardian"]
+    assert state["evaluation_result"]["is_danger"] is True
+    assert state["current_phase"] == "guardian"
+    # 평가한 입력은 기록하고 소비
+    assert state["user_input"] == ""
+    assert [m.type for m in state["messages"]] == ["ai", "human", "ai"]
+    assert state["messages"][1].content == DANGER_REPLY
+    assert "주민등록번호" in state["messages"][-1].content
+    assert "900101-1234568" not in state["messages"][-1].content
+    # 1단계 패턴 검사에서 확정 → LLM 문맥 검사 없음
+    assert fake_llms["evaluation"].structured_calls == 0
+    # danger 턴에는 계속 지시를 만들지 않으므로 master LLM의 첫 응답이 아직 소비되지 않음
+    assert fake_llms["master"].invoke("확인").content == "master 지시 1"
+
+
+def test_speculative_rrn_turn_reaches_guardian(fake_llms):
+    nodes, state = _trace(workflow.compile_workflow(speculative=True), DANGER_REPLY)
+
+    assert nodes == ["master", "roleplay", "guardian"]
+    assert state["evaluation_result"]["is_danger"] is True
+    assert state["user_input"] == ""
+    assert [m.type for m in state["messages"]] == ["ai", "human", "ai"]
+
+
+def test_speculative_discard_leaves_no_summary_job(fake_llms, monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(speculative, "_executor", executor)
+    before = get_summary_stats()
+    nodes, state = _trace(workflow.compile_workflow(speculative=True), DANGER_REPLY, _summary_turn_state())
+
+    assert nodes == ["master", "roleplay", "guardian"]
+    # 버린 대사 생성이 끝날 때까지 기다린 뒤 확인
+    executor.shutdown(wait=True)
+    after = get_summary_stats()
+    assert after.submitted == before.submitted
+    assert after.pending == before.pending
+    assert state["pending_summary_id"] == ""
+
+
+def test_speculative_commit_submits_summary_job(fake_llms):
+    before = get_summary_stats()
+    nodes, state = _trace(workflow.compile_workflow(speculative=True), SAFE_REPLY, _summary_turn_state())
+
+    assert nodes == ["master", "roleplay"]
+    assert get_summary_stats().submitted == before.submitted + 1
+    assert state["pending_summary_id"]
+
+
+def test_speculative_safe_turn_commits_line(fake_llms):
+    nodes, state = _trace(workflow.compile_workflow(speculative=True), SAFE_REPLY)
+
+    assert nodes == ["master", "roleplay"]
+    assert state["evaluation_result"]["is_danger"] is False
+    assert state["messages"][-1].content.startswith("roleplay 응답")
+
+
+def test_speculative_stream_hides_discarded_line(fake_llms, monkeypatch):
+    monkeypatch.setattr(workflow, "app", workflow.compile_workflow(speculative=True))
+
+    turn = workflow.stream_single_turn(_waiting_state(), user_input=DANGER_REPLY)
+    text = "".join(turn)
+
+    assert "roleplay 응답" not in text
+    assert text.startswith("⚠️ 잠깐요!")
+    assert turn.state["current_phase"] == "guardian"
+
+
+def test_speculative_stream_releases_committed_line(fake_llms, monkeypatch):
+    monkeypatch.setattr(workflow, "app", workflow.compile_workflow(speculative=True))
+
+    turn = workflow.stream_single_turn(_waiting_state(), user_input=SAFE_REPLY)
+    text = "".join(turn)
+
+    assert text == turn.state["messages"][-1].content
@@ -0,0 +1,59 @@
+# Guardian 교육 설명 캐시: 같은 파일을 공유하는 여러 프로세스 사이의 갱신/병합
+
+import json
+import os
+
+from llm.utils.guardian_cache import GuardianMessageCache
+
+
+def _touch_later(path):
+    # 같은 mtime 틱 안의 연속 쓰기와 구분되도록 mtime을 앞으로 당김
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_reloads_when_another_process_saves(tmp_path):
+    path = tmp_path / "guardian.json"
+    worker = GuardianMessageCache(path)
+    cli = GuardianMessageCache(path)
+    assert worker.get("카드사 사칭", "카드번호") is None
+
+    cli.put("카드사 사칭", "카드번호", "💡 카드번호 설명", generation=1)
+    _touch_later(path)
+    assert worker.get("카드사 사칭", "카드번호", generation=1) == "💡 카드번호 설명"
+    assert worker.stats().hits == 1
+
+
+def test_put_merges_with_entries_saved_elsewhere(tmp_path):
+    path = tmp_path / "guardian.json"
+    a = GuardianMessageCache(path)
+    b = GuardianMessageCache(path)
+    a.get("검찰 사칭", "계좌번호")
+    b.get("검찰 사칭", "계좌번호")
+
+    a.put("검찰 사칭", "계좌번호", "A 설명", generation=1)
+    b.put("검찰 사칭", "비밀번호", "B 설명", generation=1)
+
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)["entries"]
+    assert set(entries) == {"검찰 사칭|계좌번호", "검찰 사칭|비밀번호"}
+    _touch_later(path)
+    assert a.get("검찰 사칭", "비밀번호") == "B 설명"
+
+
+def test_unsaved_puts_survive_reload_and_are_saved_once(tmp_path):
+    path = tmp_path / "guardian.json"
+    precompute = GuardianMessageCache(path)
+    other = GuardianMessageCache(path)
+
+    precompute.put("대출 사기", "주민등록번호", "배치 설명", generation=2, save=False)
+    other.put("대출 사기", "카드번호", "다른 설명", generation=2)
+    _touch_later(path)
+    # 다른 프로세스 저장으로 다시 읽어도 아직 저장 전인 항목은 남아 있어야 함
+    assert precompute.get("대출 사기", "주민등록번호") == "배치 설명"
+    precompute.save()
+
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)["entries"]
+    assert entries["대출 사기|주민등록번호"]["explanation"] == "배치 설명"
+    assert entries["대출 사기|카드번호"]["explanation"] == "다른 설명"
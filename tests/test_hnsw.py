@@ -0,0 +1,116 @@
+# HNSW 그래프: 전수 스캔 대비 recall, 세대 디렉터리 저장, NewsIndex 지연 로드
+
+import json
+
+import numpy as np
+import pytest
+
+from llm.tools.news_index.hnsw import META_FILE, HNSWGraph
+from llm.tools.news_index.store import HNSW_DIR, NewsIndex
+
+
+def _clustered(n: int, dim: int = 64, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(20, dim)).astype(np.float32)
+    vecs = centers[rng.integers(0, 20, n)] + 0.5 * rng.normal(size=(n, dim)).astype(np.float32)
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def _recall(graph: HNSWGraph, vecs: np.ndarray, queries: np.ndarray, k: int = 10) -> float:
+    exact = np.argsort(-(queries @ vecs.T), axis=1)[:, :k]
+    hits = 0
+    for q, truth in zip(queries, exact):
+        rows, _ = graph.search(q, k)
+        hits += len(set(rows.tolist()) & set(truth.tolist()))
+    return hits / (k * len(queries))
+
+
+@pytest.fixture(scope="module")
+def vecs():
+    return _clustered(600)
+
+
+def test_recall_matches_exact_scan(vecs):
+    graph = HNSWGraph(vecs, M=8, ef_construction=64)
+    graph.add(len(vecs))
+    assert _recall(graph, vecs, vecs[::20]) >= 0.95
+    # 이웃 목록에 자기 자신이나 중복이 없어야 함
+    for node in range(len(vecs)):
+        nbrs = graph._neighbors(node, 0)
+        assert node not in nbrs
+        assert len(set(nbrs.tolist())) == len(nbrs)
+
+
+def test_save_load_roundtrip_and_incremental_add(vecs, tmp_path):
+    graph = HNSWGraph(vecs, M=8, ef_construction=64)
+    graph.add(400)
+    graph.save(tmp_path)
+
+    resumed = HNSWGraph.load(tmp_path, vecs, writable=True)
+    assert resumed.count == 400
+    np.testing.assert_array_equal(resumed.layer0[:400], graph.layer0[:400])
+    resumed.add(len(vecs))
+    resumed.save(tmp_path)
+
+    loaded = HNSWGraph.load(tmp_path, vecs)
+    assert loaded.count == len(vecs)
+    assert _recall(loaded, vecs, vecs[::20]) >= 0.95
+
+
+def test_save_keeps_mapped_generation_intact(vecs, tmp_path):
+    graph = HNSWGraph(vecs, M=8, ef_construction=64)
+    graph.add(300)
+    graph.save(tmp_path)
+    reader = HNSWGraph.load(tmp_path, vecs)
+    before = np.array(reader.layer0)
+    first_dir = json.loads((tmp_path / META_FILE).read_text(encoding="utf-8"))["dir"]
+
+    writer = HNSWGraph.load(tmp_path, vecs, writable=True)
+    for end in (400, 500, 600):
+        writer.add(end)
+        writer.save(tmp_path)
+        if end == 400:
+            # 직전 세대는 검색 중일 수 있으므로 남아 있어야 함
+            np.testing.assert_array_equal(np.array(reader.layer0), before)
+            assert (tmp_path / first_dir).exists()
+
+    # 두 세대 이상 지난 디렉터리만 정리됨
+    assert not (tmp_path / first_dir).exists()
+    assert len([p for p in tmp_path.iterdir() if p.is_dir()]) == 2
+    assert HNSWGraph.load(tmp_path, vecs).count == 600
+
+
+def test_legacy_root_layout_still_loads(vecs, tmp_path):
+    graph = HNSWGraph(vecs, M=8, ef_construction=64)
+    graph.add(200)
+    graph.save(tmp_path)
+    meta = json.loads((tmp_path / META_FILE).read_text(encoding="utf-8"))
+    gen_dir = tmp_path / meta.pop("dir")
+    for child in gen_dir.iterdir():
+        child.rename(tmp_path / child.name)
+    gen_dir.rmdir()
+    (tmp_path / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+
+    loaded = HNSWGraph.load(tmp_path, vecs)
+    np.testing.assert_array_equal(np.array(loaded.layer0), graph.layer0[:200])
+
+
+def test_index_loads_graph_only_for_hnsw_backend(vecs, tmp_path):
+    index = NewsIndex.create(tmp_path / "index")
+    dim = index.dim
+    data = _clustered(300, dim=dim, seed=1)
+    records = [{"headline": f"기사 {i}", "snippet": "", "date": "2026-01-02"} for i in range(len(data))]
+    index.append(data[:200], records[:200])
+    index.build_hnsw(M=8, ef_construction=64)
+
+    index.vector_backend = "flat"
+    index.append(data[200:], records[200:])
+    index.search_vector(data[0], top_k=5)
+    assert index._hnsw is None
+
+    index.vector_backend = "hnsw"
+    rows, _ = index.search_vector(data[250], top_k=5)
+    assert index._hnsw is not None and index._hnsw.count == 200
+    # 그래프 이후 추가된 행은 꼬리 스캔으로 찾음
+    assert rows[0] == 250
+    index.close()
@@ -0,0 +1,67 @@
+# BM25 + 벡터 하이브리드 검색: 후보 행만 꺼내 점수화, 연결된 행 범위 안에서만 결과
+
+import numpy as np
+
+from llm.tools.news_index.ngram import NgramIndex
+from llm.tools.news_index.store import NewsIndex
+
+
+def _index(tmp_path, n: int = 4) -> tuple[NewsIndex, np.ndarray, list[dict]]:
+    index = NewsIndex.create(tmp_path / "index")
+    vecs = np.eye(n, index.dim, dtype=np.float32)
+    headlines = ["정부 예산안 발표", "주말 고속도로 정체", "저금리 대출 사기 문자 주의", "대출 사기 피해 급증"]
+    records = [{"headline": h, "snippet": "", "date": "2026-01-02"} for h in headlines[:n]]
+    return index, vecs, records
+
+
+def test_lexical_candidates_past_mapped_count_are_dropped(tmp_path):
+    index, vecs, records = _index(tmp_path)
+    index.append(vecs[:2], records[:2])
+    reader = NewsIndex.open(tmp_path / "index")
+
+    # 다른 프로세스의 n-gram 세그먼트는 보이지만 manifest(count)는 아직 예전 값인 상태
+    index.append(vecs[2:], records[2:])
+    reader.ngram.reload()
+    assert reader.ngram.covered_rows == 4 and reader.count == 2
+
+    # 새 행만 키워드가 맞으므로 BM25 후보가 모두 걸러지고 연결된 행의 벡터 검색으로 넘어감
+    (hits, scores), = reader.search_hybrid_batch(["대출 사기"], vecs[1:2], top_k=4)
+    assert hits.tolist()[0] == 1
+    assert set(hits.tolist()) <= {0, 1}
+    reader.close()
+    index.close()
+
+
+def test_keyword_candidates_are_ranked_by_fused_score(tmp_path):
+    index, vecs, records = _index(tmp_path)
+    index.append(vecs, records)
+
+    (hits, scores), = index.search_hybrid_batch(["대출 사기"], vecs[3:4], top_k=4)
+    # 키워드가 맞는 행만 후보가 되고, 벡터 점수가 더 높은 행이 위로
+    assert hits.tolist() == [3, 2]
+    assert scores[0] > scores[1]
+    index.close()
+
+
+def test_compact_keeps_bm25_results(tmp_path):
+    ngram = NgramIndex(tmp_path / "bm25")
+    docs = ["검찰 수사관 사칭 전화", "카드사 해외 결제 문자", "저금리 대출 사기", "택배 주소 확인 문자", "가족 사칭 메신저"]
+    for start in range(0, len(docs), 2):
+        ngram.add_documents(start, docs[start:start + 2])
+    assert len(ngram.segments) == 3
+    before = ngram.search("카드사 결제 문자")
+
+    ngram.compact()
+    assert len(ngram.segments) == 1 and ngram.covered_rows == len(docs)
+    after = ngram.search("카드사 결제 문자")
+    np.testing.assert_array_equal(after[0], before[0])
+    np.testing.assert_allclose(after[1], before[1], rtol=1e-6)
+    assert after[0][0] == 1
+
+
+def test_allowed_mask_filters_postings(tmp_path):
+    ngram = NgramIndex(tmp_path / "bm25")
+    ngram.add_documents(0, ["대출 사기 주의", "날씨 맑음", "대출 사기 피해", "주식 시황"])
+    allowed = np.array([False, True, True, True])
+    rows, _ = ngram.search("대출 사기", allowed=allowed)
+    assert rows.tolist() == [2]
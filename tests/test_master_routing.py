@@ -0,0 +1,124 @@
+# Master 계획 단계: 흔한 반응은 템플릿 지시(LLM 없음), 애매한 반응만 LLM, fused 모드는 초안만 전달
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from llm.agents import master
+from llm.agents.evaluator import route_from_evaluator
+from llm.graph import workflow
+
+
+def _state(user_input: str, phase: str = "evaluate") -> dict:
+    return {
+        **workflow.get_initial_state("카드사 사칭"),
+        "current_phase": phase,
+        "messages": [AIMessage(content="OO카드 고객센터입니다. 해외 결제가 승인됐습니다.")],
+        "turn_count": 1,
+        "user_input": user_input,
+    }
+
+
+@pytest.mark.parametrize("text, signal", [
+    ("이거 보이스피싱 아니에요?", "suspicion"),
+    ("싫어요 안 알려줄래요", "refusal"),
+    ("네 알겠습니다 어떻게 하면 돼요", "compliance"),
+    ("음 글쎄요 잘 모르겠네", None),
+    # 의심과 협조가 섞이면 애매한 경우로 보고 LLM에 맡김
+    ("네 근데 이거 사기 아니죠?", None),
+])
+def test_classify_user_signal(text, signal):
+    assert master.classify_user_signal(text) == signal
+
+
+def test_reply_goes_to_evaluation_without_instruction():
+    # 계속 지시는 안전 판정 뒤 continue 노드에서 만듦
+    for fused in (False, True):
+        assert master._plan_master(_state("음 글쎄요 잘 모르겠네"), fused=fused) == {"current_phase": "evaluate"}
+
+
+def test_routine_reply_uses_template_without_llm():
+    plan = master._plan_continue(_state("이거 보이스피싱 아니에요?"))
+    assert isinstance(plan, dict)
+    assert plan["current_phase"] == "roleplay"
+    assert plan["master_instruction"] == master.ROUTINE_INSTRUCTIONS["suspicion"].format(scenario_topic="카드사 사칭")
+
+
+def test_ambiguous_reply_needs_llm():
+    plan = master._plan_continue(_state("음 글쎄요 잘 모르겠네"))
+    assert isinstance(plan, master._LLMCall)
+    assert plan.finish("지시")["current_phase"] == "roleplay"
+
+
+def test_fast_path_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(master, "MASTER_FAST_PATH", False)
+    assert isinstance(master._plan_continue(_state("이거 보이스피싱 아니에요?")), master._LLMCall)
+
+
+def test_fused_mode_passes_task_draft_without_llm():
+    plan = master._plan_continue(_state("음 글쎄요 잘 모르겠네"), fused=True)
+    assert isinstance(plan, dict)
+    assert plan["current_phase"] == "roleplay"
+    assert plan["master_instruction"]
+
+
+def test_input_free_evaluate_phase_continues_roleplay():
+    plan = master._plan_master(_state("", phase="evaluate"), fused=True)
+    assert plan["current_phase"] == "roleplay"
+
+
+@pytest.mark.parametrize("phase, node", [
+    ("topic_selection", "topic_selection"),
+    ("roleplay", "roleplay"),
+    ("evaluate", "evaluate"),
+    ("guardian", "guardian"),
+])
+def test_route_from_master(phase, node):
+    assert master.route_from_master({"current_phase": phase, "turn_count": 1}) == node
+
+
+def test_route_from_master_stops_at_turn_limit():
+    assert master.route_from_master({"current_phase": "evaluate", "turn_count": 20}) == "__end__"
+
+
+def test_route_from_evaluator():
+    assert route_from_evaluator({"evaluation_result": {"is_danger": True}}) == "guardian"
+    assert route_from_evaluator({"evaluation_result": {"is_danger": False}}) == "roleplay"
+    assert route_from_evaluator({}) == "roleplay"
+
+
+def test_routine_turn_skips_master_llm(fake_llms):
+    state = workflow.app.invoke(_state("이거 보이스피싱 아니에요?"))
+    assert state["messages"][-1].content.startswith("roleplay 응답")
+    # 템플릿 지시를 썼으므로 master LLM의 첫 응답이 아직 소비되지 않음
+    assert fake_llms["master"].invoke("확인").content == "master 지시 1"
+
+
+def _instruction_call(state: dict) -> master._LLMCall:
+    messages = master.get_short_term_messages(state.get("messages", []))
+    return master._generate_instruction(
+        state, "continue_roleplay", next_phase="evaluate",
+        conversation_context=master.build_context_for_llm(messages),
+    )
+
+
+def test_instruction_cache_is_not_shared_across_contexts():
+    master.get_semantic_cache("master").clear()
+    base = _state("음 글쎄요 잘 모르겠네")
+    first = _instruction_call(base)
+    first.remember("첫 대화용 지시")
+    assert _instruction_call(base).cached() == "첫 대화용 지시"
+
+    # 직전 AI 대사가 다른 대화(다른 세션)나 다른 턴 구간이면 같은 발화라도 재사용하지 않음
+    other_line = {**base, "messages": [AIMessage(content="서울중앙지검 수사관입니다. 명의 도용 건으로 연락드렸습니다.")]}
+    later_turn = {**base, "turn_count": base["turn_count"] + master.CACHE_TURN_BUCKET}
+    assert _instruction_call(other_line).cached() is None
+    assert _instruction_call(later_turn).cached() is None
+
+
+def test_input_free_steps_skip_instruction_cache():
+    master.get_semantic_cache("master").clear()
+    start = {**_state("", phase="roleplay"), "messages": []}
+    call = _instruction_call(start)
+    call.remember("시작 지시")
+    assert call.cache_role is None
+    assert _instruction_call(start).cached() is None
@@ -0,0 +1,59 @@
+# 세션 고정 뉴스 컨텍스트: 주제가 같으면 재검색하지 않고, 주제 변경·대화 이탈 시에만 갱신
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from llm.agents import roleplay_agent
+
+
+@pytest.fixture
+def searches(monkeypatch):
+    queries = []
+
+    def fake_results(query, topic=""):
+        queries.append(query)
+        return [{"headline": f"{query} 기사", "snippet": "사례 요약", "date": "2026-01-02"}]
+
+    monkeypatch.setattr(roleplay_agent, "_get_news_results", fake_results)
+    return queries
+
+
+def _pinned(topic: str = "검찰 사칭", turn: int = 1) -> dict:
+    return {
+        "news_context": "[1] 검찰 사칭 기사",
+        "news_results": [{"headline": "검찰 사칭 기사", "snippet": "사례 요약"}],
+        "news_context_query": topic,
+        "news_context_topic": topic,
+        "news_context_turn": turn,
+    }
+
+
+def test_first_turn_pins_topic_query(searches):
+    update = roleplay_agent._refresh_news_context({}, [], "검찰 사칭", 0)
+    assert searches == ["검찰 사칭"]
+    assert update["news_context_topic"] == "검찰 사칭"
+    assert update["news_context_turn"] == 0
+    assert "검찰 사칭 기사" in update["news_context"]
+
+
+def test_same_topic_reuses_pinned_context(searches):
+    messages = [AIMessage(content="서울중앙지검 검찰 수사관입니다"), HumanMessage(content="검찰이요?")]
+    assert roleplay_agent._refresh_news_context(_pinned(), messages, "검찰 사칭", 3) == {}
+    assert searches == []
+
+
+def test_topic_change_searches_again(searches):
+    update = roleplay_agent._refresh_news_context(_pinned(), [], "대출 사기", 3)
+    assert searches == ["대출 사기"]
+    assert update["news_context_topic"] == "대출 사기"
+
+
+def test_drift_refreshes_only_after_min_turns(searches):
+    messages = [AIMessage(content="택배 배송지 주소가 잘못됐습니다"), HumanMessage(content="택배 주소 링크 다시 보내주세요")]
+    early = 1 + roleplay_agent.NEWS_REFRESH_MIN_TURNS - 1
+    assert roleplay_agent._refresh_news_context(_pinned(), messages, "검찰 사칭", early) == {}
+
+    late = 1 + roleplay_agent.NEWS_REFRESH_MIN_TURNS
+    update = roleplay_agent._refresh_news_context(_pinned(), messages, "검찰 사칭", late)
+    assert searches == ["검찰 사칭 택배 주소 링크 다시 보내주세요"]
+    assert update["news_context_turn"] == late
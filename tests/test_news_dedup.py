@@ -0,0 +1,172 @@
+# 뉴스 수집 중복 필터: 근접 중복 판정과 commit 시점
+# 인덱스에 반영되지 않은 기사는 중복 필터에 "본 적 있음"으로 남으면 안 됨
+
+import json
+
+import pytest
+
+from llm.tools.news_index.dedup import NearDuplicateFilter
+from llm.tools.news_index.ingest import DEDUP_FILE, chunk_text, ingest, normalize_article
+from llm.tools.news_index.store import NewsIndex
+
+
+BODY = (
+    "서울중앙지검 수사관을 사칭한 일당이 피해자에게 전화를 걸어 계좌가 범죄에 연루됐다며 "
+    "안전계좌로 돈을 옮기라고 요구했다. 경찰은 검찰이 전화로 송금을 요구하는 일은 없다고 강조했다."
+)
+
+
+def _article(i: int) -> dict:
+    return {
+        "title": f"보이스피싱 사례 {i}",
+        "body": f"{i}번째 사례. 피해자 {i}명이 {i * 7}만원을 잃었다. 사건 번호 {i:05d}의 수법은 대출 빙자였다. 기사 고유 문장 {i}.",
+        "date": "2026-01-02",
+        "url": f"https://example.com/{i}",
+    }
+
+
+def _write_jsonl(path, articles, bad_line=False):
+    with open(path, "w", encoding="utf-8") as f:
+        for article in articles:
+            f.write(json.dumps(article, ensure_ascii=False) + "\n")
+        if bad_line:
+            f.write("{잘못된 JSON\n")
+    return path
+
+
+def test_near_duplicate_detected(tmp_path):
+    dedup = NearDuplicateFilter(tmp_path / DEDUP_FILE)
+    is_dup, sig = dedup.check("a", BODY)
+    assert not is_dup
+    dedup.add("a", sig)
+
+    # 다른 URL로 재송고된 같은 기사 (끝 문구만 다름)
+    assert dedup.check("b", BODY + " (종합)")[0]
+    assert dedup.check("a", "완전히 다른 본문")[0]              # 같은 키
+    assert not dedup.check("c", "택배 배송 조회 문자로 악성 앱을 설치하게 한 스미싱 사례가 늘었다.")[0]
+    dedup.close()
+
+
+def test_uncommitted_adds_are_discarded(tmp_path):
+    path = tmp_path / DEDUP_FILE
+    dedup = NearDuplicateFilter(path)
+    dedup.add("a", dedup.check("a", BODY)[1])
+    dedup.rollback()
+    assert not dedup.seen("a")
+
+    dedup.add("b", dedup.check("b", BODY)[1])
+    dedup.close()   # commit 없이 종료
+    reopened = NearDuplicateFilter(path)
+    assert not reopened.seen("b")
+    assert not reopened.check("c", BODY)[0]
+    reopened.close()
+
+
+def test_committed_adds_persist(tmp_path):
+    path = tmp_path / DEDUP_FILE
+    dedup = NearDuplicateFilter(path)
+    dedup.add("a", dedup.check("a", BODY)[1])
+    dedup.commit()
+    dedup.close()
+    reopened = NearDuplicateFilter(path)
+    assert reopened.seen("a")
+    reopened.close()
+
+
+def test_failed_ingest_can_be_retried(tmp_path):
+    index_dir = tmp_path / "index"
+    articles = [_article(i) for i in range(50)]
+    broken = _write_jsonl(tmp_path / "broken.jsonl", articles, bad_line=True)
+
+    with pytest.raises(json.JSONDecodeError):
+        ingest([broken], index_dir)
+
+    stats = ingest([_write_jsonl(tmp_path / "good.jsonl", articles)], index_dir)
+    assert stats.duplicates == 0
+    assert stats.articles_indexed == 50
+    assert len(NewsIndex.open(index_dir)) == stats.chunks_indexed > 0
+
+
+def test_flushed_articles_stay_deduplicated_after_failure(tmp_path):
+    index_dir = tmp_path / "index"
+    first = [_article(i) for i in range(20)]
+    ingest([_write_jsonl(tmp_path / "first.jsonl", first)], index_dir)
+
+    # 이미 색인된 20건 + 새 기사 5건을 다시 넣다가 실패 → 재시도 시 새 기사만 색인
+    second = first + [_article(i) for i in range(100, 105)]
+    with pytest.raises(json.JSONDecodeError):
+        ingest([_write_jsonl(tmp_path / "second.jsonl", second, bad_line=True)], index_dir)
+    stats = ingest([_write_jsonl(tmp_path / "retry.jsonl", second)], index_dir)
+    assert stats.duplicates == 20
+    assert stats.articles_indexed == 5
+
+
+def test_index_write_failure_keeps_dedup_in_step(tmp_path, monkeypatch):
+    index_dir = tmp_path / "index"
+    articles = [
+        {**_article(i), "body": " ".join(f"{i}번 기사의 {j}번째 문장은 수법 {i * 31 + j}을 설명한다." for j in range(40))}
+        for i in range(4)
+    ]
+    path = _write_jsonl(tmp_path / "long.jsonl", articles)
+
+    # 두 번째 인덱스 쓰기에서 실패 (기사 여러 청크가 flush 경계에 걸쳐도 기사 단위로만 확정돼야 함)
+    append = NewsIndex.append
+    calls = []
+
+    def failing_append(self, embeddings, records):
+        calls.append(len(records))
+        if len(calls) == 2:
+            raise OSError("디스크 쓰기 실패")
+        return append(self, embeddings, records)
+
+    monkeypatch.setattr(NewsIndex, "append", failing_append)
+    with pytest.raises(OSError):
+        ingest([path], index_dir, embed_batch=4, flush_rows=5)
+    monkeypatch.setattr(NewsIndex, "append", append)
+
+    index = NewsIndex.open(index_dir)
+    first_keys = {r["article_key"] for r in index.get_records(list(range(len(index))))}
+    index.close()
+    assert 0 < len(first_keys) < len(articles)
+
+    stats = ingest([path], index_dir, embed_batch=4, flush_rows=5)
+    assert stats.duplicates == len(first_keys)
+    assert stats.articles_indexed == len(articles) - len(first_keys)
+
+    index = NewsIndex.open(index_dir)
+    records = index.get_records(list(range(len(index))))
+    for article in articles:
+        chunks = [r["chunk"] for r in records if r["article_key"] == article["url"]]
+        assert sorted(chunks) == list(range(max(chunks) + 1))   # 청크 누락·중복 없음
+
+
+def test_ingest_backfills_bm25_for_uncovered_rows(tmp_path, monkeypatch):
+    index_dir = tmp_path / "index"
+    # 역색인 없이 만든 인덱스 (covered_rows가 count보다 작은 상태)
+    with monkeypatch.context() as m:
+        m.setattr("llm.tools.news_index.ngram.NgramIndex.add_documents", lambda self, start, texts: None)
+        ingest([_write_jsonl(tmp_path / "old.jsonl", [_article(i) for i in range(5)])], index_dir)
+    assert NewsIndex.open(index_dir).ngram.covered_rows == 0
+
+    ingest([_write_jsonl(tmp_path / "new.jsonl", [_article(i) for i in range(100, 103)])], index_dir)
+    index = NewsIndex.open(index_dir)
+    assert index.ngram.covered_rows == len(index)
+    rows, _ = index.ngram.search("기사 고유 문장 101")
+    assert any("기사 고유 문장 101" in r["snippet"] for r in index.get_records(rows[:3]))
+
+
+def test_normalize_article_maps_aliases_and_dates():
+    article = normalize_article({"제목": "<b>카드사</b> 사칭", "본문": "본문&nbsp;내용", "날짜": "2026년 1월 5일"})
+    assert article["headline"] == "카드사 사칭"
+    assert article["body"] == "본문 내용"
+    assert article["date"] == "2026-01-05"
+    assert article["source"] == "매일경제"
+    assert normalize_article({"title": "본문 없음", "body": ""}) is None
+
+
+def test_chunk_text_respects_limit_and_overlap():
+    text = " ".join(f"{i}번째 문장입니다." for i in range(30))
+    chunks = chunk_text(text, max_chars=60, overlap=1)
+    assert all(len(c) <= 60 for c in chunks)
+    # 인접 청크는 마지막 문장을 공유
+    assert chunks[1].startswith(chunks[0].split(" ")[-2])
@@ -0,0 +1,65 @@
+# 로컬 뉴스 인덱스: 추가/다시 열기, generation 재연결, RAG 도구 연결
+
+import numpy as np
+import pytest
+
+from conftest import NEWS_ARTICLES
+from llm.tools import voice_phishing_rag
+from llm.tools.news_index.store import NewsIndex
+
+
+def test_append_and_reopen_roundtrip(tmp_path):
+    index = NewsIndex.create(tmp_path / "index")
+    vecs = np.eye(3, index.dim, dtype=np.float32)
+    assert index.append(vecs, [dict(a) for a in NEWS_ARTICLES]) == range(0, 3)
+    index.close()
+
+    reopened = NewsIndex.open(tmp_path / "index")
+    assert len(reopened) == 3
+    assert reopened.get_records([2, 0]) == [NEWS_ARTICLES[2], NEWS_ARTICLES[0]]
+    rows, scores = reopened.search_vector(vecs[1], top_k=2)
+    assert rows[0] == 1 and scores[0] == pytest.approx(1.0)
+    reopened.close()
+
+
+def test_append_rejects_mismatched_input(tmp_path):
+    index = NewsIndex.create(tmp_path / "index")
+    with pytest.raises(ValueError):
+        index.append(np.zeros((2, index.dim), dtype=np.float32), [{}])
+    with pytest.raises(ValueError):
+        index.append(np.zeros((1, index.dim + 1), dtype=np.float32), [{}])
+    with pytest.raises(ValueError):
+        NewsIndex.create(tmp_path / "index")
+    index.close()
+
+
+def test_reader_reloads_new_generation(tmp_path):
+    writer = NewsIndex.create(tmp_path / "index")
+    vecs = np.eye(3, writer.dim, dtype=np.float32)
+    writer.append(vecs[:1], [dict(NEWS_ARTICLES[0])])
+    reader = NewsIndex.open(tmp_path / "index")
+    assert not reader.reload()
+
+    writer.append(vecs[1:], [dict(a) for a in NEWS_ARTICLES[1:]])
+    assert len(reader) == 1
+    assert reader.reload()
+    assert len(reader) == 3
+    assert reader.get_records([2])[0]["headline"] == NEWS_ARTICLES[2]["headline"]
+    reader.close()
+    writer.close()
+
+
+def test_rag_tool_returns_placeholder_without_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(voice_phishing_rag, "INDEX_DIR", tmp_path / "missing")
+    monkeypatch.setattr(voice_phishing_rag, "_news_index", None)
+    monkeypatch.setattr(voice_phishing_rag, "_news_index_checked_at", float("-inf"))
+
+    results = voice_phishing_rag.search_voice_phishing_cases("카드사 사칭")
+    assert results[0]["headline"].startswith("[RAG 미구축]")
+
+
+def test_rag_tool_searches_local_index(news_index):
+    results = voice_phishing_rag.search_voice_phishing_cases("검찰 수사관 안전계좌", top_k=2)
+    assert results[0]["headline"] == "검찰 수사관 사칭 보이스피싱"
+    assert "score" in results[0]
+    assert "검찰 수사관" in voice_phishing_rag.format_rag_result_for_llm(results)
@@ -0,0 +1,181 @@
+# PII 1차 탐지 + 숫자 표기 정규화 경계 사례 (LLM 호출 없음)
+
+import pytest
+
+from llm.tools.numeral_normalizer import normalize_numerals
+from llm.tools.pii_detector import detect_pii, detect_pii_batch, luhn_valid, rrn_checksum_valid
+
+
+def _rrn(front: str, back6: str) -> str:
+    """앞 6자리 + 성별 자리 포함 뒤 6자리 → 검증 숫자까지 붙인 13자리"""
+    body = front + back6
+    total = sum(int(d) * w for d, w in zip(body, (2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5)))
+    return body + str((11 - total % 11) % 10)
+
+
+VALID_RRN = _rrn("900101", "123456")
+INVALID_RRN = VALID_RRN[:-1] + str((int(VALID_RRN[-1]) + 1) % 10)
+
+
+# ----------------------------------------------------------------------------
+# normalize_numerals
+# ----------------------------------------------------------------------------
+
+@pytest.mark.parametrize("text, expected", [
+    ("공일공 일이삼사 오육칠팔", "010 1234 5678"),
+    ("０１０－１２３４－５６７８", "010-1234-5678"),
+    ("비번은 일 이 삼 사요", "비번은 1234요"),
+    ("0 1 0 - 1 2 3 4 - 5 6 7 8", "01012345678"),
+    ("번호는 공일공이에요", "번호는 010이에요"),
+])
+def test_normalize_numerals(text, expected):
+    assert normalize_numerals(text).text == expected
+
+
+@pytest.mark.parametrize("text", [
+    "오백만 원 보냈어요",
+    "사이가 좋아요",
+    "오일 교환했어요",
+    "010-1234-5678",
+])
+def test_normalize_leaves_non_numbers_and_plain_digits(text):
+    assert normalize_numerals(text).text == text
+
+
+@pytest.mark.parametrize("text", [
+    "비밀번호는 일일이 말 못 해요",
+    "인증번호는 이삼일 뒤에 확인할게요",
+    "비밀번호 삼사일 전에 바꿨어요",
+    "이삼일이면 돼요",
+    "구일일 오일팔 기념일이에요",
+    "사이사이 일이 있어서요",
+])
+def test_lexical_words_and_day_ranges_are_not_numbers(text):
+    assert normalize_numerals(text).text == text
+
+
+def test_lexical_word_inside_spoken_number_is_still_converted():
+    assert normalize_numerals("오일팔 일이삼사").text == "518 1234"
+
+
+def test_normalized_offsets_map_back_to_original():
+    text = "제 번호는 공일공 일이삼사 오육칠팔 이에요"
+    normalized = normalize_numerals(text)
+    start = normalized.text.index("010")
+    end = start + len("010 1234 5678")
+    o_start, o_end = normalized.to_original(start, end)
+    assert text[o_start:o_end] == "공일공 일이삼사 오육칠팔"
+
+
+# ----------------------------------------------------------------------------
+# detect_pii
+# ----------------------------------------------------------------------------
+
+def test_checksums():
+    assert rrn_checksum_valid(VALID_RRN)
+    assert not rrn_checksum_valid(INVALID_RRN)
+    assert luhn_valid("4111111111111111")
+    assert not luhn_valid("4111111111111112")
+
+
+def test_rrn_checksum_decides_confirmation():
+    valid = detect_pii(f"주민번호 {VALID_RRN[:6]}-{VALID_RRN[6:]} 입니다")
+    invalid = detect_pii(f"주민번호 {INVALID_RRN[:6]}-{INVALID_RRN[6:]} 입니다")
+    assert valid.verdict == "danger"
+    assert valid.findings[0].kind == "주민등록번호" and valid.findings[0].confirmed
+    assert invalid.verdict == "ambiguous"
+    assert not invalid.findings[0].confirmed
+
+
+def test_rrn_with_impossible_date_is_not_rrn():
+    result = detect_pii("번호는 901301-1234567")
+    assert all(f.kind != "주민등록번호" for f in result.findings)
+
+
+def test_card_luhn():
+    assert detect_pii("카드 4111 1111 1111 1111").findings[0].confirmed
+    unconfirmed = detect_pii("4111-1111-1111-1112")
+    assert unconfirmed.verdict == "ambiguous"
+    assert unconfirmed.findings[0].kind == "카드번호"
+
+
+def test_spoken_phone_number_is_found_at_original_position():
+    text = "제 번호는 공일공 일이삼사 오육칠팔 이에요"
+    result = detect_pii(text)
+    assert result.verdict == "danger"
+    finding = result.findings[0]
+    assert finding.kind == "전화번호"
+    assert text[finding.start:finding.end] == "공일공 일이삼사 오육칠팔"
+    # 가린 값에 원래 숫자 뒷자리가 남지 않음
+    assert "5678" not in finding.masked
+
+
+def test_fullwidth_card_number():
+    result = detect_pii("카드번호는 ４１１１－１１１１－１１１１－１１１１")
+    assert result.verdict == "danger"
+    assert result.findings[0].kind == "카드번호"
+
+
+def test_account_needs_context():
+    assert detect_pii("국민은행 계좌 123456789012 로 보낼게요").verdict == "danger"
+    assert detect_pii("주문번호 123456789012 확인했어요").verdict == "ambiguous"
+
+
+def test_amounts_and_plain_talk_are_safe():
+    assert detect_pii("오백만 원이요? 그런 돈 없어요").verdict == "safe"
+    assert detect_pii("누구세요? 어디서 전화하신 거예요").verdict == "safe"
+    # 숫자 음절로 읽힐 수 있는 일상 단어가 이어져도 짧은 숫자열은 개인정보가 아님
+    assert detect_pii("이 일이 무슨 일이에요").verdict == "safe"
+
+
+@pytest.mark.parametrize("text", [
+    "비밀번호는 일일이 말 못 해요",
+    "인증번호는 이삼일 뒤에 확인할게요",
+    "비밀번호 삼사일 전에 바꿨어요",
+])
+def test_refusals_with_numeral_words_are_not_confirmed(text):
+    result = detect_pii(text)
+    assert result.verdict != "danger"
+    assert not any(f.confirmed for f in result.findings)
+
+
+@pytest.mark.parametrize("text", ["구일일 오일팔 기념일이에요", "사이사이 일이 있어서요"])
+def test_numeral_words_are_safe(text):
+    assert detect_pii(text).verdict == "safe"
+
+
+def test_spoken_secret_goes_to_llm_tier():
+    result = detect_pii("인증번호 일이삼사오육이요")
+    assert result.verdict == "ambiguous"
+    assert result.findings[0].kind == "인증번호/비밀번호"
+    assert not result.findings[0].confirmed
+
+
+def test_batch_matches_single():
+    texts = ["안녕하세요", "공일공 일이삼사 오육칠팔", f"{VALID_RRN[:6]}-{VALID_RRN[6:]}", "오백만 원"]
+    assert [d.verdict for d in detect_pii_batch(texts)] == [detect_pii(t).verdict for t in texts]
+
+
+@pytest.mark.parametrize("text", ["인증번호는 123456", "비번: 4821", "비밀번호 4821", "OTP는 483920 이에요"])
+def test_secret_right_after_keyword_is_confirmed(text):
+    result = detect_pii(text)
+    assert result.verdict == "danger"
+    assert result.findings[0].kind == "인증번호/비밀번호" and result.findings[0].confirmed
+
+
+@pytest.mark.parametrize("text", [
+    "인증번호가 문자로 왔는데 482913",
+    "보안카드 12번은 5821",
+])
+def test_secret_keyword_with_words_between_goes_to_llm_tier(text):
+    result = detect_pii(text)
+    assert result.verdict == "ambiguous"
+    assert result.findings[0].kind == "인증번호/비밀번호"
+    assert not result.findings[0].confirmed
+
+
+@pytest.mark.parametrize("text", ["비밀번호 3번 틀렸어요 100번도 더", "비밀번호 100번 틀렸어요", "인증번호 6자리 맞죠"])
+def test_counts_after_secret_keyword_are_not_secrets(text):
+    result = detect_pii(text)
+    assert result.verdict != "danger"
+    assert all(f.kind != "인증번호/비밀번호" for f in result.findings)
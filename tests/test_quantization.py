@@ -0,0 +1,76 @@
+# int8 양자화 스캔 + float32 재점수: 정확 검색과의 일치, 증분 추가 후 동기화
+
+import numpy as np
+import pytest
+
+from llm.tools.news_index.quantize import recall_at_k
+from llm.tools.news_index.store import NewsIndex, quantize_int8
+
+
+def _vectors(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(10, dim)).astype(np.float32)
+    vecs = centers[rng.integers(0, 10, n)] + 0.7 * rng.normal(size=(n, dim)).astype(np.float32)
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = NewsIndex.create(tmp_path / "index")
+    vecs = _vectors(2000, index.dim)
+    index.append(vecs, [{"headline": f"기사 {i}", "snippet": "", "date": None} for i in range(len(vecs))])
+    index.build_quantized()
+    yield index
+    index.close()
+
+
+def _search(index, queries, top_k, quantization, rerank):
+    index.quantization, index.rerank_candidates = quantization, rerank
+    return index.search_vector_batch(queries, top_k)
+
+
+def test_quantize_int8_roundtrip_error_is_small():
+    vecs = _vectors(100, 64)
+    qvecs, scales = quantize_int8(vecs)
+    assert qvecs.dtype == np.int8
+    restored = qvecs.astype(np.float32) * scales[:, None]
+    assert np.abs(restored - vecs).max() <= scales.max() / 2 + 1e-6
+    zero, zero_scale = quantize_int8(np.zeros((1, 8), dtype=np.float32))
+    assert not zero.any() and zero_scale[0] == 0
+
+
+def test_rerank_returns_exact_scores_and_high_recall(index):
+    queries = _vectors(30, index.dim, seed=1)
+    exact = _search(index, queries, 10, "none", 0)
+    approx = _search(index, queries, 10, "int8", 0)
+    reranked = _search(index, queries, 10, "int8", 100)
+
+    truth = [rows for rows, _ in exact]
+    assert recall_at_k([rows for rows, _ in reranked], truth) >= 0.98
+    assert recall_at_k([rows for rows, _ in reranked], truth) >= recall_at_k([rows for rows, _ in approx], truth)
+    for (rows, scores), q in zip(reranked, queries):
+        # 재점수 후 점수는 float32 원본 내적과 같고 내림차순
+        np.testing.assert_allclose(scores, index.vectors[rows] @ q, rtol=1e-5, atol=1e-6)
+        assert np.all(np.diff(scores) <= 1e-7)
+
+
+def test_append_after_build_keeps_int8_in_sync(index):
+    extra = _vectors(50, index.dim, seed=2)
+    index.append(extra, [{"headline": "추가", "snippet": "", "date": None}] * len(extra))
+    assert index.quantized_ready
+
+    rows, scores = _search(index, extra[:1], 1, "int8", 50)[0]
+    assert rows[0] == 2000
+    assert scores[0] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_filtered_rows_are_respected(index):
+    queries = _vectors(5, index.dim, seed=3)
+    allowed = np.arange(0, 2000, 7)
+    index.quantization, index.rerank_candidates = "none", 0
+    exact = index.search_vector_batch(queries, 5, rows=allowed)
+    index.quantization, index.rerank_candidates = "int8", 50
+    reranked = index.search_vector_batch(queries, 5, rows=allowed)
+    for (rows, _), (truth, _) in zip(reranked, exact):
+        assert np.isin(rows, allowed).all()
+        assert set(rows.tolist()) == set(truth.tolist())
@@ -0,0 +1,36 @@
+# RAG 일괄/비동기 검색: 배치 결과가 개별 검색과 같고, 동시에 들어온 asearch는 한 번에 처리
+
+import asyncio
+
+from llm.tools import voice_phishing_rag
+from llm.tools.news_index.store import NewsIndex
+
+QUERIES = ["카드사 해외 결제", "검찰 안전계좌", "저금리 대출"]
+
+
+def test_search_many_matches_single_queries(news_index):
+    batch = voice_phishing_rag.search_many(QUERIES + [QUERIES[0]], top_k=2)
+    assert len(batch) == 4
+    assert batch[3] == batch[0]
+    for query, results in zip(QUERIES, batch):
+        assert results == news_index.search(query, top_k=2)
+
+
+def test_concurrent_asearch_calls_share_one_batch(news_index, monkeypatch):
+    calls = []
+    search_many = NewsIndex.search_many
+
+    def counting(self, queries, *args, **kwargs):
+        calls.append(list(queries))
+        return search_many(self, queries, *args, **kwargs)
+
+    monkeypatch.setattr(NewsIndex, "search_many", counting)
+
+    async def run():
+        return await asyncio.gather(*(voice_phishing_rag.asearch(q, top_k=1) for q in QUERIES))
+
+    results = asyncio.run(run())
+    assert calls == [QUERIES]
+    assert [r[0]["headline"] for r in results] == [
+        "카드사 사칭 문자 주의보", "검찰 수사관 사칭 보이스피싱", "저금리 대출 사기 급증",
+    ]
@@ -0,0 +1,41 @@
+# RAG 벤치마크: --index-dir로 지정한 운영 인덱스는 수정하지 않아야 함
+
+import sys
+
+from llm.tools import rag_benchmark
+from llm.tools.news_index.hnsw import HNSWGraph
+from llm.tools.news_index.store import HNSW_DIR, MANIFEST_FILE
+
+
+def _live_index(tmp_path):
+    index_dir = tmp_path / "live"
+    index, _ = rag_benchmark.build_corpus(index_dir, rag_benchmark.synthetic_articles(300, vocab_size=500), 300)
+    index.close()
+    return index_dir
+
+
+def test_read_only_run_skips_missing_structures(tmp_path):
+    index_dir = _live_index(tmp_path)
+    manifest = (index_dir / MANIFEST_FILE).read_bytes()
+
+    results = rag_benchmark.run_benchmark(index_dir, ("flat", "int8", "hnsw"), num_queries=10, build=False)
+
+    assert [r.mode for r in results] == ["flat"]
+    assert (index_dir / MANIFEST_FILE).read_bytes() == manifest
+    assert not HNSWGraph.exists(index_dir / HNSW_DIR)
+
+
+def test_build_flag_builds_on_a_copy(tmp_path, monkeypatch):
+    index_dir = _live_index(tmp_path)
+    manifest = (index_dir / MANIFEST_FILE).read_bytes()
+    keep = tmp_path / "copy"
+    monkeypatch.setattr(sys, "argv", [
+        "rag_benchmark", "--index-dir", str(index_dir), "--build", "--keep", str(keep),
+        "--modes", "int8,hnsw", "--queries", "10",
+    ])
+
+    rag_benchmark.main()
+
+    assert (index_dir / MANIFEST_FILE).read_bytes() == manifest
+    assert not HNSWGraph.exists(index_dir / HNSW_DIR)
+    assert HNSWGraph.exists(keep / HNSW_DIR)
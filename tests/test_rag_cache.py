@@ -0,0 +1,51 @@
+# RAG 검색 결과 캐시: LRU/TTL 제거, generation 무효화, 정규화된 쿼리 키
+
+from llm.tools import voice_phishing_rag
+from llm.tools.news_index import ResultCache, make_query_key
+from llm.tools.news_index import cache as cache_module
+
+
+def test_lru_eviction_and_hit_rate():
+    cache = ResultCache(max_entries=2, ttl_seconds=0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1   # a가 최근 사용
+    cache.put("c", 3)            # b 제거
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 1, 1, 2)
+    assert stats.as_dict()["hit_rate"] == 0.5
+
+
+def test_ttl_expiration(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = ResultCache(max_entries=4, ttl_seconds=10)
+    cache.put("a", 1)
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats().expirations == 1
+
+
+def test_generation_change_invalidates():
+    cache = ResultCache()
+    cache.put("a", 1, generation=1)
+    assert cache.get("a", generation=2) is None
+    assert cache.stats().invalidations == 1
+
+
+def test_query_key_ignores_spacing_and_width():
+    assert make_query_key("  카드사   사칭 ", 3) == make_query_key("카드사 사칭", 3)
+    assert make_query_key("ＯＴＰ 사기", 3) == make_query_key("otp 사기", 3)
+    assert make_query_key("카드사 사칭", 3) != make_query_key("카드사 사칭", 5)
+
+
+def test_rag_tool_serves_repeat_queries_from_cache(news_index):
+    first = voice_phishing_rag.search_voice_phishing_cases("카드사 사칭", top_k=2)
+    first[0]["headline"] = "호출 측 수정"
+    second = voice_phishing_rag.search_voice_phishing_cases("카드사  사칭", top_k=2)
+
+    stats = voice_phishing_rag.get_rag_cache_stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+    # 호출 측 수정이 캐시에 남지 않아야 함
+    assert second[0]["headline"] != "호출 측 수정"
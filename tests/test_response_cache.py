@@ -0,0 +1,62 @@
+# 결정적 역할 LLM 응답 캐시: 파일에 남아 프로세스 재시작 후에도 재사용, 설정이 다르면 다른 키
+
+import itertools
+
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from llm.utils import llm as llm_utils
+from llm.utils.llm import SQLiteResponseCache
+
+
+def _counting_chat(cache) -> GenericFakeChatModel:
+    return GenericFakeChatModel(
+        messages=(AIMessage(content=f"응답 {i}") for i in itertools.count(1)),
+        cache=cache,
+    )
+
+
+def test_repeat_prompt_is_served_from_file(tmp_path):
+    path = tmp_path / "llm_cache.sqlite"
+    chat = _counting_chat(SQLiteResponseCache(path))
+    assert chat.invoke("주제를 추출하세요").content == "응답 1"
+    assert chat.invoke("주제를 추출하세요").content == "응답 1"
+    assert chat.invoke("다른 입력").content == "응답 2"
+
+    # 새 인스턴스(프로세스 재시작)도 같은 파일의 응답을 재사용
+    restarted = SQLiteResponseCache(path)
+    assert _counting_chat(restarted).invoke("주제를 추출하세요").content == "응답 1"
+    stats = restarted.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 0, 2)
+
+
+def test_llm_string_is_part_of_the_key(tmp_path):
+    cache = SQLiteResponseCache(tmp_path / "llm_cache.sqlite")
+    generation = [ChatGeneration(message=AIMessage(content="저장된 응답"))]
+    cache.update("프롬프트", "model=a,temperature=0", generation)
+    assert cache.lookup("프롬프트", "model=a,temperature=0")[0].message.content == "저장된 응답"
+    assert cache.lookup("프롬프트", "model=a,temperature=0.7") is None
+
+
+def test_eviction_drops_least_recently_used(tmp_path, monkeypatch):
+    clock = itertools.count(1)
+    monkeypatch.setattr(llm_utils.time, "time", lambda: float(next(clock)))
+    cache = SQLiteResponseCache(tmp_path / "llm_cache.sqlite", max_entries=10)
+    for i in range(10):
+        cache.update(f"p{i}", "llm", [ChatGeneration(message=AIMessage(content=str(i)))])
+    assert cache.lookup("p0", "llm") is not None   # p0은 최근 사용
+    cache.update("p10", "llm", [ChatGeneration(message=AIMessage(content="10"))])
+
+    stats = cache.stats()
+    assert stats.evictions == 2 and stats.size == 9
+    assert cache.lookup("p0", "llm") is not None
+    assert cache.lookup("p1", "llm") is None
+
+
+def test_only_configured_roles_use_the_cache(monkeypatch, tmp_path):
+    cache = SQLiteResponseCache(tmp_path / "llm_cache.sqlite")
+    monkeypatch.setattr(llm_utils, "_response_cache", cache)
+    monkeypatch.setattr(llm_utils, "LLM_CACHE_ROLES", {"topic"})
+    assert llm_utils._cache_for("topic") is cache
+    assert llm_utils._cache_for("roleplay") is False
@@ -0,0 +1,49 @@
+# 로컬 주제 해석기: 별칭·오타는 LLM 없이 정식 라벨로, 애매한 입력만 LLM으로
+
+import pytest
+
+from llm.agents import master
+from llm.utils.scenario_topics import TOPIC_CONFIDENCE, canonical_topic, edit_distance, resolve_scenario_topic
+
+
+@pytest.mark.parametrize("text, label", [
+    ("검찰 전화 연습할래요", "검찰 사칭"),
+    ("카드사사칭", "카드사 사칭"),
+    ("택배 문자 사기요", "택배·문자 사기"),
+    ("저금리 대출로 해주세요", "대출 사기"),
+])
+def test_alias_resolves_with_full_confidence(text, label):
+    match = resolve_scenario_topic(text)
+    assert match.label == label and match.score == 1.0
+
+
+@pytest.mark.parametrize("text, label", [
+    ("검찰사징", "검찰 사칭"),
+    ("카드서 사칭", "카드사 사칭"),
+])
+def test_typos_resolve_by_jamo_distance(text, label):
+    match = resolve_scenario_topic(text)
+    assert match.label == label and match.score >= TOPIC_CONFIDENCE
+
+
+def test_unrelated_input_is_not_confident():
+    match = resolve_scenario_topic("음 아무거나 괜찮아요")
+    assert match is None or match.score < TOPIC_CONFIDENCE
+    assert resolve_scenario_topic("  보이스피싱 연습  ") is None
+
+
+def test_canonical_topic_keeps_unknown_text():
+    assert canonical_topic(" 검찰 사칭 ") == "검찰 사칭"
+    assert canonical_topic("우주 여행 사기") == "우주 여행 사기"
+
+
+def test_edit_distance():
+    assert edit_distance("ㄱㅓㅁㅊㅏㄹ", "ㄱㅓㅁㅊㅏㄹ") == 0
+    assert edit_distance("abc", "abd") == 1
+    assert edit_distance("", "abc") == 3
+
+
+def test_master_parses_confident_topic_without_llm():
+    plan = master._parse_topic_from_input("검찰 전화 연습할래요", "")
+    assert plan == master._topic_selected("검찰 사칭")
+    assert isinstance(master._parse_topic_from_input("음 아무거나 괜찮아요", ""), master._LLMCall)
@@ -0,0 +1,63 @@
+# 대화 기록 일괄 채점: 사용자 메시지별 (직전 사기범 대사, 발화) 항목, 패턴 단계 확정 / LLM 단계 분기
+
+import json
+
+from llm import score_transcripts
+from llm.score_transcripts import BatchStats, iter_items, score_transcripts as score
+
+TRANSCRIPTS = [
+    {"id": "s1", "messages": [
+        {"role": "assistant", "content": "서울중앙지검 수사관입니다. 본인 확인이 필요합니다."},
+        {"role": "user", "content": "제 주민번호는 900101-1234568 입니다"},
+        {"role": "ai", "content": "감사합니다. 계좌도 확인하겠습니다."},
+        {"role": "human", "content": "누구세요? 끊을게요"},
+    ]},
+    {"id": "s2", "messages": [
+        {"role": "assistant", "content": "인증번호 보내드렸습니다."},
+        {"role": "user", "content": "인증번호가 문자로 왔는데 482913"},
+    ]},
+]
+
+
+def _write(tmp_path):
+    path = tmp_path / "transcripts.jsonl"
+    path.write_text("\n".join(json.dumps(t, ensure_ascii=False) for t in TRANSCRIPTS) + "\n", encoding="utf-8")
+    return path
+
+
+def test_items_pair_user_message_with_previous_scammer_line():
+    stats = BatchStats()
+    items = list(iter_items(TRANSCRIPTS, stats))
+    assert [(i.transcript_id, i.index) for i in items] == [("s1", 1), ("s1", 3), ("s2", 1)]
+    assert items[1].scammer_line == "감사합니다. 계좌도 확인하겠습니다."
+    assert stats.transcripts == 2
+
+
+def test_pattern_only_run_settles_or_skips(tmp_path):
+    results, stats = score([_write(tmp_path)], workers=2, use_llm=False, chunk_size=2)
+    by_key = {(r["transcript_id"], r["index"]): r for r in results}
+
+    assert by_key[("s1", 1)]["tier"] == "pattern"
+    assert by_key[("s1", 1)]["evaluation_result"]["is_danger"] is True
+    assert by_key[("s1", 3)]["evaluation_result"]["is_danger"] is False
+    assert by_key[("s2", 1)]["tier"] == "skipped"
+    assert by_key[("s2", 1)]["evaluation_result"] is None
+    assert (stats.messages, stats.pattern_settled, stats.skipped, stats.danger) == (3, 2, 1, 1)
+
+
+def test_ambiguous_items_go_to_llm_workers(tmp_path, monkeypatch):
+    evaluate = score_transcripts.evaluate_message
+    escalated = []
+
+    def fake_evaluate(user_message, scammer_line, detection):
+        if detection.verdict == "ambiguous":
+            escalated.append(user_message)
+            return {"is_danger": True, "category": "인증번호", "reason": "테스트", "confidence": 0.9}
+        return evaluate(user_message, scammer_line, detection)
+
+    monkeypatch.setattr(score_transcripts, "evaluate_message", fake_evaluate)
+    results, stats = score([_write(tmp_path)], workers=1, llm_workers=2, chunk_size=8)
+
+    assert escalated == ["인증번호가 문자로 왔는데 482913"]
+    assert [r["tier"] for r in results if r["transcript_id"] == "s2"] == ["llm"]
+    assert (stats.escalated, stats.danger) == (1, 2)
@@ -0,0 +1,38 @@
+# 의미 캐시: 같은 scope의 비슷한 발화만 적중, 다른 scope·다른 발화는 재사용하지 않음
+
+from llm.utils.semantic_cache import SemanticCache
+
+
+def test_near_duplicate_input_hits_within_scope():
+    cache = SemanticCache(threshold=0.7)
+    cache.store("parse_topic", "검찰 사칭으로 해주세요", "검찰 사칭")
+    assert cache.lookup("parse_topic", "검찰 사칭으로  해 주세요!") == "검찰 사칭"
+    assert cache.lookup("other_scope", "검찰 사칭으로 해주세요") is None
+    assert cache.lookup("parse_topic", "택배 문자 사기로 할래요") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 1)
+
+
+def test_empty_text_matches_scope_exactly_only():
+    cache = SemanticCache(threshold=0.7)
+    cache.store("scope", "", "빈 입력 값")
+    assert cache.lookup("scope", "") == "빈 입력 값"
+    # 빈 텍스트 항목은 유사도 후보가 되지 않음
+    assert cache.lookup("scope", "네 알겠습니다") is None
+
+
+def test_lru_eviction():
+    cache = SemanticCache(threshold=0.95, max_entries=2)
+    cache.store("s", "첫 번째 발화", "1")
+    cache.store("s", "두 번째 발화", "2")
+    assert cache.lookup("s", "첫 번째 발화") == "1"
+    cache.store("s", "세 번째 발화", "3")
+    assert cache.lookup("s", "두 번째 발화") is None
+    assert cache.stats().evictions == 1
+
+
+def test_threshold_above_one_disables_cache():
+    cache = SemanticCache(threshold=2.0)
+    cache.store("s", "검찰", "값")
+    assert not cache.enabled
+    assert cache.lookup("s", "검찰") is None
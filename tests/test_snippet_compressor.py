@@ -0,0 +1,46 @@
+# 뉴스 스니펫 추출 압축: 예산 안에서 주제·사용자 발화와 관련된 문장만, 원래 순서대로
+
+from llm.tools.snippet_compressor import compress_results, estimate_tokens
+
+RESULTS = [
+    {
+        "headline": "검찰 사칭 보이스피싱 기승",
+        "snippet": "서울중앙지검 수사관을 사칭한 전화가 늘었다. 날씨가 추워져 외출이 줄었다. "
+                   "사기범은 안전계좌로 돈을 옮기라고 요구했다. 경찰은 검찰이 송금을 요구하지 않는다고 밝혔다.",
+    },
+    {
+        "headline": "주말 나들이 인파",
+        "snippet": "주말 고속도로가 나들이 차량으로 붐볐다. 휴게소마다 긴 줄이 생겼다.",
+    },
+]
+
+
+def _tokens(results):
+    return sum(estimate_tokens(r["headline"]) + estimate_tokens(r["snippet"]) for r in results)
+
+
+def test_keeps_relevant_sentences_within_budget():
+    compressed = compress_results(RESULTS, topic="검찰 사칭", user_message="안전계좌로 옮기면 되나요", token_budget=60)
+    assert _tokens(compressed) <= 60
+    snippet = compressed[0]["snippet"]
+    assert "안전계좌" in snippet
+    assert "날씨" not in snippet
+    # 관련 없는 기사는 빠짐
+    assert [r["headline"] for r in compressed] == ["검찰 사칭 보이스피싱 기승"]
+
+
+def test_selected_sentences_keep_original_order():
+    compressed = compress_results(RESULTS, topic="검찰 사칭", user_message="안전계좌 송금", token_budget=200)
+    snippet = compressed[0]["snippet"]
+    assert snippet.index("안전계좌") < snippet.index("송금을 요구하지")
+
+
+def test_input_is_not_modified():
+    before = [dict(r) for r in RESULTS]
+    compress_results(RESULTS, topic="검찰 사칭", token_budget=20)
+    assert RESULTS == before
+
+
+def test_estimate_tokens_counts_hangul_syllables():
+    assert estimate_tokens("검찰 사칭") == 4
+    assert estimate_tokens("OTP 1234") == 2
@@ -0,0 +1,64 @@
+# TurnStream: 노드 전환 시 구분, 도중 실패 시 부분 상태를 확정하지 않음
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from llm.graph import workflow
+
+
+class _ScriptedApp:
+    """미리 정한 (mode, payload) 이벤트를 내보내는 가짜 그래프 (fail이면 마지막에 예외)"""
+
+    def __init__(self, events, fail=False):
+        self.events = events
+        self.fail = fail
+
+    def stream(self, state, stream_mode):
+        yield from self.events
+        if self.fail:
+            raise RuntimeError("LLM 호출 실패")
+
+
+def _chunk(text, node):
+    return "messages", (AIMessageChunk(content=text), {"langgraph_node": node})
+
+
+def test_node_change_is_separated(monkeypatch):
+    final = {"messages": [AIMessage(content="주제 안내"), AIMessage(content="사기범 대사")]}
+    monkeypatch.setattr(workflow, "app", _ScriptedApp([
+        _chunk("주제 ", "topic_selection"),
+        _chunk("안내", "topic_selection"),
+        ("messages", (AIMessage(content="주제 안내"), {"langgraph_node": "topic_selection"})),
+        _chunk("사기범 대사", "roleplay"),
+        ("values", final),
+    ]))
+
+    turn = workflow.stream_single_turn({}, user_input="검찰")
+
+    assert list(turn) == ["주제 ", "안내", "\n\n", "사기범 대사"]
+    assert turn.state is final
+
+
+def test_held_speculative_line_is_separated_from_earlier_node(monkeypatch):
+    monkeypatch.setattr(workflow, "app", _ScriptedApp([
+        _chunk("안내", "guardian"),
+        ("custom", {workflow.SPECULATION_EVENT: "pending"}),
+        _chunk("대사", "roleplay"),
+        ("custom", {workflow.SPECULATION_EVENT: "committed"}),
+        ("values", {"messages": []}),
+    ]))
+
+    assert list(workflow.stream_single_turn({})) == ["안내", "\n\n", "대사"]
+
+
+def test_failed_turn_leaves_state_unset(monkeypatch):
+    monkeypatch.setattr(workflow, "app", _ScriptedApp([
+        ("values", {"current_phase": "master"}),
+        _chunk("중간까지", "roleplay"),
+    ], fail=True))
+
+    turn = workflow.stream_single_turn({}, user_input="여보세요")
+    with pytest.raises(RuntimeError):
+        list(turn)
+    # 중간 노드까지의 부분 상태를 확정하지 않음 → 호출 측은 이전 상태 유지
+    assert turn.state is None